@@ -2,11 +2,26 @@ from flask import Flask, render_template, request, jsonify, send_file
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import pandas as pd
+import numpy as np
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from src.document_parser import DocumentParser
-from src.recommendation_pipeline import CandidateRecommendationPipeline
+from src.attribute_index import AttributeIndex
+from src.document_parser import DocumentParser, PARSER_VERSION
+from src.document_cache import DocumentCache
+from src.inverted_index import InvertedIndex
+from src.lsa_index import LsaIndex
+from src.minhash_index import MinHashIndex
+from src.record_store import RecordStore
+from src.recommendation_pipeline import (CandidateRecommendationPipeline, INDEX_MAX_TOP_N,
+                                         CV_SECTION_FIELDS, JOB_SECTION_FIELDS)
 from src.report_generator import ReportGenerator
+from src.result_cache import ResultCache
+from src.section_scores import SectionScores
+from src.text_cleaning import CLEANER_VERSION
+from src.topk_view import TopKView
+from src.vector_store import VectorStore
 import uuid
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment
@@ -18,8 +33,28 @@ CORS(app)
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max for multiple files
 app.config['UPLOAD_FOLDER'] = 'uploads'
+app.config['SAVE_UPLOADS'] = 'async'  # original files: 'async' (written in the background after parsing), 'sync' or 'off'
 app.config['DATABASE_FOLDER'] = 'database'
+app.config['STORE_FOLDER'] = os.path.join('database', 'store')  # CV/job records, vectors (memory-mapped) and live IDF, restored at startup
 app.config['REPORTS_FOLDER'] = 'reports'
+app.config['CACHE_FOLDER'] = 'cache'
+app.config['DOCUMENT_CACHE_MAX_BYTES'] = 200 * 1024 * 1024  # 200MB of parsed documents
+app.config['PARSE_WORKERS'] = None  # processes parsing a bulk upload (None: one per CPU)
+app.config['PARSE_TIMEOUT'] = 60  # seconds allowed per document before it is reported as failed
+app.config['PARSE_MAX_CPU_SECONDS'] = 30  # CPU seconds allowed per document (None: no limit)
+app.config['PARSE_MAX_MEMORY'] = 512 * 1024 * 1024  # 512MB of memory allowed per document (None: no limit)
+app.config['PARSE_MAX_PAGES'] = 50  # longer PDFs are rejected (None: no limit)
+app.config['PARSE_PAGE_BUDGET'] = 20  # only the first pages of a PDF are read (None: all)
+app.config['PARSE_CHAR_BUDGET'] = 100000  # PDF text is cut off after this many characters (None: no cutoff)
+app.config['PARSE_TASKS_PER_WORKER'] = 20  # documents a parse worker handles before it is replaced
+app.config['VECTORIZER_MODE'] = 'tfidf'  # 'tfidf' (fitted vocabulary) or 'hashing' (fit-free, see src/hashing_vectorizer.py)
+app.config['LIVE_IDF'] = True  # IDF follows the uploaded CVs instead of the training corpus
+app.config['IDF_REFRESH_FRACTION'] = 0.2  # stored vectors and the view are re-weighted once the CV set grew by 20%
+app.config['CV_INDEX'] = 'inverted'  # 'inverted' (exact) or 'lsa' (approximate, for very large CV sets, see src/lsa_index.py)
+app.config['INDEX_REFIT_DRIFT'] = 0.5  # the LSA index is refit in the background once CVs added since its fit reach 50%
+app.config['MATERIALIZED_TOP_K'] = 100  # candidates kept per job, served to /api/recommend without rescoring
+app.config['RESULT_CACHE_MAX_BYTES'] = 64 * 1024 * 1024  # 64MB of per-job results not covered by the view
+app.config['CV_DEDUPE'] = 'flag'  # near-duplicate CVs: 'flag' (mark them), 'merge' (keep the first upload only) or 'off'
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
 
 # Ensure folders exist
@@ -27,21 +62,157 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs(app.config['DATABASE_FOLDER'], exist_ok=True)
 os.makedirs(app.config['REPORTS_FOLDER'], exist_ok=True)
 
+# Background writer of uploaded originals (see save_upload)
+upload_writer = ThreadPoolExecutor(max_workers=1)
+pending_uploads = {}  # upload path -> Future of its write
+
+# Background builder of the CV index (see get_cv_index)
+index_builder = ThreadPoolExecutor(max_workers=1)
+
+# Held while CVs or jobs are added, flagged or cleared: requests run in threads,
+# and interleaved appends would corrupt the stores on disk and their globals
+store_lock = threading.Lock()
+
 # Initialize parsers
-document_parser = DocumentParser()
+document_parser = DocumentParser(
+    max_pages=app.config['PARSE_MAX_PAGES'],
+    page_budget=app.config['PARSE_PAGE_BUDGET'],
+    char_budget=app.config['PARSE_CHAR_BUDGET']
+)
 report_generator = ReportGenerator()
+document_cache = DocumentCache(
+    cache_dir=os.path.join(app.config['CACHE_FOLDER'], 'documents'),
+    max_bytes=app.config['DOCUMENT_CACHE_MAX_BYTES'],
+    settings={
+        'parser': PARSER_VERSION,
+        'cleaner': CLEANER_VERSION,
+        'max_pages': app.config['PARSE_MAX_PAGES'],
+        'page_budget': app.config['PARSE_PAGE_BUDGET'],
+        'char_budget': app.config['PARSE_CHAR_BUDGET']
+    }
+)
 
 # Initialize recommendation pipeline
 try:
-    pipeline = CandidateRecommendationPipeline(vectorizer_path='models/vectorizer.pkl')
+    pipeline = CandidateRecommendationPipeline(
+        vectorizer_path='models/vectorizer.pkl',
+        mode=app.config['VECTORIZER_MODE'],
+        idf_path='models/hashing_idf.npz',
+        live_idf=app.config['LIVE_IDF'],
+        idf_refresh_fraction=app.config['IDF_REFRESH_FRACTION'],
+        result_cache=ResultCache(max_bytes=app.config['RESULT_CACHE_MAX_BYTES'])
+    )
     print("✓ Recommendation pipeline initialized")
 except Exception as e:
     print(f"✗ Pipeline initialization error: {str(e)}")
     pipeline = None
 
-# Global storage
+
+
+def open_vector_store(name):
+    """Vector store kept under STORE_FOLDER, memory-mapped when an earlier run wrote it"""
+    path = os.path.join(app.config['STORE_FOLDER'], name)
+    if os.path.exists(os.path.join(path, 'manifest.json')):
+        try:
+            return VectorStore.load(path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            print(f"✗ Could not load vector store {name}: {str(e)}")
+    store = VectorStore(path=path)
+    if __name__ != '__mp_main__':  # scoring workers never write the stores (see restore_stores)
+        store.clear()
+    return store
+
+
+# Global storage (restored from STORE_FOLDER at startup, see restore_stores)
 cvs_data = []
 jobs_data = []
+cv_records = RecordStore(os.path.join(app.config['STORE_FOLDER'], 'cvs.jsonl'))
+job_records = RecordStore(os.path.join(app.config['STORE_FOLDER'], 'jobs.jsonl'))
+idf_state_path = os.path.join(app.config['STORE_FOLDER'], 'idf.npz')
+
+# CV vectors computed once at upload time (rows aligned with cvs_data), appended on disk
+cv_store = open_vector_store('cvs')
+
+# Job vectors (rows aligned with jobs_data), for matching a candidate to jobs
+job_store = open_vector_store('jobs')
+
+# Per-section CV and job vectors for weighted scoring (rows aligned with cvs_data / jobs_data)
+cv_section_stores = {section: open_vector_store(os.path.join('cv_sections', section))
+                     for section in CV_SECTION_FIELDS}
+job_section_stores = {section: open_vector_store(os.path.join('job_sections', section))
+                      for section in JOB_SECTION_FIELDS}
+
+# Per-section job x CV similarities, extended lazily with new CVs and jobs (rebuilt after re-weighting)
+section_scores = None
+
+# Years of experience and degree level per CV (rows aligned with cvs_data), for pre-filtering
+cv_attributes = AttributeIndex()
+
+# MinHash signatures of the CVs that are not near-duplicates of an earlier CV
+cv_minhash = MinHashIndex()
+
+# Bumped whenever the CV set changes, so cached results of older corpora are never served
+corpus_version = 0
+
+# Index over cv_store for small top_n, built in the background when a query first needs it
+cv_index = None
+cv_index_version = None  # cv_weights_version the index was built from
+cv_index_build = None  # (Future of the index being built, cv_weights_version it is built from)
+
+# Bumped whenever stored CV vectors are re-weighted or cleared (appends keep the index usable)
+cv_weights_version = 0
+
+# Top candidates per job (rows aligned with jobs_data), updated as CVs and jobs arrive
+job_view = TopKView(k=app.config['MATERIALIZED_TOP_K'], normalized=True)
+
+
+def clear_stores():
+    """Empty the record and vector stores and the saved live IDF"""
+    cv_records.clear()
+    job_records.clear()
+    for store in [cv_store, job_store] + list(cv_section_stores.values()) + list(job_section_stores.values()):
+        store.clear()
+    if os.path.exists(idf_state_path):
+        os.remove(idf_state_path)
+
+
+def restore_stores():
+    """
+    Reload the CVs and jobs stored by an earlier run
+    Records, vectors and the live IDF are restored together or not at all; the
+    vectors stay memory-mapped and only the in-memory indexes are rebuilt from them
+    """
+    global cvs_data, jobs_data
+    
+    cvs, jobs = cv_records.load(), job_records.load()
+    cv_ids = [cv['candidate_id'] for cv in cvs]
+    job_ids = [job['job_id'] for job in jobs]
+    complete = (
+        pipeline is not None
+        and all(store.ids == cv_ids for store in [cv_store] + list(cv_section_stores.values()))
+        and all(store.ids == job_ids for store in [job_store] + list(job_section_stores.values()))
+        and (not cvs or pipeline.load_corpus(idf_state_path))
+    )
+    if not complete:
+        if cvs or jobs or len(cv_store) or len(job_store):
+            print("✗ Stored CVs and jobs are incomplete, starting empty")
+            clear_stores()
+        return
+    
+    cvs_data, jobs_data = cvs, jobs
+    cv_attributes.append([cv['experience'] for cv in cvs], [cv['education'] for cv in cvs])
+    for cv in cvs:
+        if 'duplicate_of' not in cv:
+            cv_minhash.add(cv['candidate_id'], cv_minhash.signature(cv['cleaned_text']))
+    job_view.rebuild(job_ids, job_store.matrix if jobs else None, cv_store.matrix)
+    if cvs or jobs:
+        print(f"✓ Restored {len(cvs)} CVs and {len(jobs)} jobs")
+
+
+# Scoring workers (started with forkserver, see src/scoring.py) import this module
+# as __mp_main__; only the server itself restores, and may clear, the stores
+if __name__ != '__mp_main__':
+    restore_stores()
 
 
 def allowed_file(filename):
@@ -49,6 +220,62 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def parse_documents(paths, contents=None, workers=None):
+    """Parse uploaded documents in sandboxed worker processes with the configured limits"""
+    return document_parser.parse_many(
+        paths,
+        contents=contents,
+        workers=workers or app.config['PARSE_WORKERS'],
+        timeout=app.config['PARSE_TIMEOUT'],
+        max_cpu_seconds=app.config['PARSE_MAX_CPU_SECONDS'],
+        max_memory=app.config['PARSE_MAX_MEMORY'],
+        tasks_per_worker=app.config['PARSE_TASKS_PER_WORKER']
+    )
+
+
+def save_upload(file_path, data):
+    """
+    Keep the original of an uploaded document according to SAVE_UPLOADS
+    
+    Args:
+        file_path (str): Where the original goes
+        data (bytes): Content of the file
+        
+    Returns:
+        str: file_path, or None when originals are not kept
+    """
+    if app.config['SAVE_UPLOADS'] == 'off':
+        return None
+    if app.config['SAVE_UPLOADS'] == 'sync':
+        write_upload(file_path, data)
+        return file_path
+    
+    future = upload_writer.submit(write_upload, file_path, data)
+    pending_uploads[file_path] = future
+    future.add_done_callback(lambda done: pending_uploads.pop(file_path, None))
+    return file_path
+
+
+def write_upload(file_path, data):
+    """Write an uploaded original to disk"""
+    try:
+        with open(file_path, 'wb') as f:
+            f.write(data)
+    except OSError as e:
+        print(f"✗ Could not save {file_path}: {e}")
+
+
+def remove_upload(file_path):
+    """Delete a saved original, after its background write if it is still pending"""
+    if not file_path:
+        return
+    future = pending_uploads.get(file_path)
+    if future is not None:
+        future.result()
+    if os.path.exists(file_path):
+        os.remove(file_path)
+
+
 def save_cvs_to_excel():
     """Save all CVs data to Excel database"""
     try:
@@ -65,6 +292,7 @@ def save_cvs_to_excel():
                 'Experience': cv['experience'][:500] if cv['experience'] else '',
                 'Education': cv['education'][:300] if cv['education'] else '',
                 'Filename': cv['filename'],
+                'Duplicate Of': cv.get('duplicate_of', ''),
                 'Upload Date': cv['timestamp'],
                 'Text Length': len(cv.get('cv_text', ''))
             })
@@ -178,6 +406,7 @@ def save_recommendations_to_excel(recommendations_data):
                     'Rank': candidate['rank'],
                     'Candidate ID': candidate['candidate_id'],
                     'Candidate Name': candidate['name'],
+                    'Duplicate Of': candidate.get('duplicate_of') or '',
                     'Match %': candidate['match_percentage'],
                     'Similarity Score': candidate['similarity_score'],
                     'Summary': candidate['summary'][:300] if candidate['summary'] else '',
@@ -239,16 +468,29 @@ def health_check():
     return jsonify({
         'status': 'healthy',
         'pipeline_loaded': pipeline is not None,
-        'supported_formats': ['pdf', 'docx', 'txt']
+        'supported_formats': ['pdf', 'docx', 'txt'],
+        'document_cache': document_cache.stats(),
+        'result_cache': pipeline.result_cache.stats() if pipeline else None
     })
 
 
+@app.route('/api/cache-stats', methods=['GET'])
+def cache_stats():
+    """Hit/miss counters and size of the document and result caches"""
+    return jsonify({
+        'document_cache': document_cache.stats(),
+        'result_cache': pipeline.result_cache.stats() if pipeline else None
+    }), 200
+
+
 @app.route('/api/upload-cvs-bulk', methods=['POST'])
 def upload_cvs_bulk():
     """
     Upload multiple CV files at once
     Automatically generates IDs and extracts names from filenames
     """
+    global cv_weights_version, corpus_version, section_scores
+    
     try:
         if 'files[]' not in request.files:
             return jsonify({'error': 'No files provided'}), 400
@@ -260,6 +502,10 @@ def upload_cvs_bulk():
         
         successful_uploads = []
         failed_uploads = []
+        merged_uploads = []  # near-duplicates dropped in 'merge' mode
+        saved_files = []
+        new_cvs = []
+        cache_misses = set()
         
         for file in files:
             if file.filename == '':
@@ -279,43 +525,24 @@ def upload_cvs_bulk():
                 # Extract name from filename (remove extension)
                 name = os.path.splitext(file.filename)[0]
                 
-                # Save file
+                # Read file; the original is only saved once it parsed
                 filename = secure_filename(file.filename)
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 unique_filename = f"cv_{candidate_id}_{timestamp}_{filename}"
                 file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-                file.save(file_path)
-                
-                # Parse document
-                extracted_text = document_parser.parse_file(file_path)
-                sections = document_parser.extract_sections(extracted_text)
+                file_bytes = file.read()
                 
-                # Create CV entry
-                cv_entry = {
+                # Reuse cached parse results for identical content of the same type
+                document_key = document_cache.key_for(file_bytes, os.path.splitext(filename)[1])
+                saved_files.append({
+                    'original_filename': file.filename,
                     'candidate_id': candidate_id,
                     'name': name,
-                    'skills': sections.get('skills', ''),
-                    'experience': sections.get('experience', ''),
-                    'education': sections.get('education', ''),
-                    'cv_text': sections.get('full_text', ''),
-                    'filename': filename,
-                    'upload_path': file_path,
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                # Process with pipeline
-                if pipeline:
-                    combined_text = f"{cv_entry['skills']} {cv_entry['experience']} {cv_entry['education']} {cv_entry['cv_text']}"
-                    cv_entry['cleaned_text'] = pipeline.clean_text(combined_text)
-                
-                # Store
-                cvs_data.append(cv_entry)
-                
-                successful_uploads.append({
                     'filename': filename,
-                    'candidate_id': candidate_id,
-                    'name': name,
-                    'text_length': len(extracted_text)
+                    'file_path': file_path,
+                    'file_bytes': file_bytes,
+                    'document_key': document_key,
+                    'cached': document_cache.get(document_key)
                 })
                 
             except Exception as e:
@@ -323,17 +550,136 @@ def upload_cvs_bulk():
                     'filename': file.filename,
                     'error': str(e)
                 })
-                if os.path.exists(file_path):
-                    os.remove(file_path)
         
-        # Save CVs to Excel database
-        save_cvs_to_excel()
+        # Parse all uncached documents from memory in sandboxed worker processes, each with its own limits
+        to_parse = [saved for saved in saved_files if not saved['cached']]
+        parsed = parse_documents([saved['file_path'] for saved in to_parse],
+                                 contents=[saved['file_bytes'] for saved in to_parse])
+        for saved, result in zip(to_parse, parsed):
+            saved['parsed'] = result
+        
+        for saved in saved_files:
+            cached = saved['cached']
+            if cached:
+                extracted_text = cached['text']
+                sections = cached['sections']
+            elif 'error' in saved['parsed']:
+                failed_uploads.append({
+                    'filename': saved['original_filename'],
+                    'error': saved['parsed']['error']
+                })
+                continue
+            else:
+                extracted_text = saved['parsed']['text']
+                sections = saved['parsed']['sections']
+            
+            # Create CV entry
+            cv_entry = {
+                'candidate_id': saved['candidate_id'],
+                'name': saved['name'],
+                'skills': sections.get('skills', ''),
+                'experience': sections.get('experience', ''),
+                'education': sections.get('education', ''),
+                'cv_text': sections.get('full_text', ''),
+                'filename': saved['filename'],
+                'upload_path': save_upload(saved['file_path'], saved['file_bytes']),
+                'document_key': saved['document_key'],
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            if cached and cached.get('cleaned_sections') is not None:
+                cv_entry['cleaned_sections'] = cached['cleaned_sections']
+                cv_entry['cleaned_text'] = pipeline.join_sections(cached['cleaned_sections'])
+            else:
+                cache_misses.add(saved['document_key'])
+            
+            # Store
+            new_cvs.append(cv_entry)
+            
+            successful_uploads.append({
+                'filename': saved['filename'],
+                'candidate_id': saved['candidate_id'],
+                'name': saved['name'],
+                'text_length': len(extracted_text)
+            })
+        
+        # Clean the sections of the whole batch at once; the whole CV is their join
+        if pipeline and new_cvs:
+            to_clean = [cv for cv in new_cvs if 'cleaned_sections' not in cv]
+            for cv, cleaned_sections in zip(to_clean, pipeline.clean_sections(to_clean, CV_SECTION_FIELDS)):
+                cv['cleaned_sections'] = cleaned_sections
+                cv['cleaned_text'] = pipeline.join_sections(cleaned_sections)
+        
+        # Stores and indexes change under store_lock, one batch (or clear, or dedupe) at a time
+        with store_lock:
+            # Resubmitted CVs are matched through LSH buckets, not against every stored CV
+            if pipeline and new_cvs and app.config['CV_DEDUPE'] != 'off':
+                new_cvs, merged_uploads = find_duplicate_cvs(new_cvs, successful_uploads)
+            
+            # Vectorize the whole batch at once, keep vectors next to cvs_data
+            if pipeline and new_cvs:
+                # New CVs update the document frequencies; stored vectors are re-weighted in place
+                vectors, idf_factors = pipeline.add_to_corpus([cv['cleaned_text'] for cv in new_cvs])
+                pipeline.save_corpus(idf_state_path)
+                if idf_factors is not None:
+                    cv_store.rescale_columns(idf_factors)
+                    cv_weights_version += 1
+                cv_store.append([cv['candidate_id'] for cv in new_cvs], vectors)
+                corpus_version += 1
+                
+                # Section vectors use the same IDF and the cleaned sections; weights are only applied at query time
+                section_vectors = pipeline.vectorize_sections(new_cvs, CV_SECTION_FIELDS)
+                for section, store in cv_section_stores.items():
+                    if idf_factors is not None:
+                        store.rescale_columns(idf_factors)
+                    store.append([cv['candidate_id'] for cv in new_cvs], section_vectors[section])
+                if idf_factors is not None:
+                    for store in job_section_stores.values():
+                        store.rescale_columns(idf_factors)
+                    section_scores = None
+                
+                if idf_factors is None:
+                    # Score only the new CVs against every job
+                    job_view.add_cvs(vectors)
+                else:
+                    # The IDF moved for every CV and job: re-score once here rather than on every read
+                    job_vectors = get_job_vectors(jobs_data) if jobs_data else None
+                    job_store.clear()
+                    if job_vectors is not None:
+                        job_store.append([job['job_id'] for job in jobs_data], job_vectors)
+                    job_view.rebuild([job['job_id'] for job in jobs_data], job_vectors, cv_store.matrix)
+            cvs_data.extend(new_cvs)
+            cv_attributes.append([cv['experience'] for cv in new_cvs], [cv['education'] for cv in new_cvs])
+            
+            # Cache newly parsed/cleaned documents for future re-uploads
+            for cv in new_cvs:
+                if cv['document_key'] in cache_misses:
+                    cache_misses.discard(cv['document_key'])
+                    document_cache.put(cv['document_key'], {
+                        'text': cv['cv_text'],
+                        'sections': {
+                            'skills': cv['skills'],
+                            'experience': cv['experience'],
+                            'education': cv['education'],
+                            'full_text': cv['cv_text']
+                        },
+                        'cleaned_sections': cv.get('cleaned_sections')
+                    })
+            for cv in new_cvs:
+                cv.pop('cleaned_sections', None)
+            cv_records.append(new_cvs)
+            
+            # Save CVs to Excel database
+            save_cvs_to_excel()
         
         return jsonify({
             'success': True,
-            'message': f'Processed {len(successful_uploads)} CVs successfully',
+            'message': f'Processed {len(successful_uploads)} CVs successfully'
+                       + (f', merged {len(merged_uploads)} near-duplicates' if merged_uploads else ''),
             'successful': successful_uploads,
             'failed': failed_uploads,
+            'duplicates': sum(1 for upload in successful_uploads if 'duplicate_of' in upload),
+            'merged': merged_uploads,
             'total_cvs': len(cvs_data)
         }), 201
     
@@ -341,6 +687,90 @@ def upload_cvs_bulk():
         return jsonify({'error': str(e)}), 500
 
 
+def find_duplicate_cvs(new_cvs, uploads):
+    """
+    Match new CVs against earlier ones (and each other) by MinHash similarity
+    Flags near-duplicates; in 'merge' mode they are dropped, their files removed
+    and their upload entries moved from uploads to merged
+    
+    Returns:
+        The new CVs to store
+    """
+    upload_entries = {upload['candidate_id']: upload for upload in uploads}
+    kept = []
+    merged = []
+    
+    for cv in new_cvs:
+        signature = cv_minhash.signature(cv['cleaned_text'])
+        matches = cv_minhash.query(signature)
+        if not matches:
+            cv_minhash.add(cv['candidate_id'], signature)
+            kept.append(cv)
+            continue
+        
+        duplicate_of, similarity = matches[0]
+        upload = upload_entries[cv['candidate_id']]
+        
+        if app.config['CV_DEDUPE'] == 'merge':
+            # Never stored: reported with the ID of the CV it was merged into, not its own
+            remove_upload(cv['upload_path'])
+            uploads.remove(upload)
+            merged.append({
+                'filename': upload['filename'],
+                'name': upload['name'],
+                'merged_into': duplicate_of,
+                'duplicate_similarity': round(similarity, 4)
+            })
+        else:
+            cv['duplicate_of'] = duplicate_of
+            upload.update({
+                'duplicate_of': duplicate_of,
+                'duplicate_similarity': round(similarity, 4)
+            })
+            kept.append(cv)
+    
+    return kept, merged
+
+
+@app.route('/api/cvs/dedupe', methods=['POST'])
+def dedupe_cvs():
+    """
+    Batch mode: re-check all stored CVs for near-duplicates and refresh the flags
+    Stored CVs are only flagged (vectors and indexes are append-only)
+    """
+    try:
+        if not pipeline:
+            return jsonify({'error': 'Pipeline not initialized'}), 500
+        
+        with store_lock:
+            cv_minhash.clear()
+            duplicates = cv_minhash.find_duplicates(
+                [cv['candidate_id'] for cv in cvs_data],
+                [cv.get('cleaned_text', '') for cv in cvs_data]
+            )
+            
+            for cv in cvs_data:
+                cv.pop('duplicate_of', None)
+                if cv['candidate_id'] in duplicates:
+                    cv['duplicate_of'] = duplicates[cv['candidate_id']][0]
+            cv_records.rewrite(cvs_data)
+            save_cvs_to_excel()
+        
+        return jsonify({
+            'success': True,
+            'duplicates': [{
+                'candidate_id': candidate_id,
+                'duplicate_of': duplicate_of,
+                'similarity': round(similarity, 4)
+            } for candidate_id, (duplicate_of, similarity) in duplicates.items()],
+            'unique_cvs': len(cv_minhash),
+            'total_cvs': len(cvs_data)
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/upload-job-file', methods=['POST'])
 def upload_job_file():
     """
@@ -364,20 +794,19 @@ def upload_job_file():
         # Extract title from filename
         title = os.path.splitext(file.filename)[0]
         
-        # Save file
+        # Read file; the original is only saved once it parsed
         filename = secure_filename(file.filename)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         unique_filename = f"job_{job_id}_{timestamp}_{filename}"
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        file.save(file_path)
+        file_bytes = file.read()
         
-        # Parse document
-        try:
-            extracted_text = document_parser.parse_file(file_path)
-            sections = document_parser.extract_sections(extracted_text)
-        except Exception as e:
-            os.remove(file_path)
-            return jsonify({'error': f'Failed to parse document: {str(e)}'}), 500
+        # Parse document from memory in a sandboxed worker, like CV uploads
+        parsed = parse_documents([file_path], contents=[file_bytes], workers=1)[0]
+        if 'error' in parsed:
+            return jsonify({'error': f"Failed to parse document: {parsed['error']}"}), 500
+        extracted_text = parsed['text']
+        sections = parsed['sections']
         
         # Create job entry
         job_entry = {
@@ -388,21 +817,27 @@ def upload_job_file():
             'education_required': sections.get('education', ''),
             'job_description': sections.get('full_text', ''),
             'filename': filename,
-            'upload_path': file_path,
+            'upload_path': save_upload(file_path, file_bytes),
             'timestamp': datetime.now().isoformat(),
             'source': 'file'
         }
         
         # Process with pipeline
         if pipeline:
-            combined_text = f"{job_entry['required_skills']} {job_entry['experience_required']} {job_entry['education_required']} {job_entry['job_description']}"
-            job_entry['cleaned_text'] = pipeline.clean_text(combined_text)
-        
-        # Store
-        jobs_data.append(job_entry)
+            job_entry['cleaned_sections'] = pipeline.clean_sections([job_entry], JOB_SECTION_FIELDS)[0]
+            job_entry['cleaned_text'] = pipeline.join_sections(job_entry['cleaned_sections'])
         
-        # Save Jobs to Excel database
-        save_jobs_to_excel()
+        # Store (under store_lock, like CV uploads)
+        with store_lock:
+            jobs_data.append(job_entry)
+            
+            # Store the job vectors and score the new job once against all CVs
+            if pipeline:
+                add_job_vectors(job_entry)
+            job_records.append([job_entry])
+            
+            # Save Jobs to Excel database
+            save_jobs_to_excel()
         
         return jsonify({
             'success': True,
@@ -452,14 +887,20 @@ def add_job_text():
         
         # Process with pipeline
         if pipeline:
-            combined_text = f"{job_entry['required_skills']} {job_entry['experience_required']} {job_entry['education_required']} {job_entry['job_description']}"
-            job_entry['cleaned_text'] = pipeline.clean_text(combined_text)
-        
-        # Store
-        jobs_data.append(job_entry)
+            job_entry['cleaned_sections'] = pipeline.clean_sections([job_entry], JOB_SECTION_FIELDS)[0]
+            job_entry['cleaned_text'] = pipeline.join_sections(job_entry['cleaned_sections'])
         
-        # Save Jobs to Excel database
-        save_jobs_to_excel()
+        # Store (under store_lock, like CV uploads)
+        with store_lock:
+            jobs_data.append(job_entry)
+            
+            # Store the job vectors and score the new job once against all CVs
+            if pipeline:
+                add_job_vectors(job_entry)
+            job_records.append([job_entry])
+            
+            # Save Jobs to Excel database
+            save_jobs_to_excel()
         
         return jsonify({
             'success': True,
@@ -480,6 +921,10 @@ def recommend():
     try:
         data = request.json
         job_id = data.get('job_id', None)
+        top_n = data.get('top_n', None)  # default: rank every CV
+        section_weights = data.get('section_weights', None)  # e.g. {"skills": 2, "experience": 1}; default: whole document
+        min_years = data.get('min_years', None)  # optional filters, applied before scoring
+        degree = data.get('degree', None)  # minimum level: 'diploma', 'bachelor', 'master' or 'phd'
         
         if len(cvs_data) == 0:
             return jsonify({'error': 'No CVs uploaded yet'}), 400
@@ -500,8 +945,15 @@ def recommend():
             if len(jobs_df) == 0:
                 return jsonify({'error': f'Job ID {job_id} not found'}), 404
         
-        # Get all recommendations (rank all CVs for each job)
-        recommendations_df = pipeline.batch_recommend(jobs_df, cvs_df, top_n=len(cvs_df))
+        # Get recommendations (all CVs for each job unless top_n was requested)
+        top_n = len(cvs_df) if top_n is None else min(int(top_n), len(cvs_df))
+        try:
+            if section_weights:
+                section_weights = {section: float(weight) for section, weight in section_weights.items()}
+            cv_mask = get_cv_mask(min_years, degree)
+            recommendations_df = get_recommendations(jobs_df, cvs_df, top_n, section_weights, cv_mask)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Group recommendations by job and format response
         job_recommendations = []
@@ -513,6 +965,9 @@ def recommend():
             # Sort by similarity score (already ranked by batch_recommend)
             job_recs = job_recs.sort_values('similarity_score', ascending=False).reset_index(drop=True)
             
+            # Shared terms behind every listed candidate's score, in one pass per job
+            matched_terms = get_matched_terms(job, job_recs['candidate_id'].tolist())
+            
             # Generate summary for each candidate
             candidates_list = []
             for idx, row in job_recs.iterrows():
@@ -522,7 +977,7 @@ def recommend():
                 # Get candidate name from CV data
                 candidate_name = cv['name'] if cv else 'Unknown'
                 
-                summary = generate_candidate_summary(cv, row['similarity_score'])
+                summary = generate_candidate_summary(cv, row['similarity_score'], matched_terms[idx])
                 
                 candidates_list.append({
                     'rank': idx + 1,
@@ -531,6 +986,8 @@ def recommend():
                     'similarity_score': round(row['similarity_score'], 4),
                     'match_percentage': round(row['similarity_score'] * 100, 2),
                     'summary': summary,
+                    'matched_terms': matched_terms[idx],
+                    'duplicate_of': cv.get('duplicate_of') if cv else None,
                     'skills': cv['skills'][:300] if cv else '',
                     'experience': cv['experience'][:300] if cv else '',
                     'education': cv['education'][:200] if cv else ''
@@ -568,7 +1025,217 @@ def recommend():
         return jsonify({'error': str(e)}), 500
 
 
-def generate_candidate_summary(cv, score):
+@app.route('/api/candidates/<candidate_id>/jobs', methods=['GET'])
+def candidate_jobs(candidate_id):
+    """Rank jobs for one candidate (reverse matching, e.g. to route a new CV)"""
+    try:
+        top_n = request.args.get('top_n', 5, type=int)
+        
+        cv = next((c for c in cvs_data if c['candidate_id'] == candidate_id), None)
+        if cv is None:
+            return jsonify({'error': f'Candidate ID {candidate_id} not found'}), 404
+        
+        if len(jobs_data) == 0:
+            return jsonify({'error': 'No jobs uploaded yet'}), 400
+        
+        if not pipeline:
+            return jsonify({'error': 'Pipeline not initialized'}), 500
+        
+        if get_cv_vectors() is None or len(job_store) != len(jobs_data):
+            return jsonify({'error': 'Stored vectors are out of sync, please re-upload'}), 500
+        
+        # One candidate row against all stored job vectors
+        recommendations = pipeline.recommend_jobs(candidate_id, min(top_n, len(job_store)), cv_store, job_store)
+        
+        titles = {job['job_id']: job['title'] for job in jobs_data}
+        jobs_list = [{
+            'rank': rec['rank'],
+            'job_id': rec['job_id'],
+            'job_title': titles.get(rec['job_id'], 'Unknown'),
+            'similarity_score': rec['similarity_score'],
+            'match_percentage': rec['match_percentage']
+        } for rec in recommendations]
+        
+        return jsonify({
+            'success': True,
+            'candidate_id': candidate_id,
+            'name': cv['name'],
+            'jobs': jobs_list,
+            'total_matches': len(jobs_list)
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+def get_cv_vectors():
+    """Get stored CV vectors aligned with cvs_data (None if the store is out of sync)"""
+    if len(cv_store) != len(cvs_data):
+        return None
+    return cv_store.matrix
+
+
+def add_job_vectors(job_entry):
+    """Store the vectors of a new job and add it to the materialized view"""
+    job_vectors = get_job_vectors([job_entry])
+    job_store.append([job_entry['job_id']], job_vectors)
+    
+    section_vectors = pipeline.vectorize_sections([job_entry], JOB_SECTION_FIELDS)
+    for section, store in job_section_stores.items():
+        store.append([job_entry['job_id']], section_vectors[section])
+    job_entry.pop('cleaned_sections', None)
+    
+    cv_vectors = get_cv_vectors()
+    if cv_vectors is not None and cv_vectors.shape[0] == job_view.n_cvs:
+        job_view.add_jobs([job_entry['job_id']], job_vectors, cv_vectors)
+
+
+def get_section_scores():
+    """Get per-section similarities of all jobs to all CVs (None if the stores are out of sync)"""
+    global section_scores
+    
+    if any(len(store) != len(cvs_data) for store in cv_section_stores.values()):
+        return None
+    if any(len(store) != len(jobs_data) for store in job_section_stores.values()):
+        return None
+    
+    cv_sections = {section: store.matrix for section, store in cv_section_stores.items()}
+    if section_scores is None:
+        section_scores = SectionScores(
+            job_section_stores['skills'].ids,
+            {section: store.matrix for section, store in job_section_stores.items()},
+            cv_sections
+        )
+    
+    # Score only what arrived since: new CVs against the known jobs, then new jobs against all CVs
+    n_cvs, n_jobs = section_scores.n_cvs, len(section_scores)
+    if n_cvs < len(cvs_data):
+        section_scores.add_cvs({section: vectors[n_cvs:] for section, vectors in cv_sections.items()})
+    if n_jobs < len(jobs_data):
+        section_scores.add_jobs(
+            job_section_stores['skills'].ids[n_jobs:],
+            {section: store.matrix[n_jobs:] for section, store in job_section_stores.items()},
+            cv_sections
+        )
+    return section_scores
+
+
+def get_job_vectors(jobs):
+    """Vectorize job entries from their cleaned text"""
+    return pipeline.vectorize_texts([job['cleaned_text'] for job in jobs])
+
+
+def get_cv_mask(min_years=None, degree=None):
+    """Get the CVs passing the attribute filters (None when no filter is given)"""
+    if min_years is None and degree is None:
+        return None
+    if len(cv_attributes) != len(cvs_data):
+        raise RuntimeError('CV attributes are out of sync, please re-upload')
+    return cv_attributes.mask(min_years=min_years, degree=degree)
+
+
+def get_recommendations(jobs_df, cvs_df, top_n, section_weights=None, cv_mask=None):
+    """
+    Top N candidates per job as a batch_recommend DataFrame
+    Read from the materialized job_view when it covers the request (top_n up to
+    MATERIALIZED_TOP_K, or any top_n while there are no more CVs than that), computed otherwise;
+    with section_weights, combined from the precomputed per-section similarities;
+    with cv_mask, only the CVs passing the filters are scored
+    """
+    job_ids = jobs_df['job_id'].tolist()
+    cv_rows = None if cv_mask is None else np.flatnonzero(cv_mask)
+    if cv_rows is not None:
+        top_n = min(top_n, len(cv_rows))
+    
+    if section_weights:
+        scores = get_section_scores()
+        if scores is None:
+            raise RuntimeError('Section vectors are out of sync, please re-upload')
+        top_indices, top_scores = scores.top_k(section_weights, top_n, job_ids, cv_rows=cv_rows)
+        return pipeline.recommendations_frame(job_ids, cvs_df['candidate_id'].to_numpy(), top_indices, top_scores)
+    
+    if cv_rows is not None:
+        # Filtered subsets are scored directly (the view, index and result cache cover all CVs)
+        cv_vectors = get_cv_vectors()
+        return pipeline.batch_recommend(jobs_df, cvs_df.iloc[cv_rows], top_n=top_n,
+                                        cv_vectors=None if cv_vectors is None else cv_vectors[cv_rows])
+    
+    top = None
+    if job_view.n_cvs == len(cvs_data) == len(cvs_df):
+        top = job_view.top(jobs_df['job_id'].tolist(), top_n)
+    
+    if top is not None:
+        return pipeline.recommendations_frame(jobs_df['job_id'].tolist(), cvs_df['candidate_id'].to_numpy(), *top)
+    
+    return pipeline.batch_recommend(jobs_df, cvs_df, top_n=top_n,
+                                    cv_vectors=get_cv_vectors(),
+                                    cv_index=get_cv_index(top_n),
+                                    corpus_version=corpus_version)
+
+
+def get_cv_index(top_n):
+    """
+    Get the index over stored CV vectors when it can answer top_n (else None)
+    Builds, appends and re-weightings all run on index_builder, never inside a
+    request; until the index covers the current vectors, queries are scored exactly
+    """
+    global cv_index, cv_index_version, cv_index_build
+    
+    if top_n > INDEX_MAX_TOP_N or len(cv_store) == 0 or len(cv_store) != len(cvs_data):
+        return None
+    
+    if cv_index_build is not None and cv_index_build[0].done():
+        future, version = cv_index_build
+        cv_index_build = None
+        if future.exception() is not None:
+            print(f"✗ CV index build error: {future.exception()}")
+        else:
+            cv_index, cv_index_version = future.result(), version
+    
+    # One background job at a time, each from the vectors as they are now
+    if cv_index_build is None:
+        job = update_cv_index_job()
+        if job is not None:
+            cv_index_build = (index_builder.submit(job, cv_store.matrix), cv_weights_version)
+    
+    if cv_index is None or cv_index_version != cv_weights_version or len(cv_index) != len(cv_store):
+        return None
+    return cv_index
+
+
+def update_cv_index_job():
+    """The background job that brings cv_index up to date with cv_store (None if it is)"""
+    lsa = isinstance(cv_index, LsaIndex)
+    if cv_index is None or (lsa and cv_index.drift >= app.config['INDEX_REFIT_DRIFT']):
+        return build_cv_index
+    if cv_index_version != cv_weights_version:
+        # Stored vectors were re-weighted: the LSA fit still holds, the inverted index does not
+        return cv_index.reweighted if lsa else build_cv_index
+    if len(cv_index) < len(cv_store):
+        # CVs appended since: projected with the fitted SVD into their nearest partition, no refit
+        return cv_index.add if lsa else build_cv_index
+    return None
+
+
+def build_cv_index(cv_vectors):
+    """Build the configured CV index over stored (L2-normalized) vectors, on index_builder"""
+    if app.config['CV_INDEX'] == 'lsa':
+        return LsaIndex(normalized=True).fit(cv_vectors)
+    return InvertedIndex(cv_vectors)
+
+
+def get_matched_terms(job, candidate_ids, n_terms=5):
+    """Top shared terms of a job with each listed candidate, from the stored vectors"""
+    if (not pipeline or not candidate_ids or get_cv_vectors() is None
+            or job['job_id'] not in job_store.positions):
+        return [[] for _ in candidate_ids]
+    
+    rows = [cv_store.positions[candidate_id] for candidate_id in candidate_ids]
+    return pipeline.explain_matches(job['cleaned_text'], job_store.rows([job['job_id']]),
+                                    cv_store.matrix[rows], n_terms)
+
+
+def generate_candidate_summary(cv, score, matched_terms=None):
     """Generate a brief summary of candidate suitability"""
     if not cv:
         return "No candidate data available"
@@ -586,6 +1253,9 @@ def generate_candidate_summary(cv, score):
     if exp_preview != "No experience data":
         summary += f"Experience: {exp_preview}..."
     
+    if matched_terms:
+        summary += f" Matching terms: {', '.join(term['term'] for term in matched_terms)}."
+    
     return summary
 
 
@@ -624,36 +1294,46 @@ def get_jobs():
 @app.route('/api/clear', methods=['POST'])
 def clear_data():
     """Clear all data and uploaded files"""
-    global cvs_data, jobs_data
+    global cvs_data, jobs_data, cv_index, cv_index_build, cv_weights_version, corpus_version, section_scores
     
-    # Delete uploaded files
-    for cv in cvs_data:
-        if 'upload_path' in cv and cv['upload_path'] and os.path.exists(cv['upload_path']):
-            try:
-                os.remove(cv['upload_path'])
-            except:
-                pass
-    
-    for job in jobs_data:
-        if 'upload_path' in job and job['upload_path'] and os.path.exists(job['upload_path']):
+    with store_lock:
+        # Delete uploaded files
+        for cv in cvs_data:
             try:
-                os.remove(job['upload_path'])
+                remove_upload(cv.get('upload_path'))
             except:
                 pass
-    
-    # Delete Excel database files
-    database_files = ['cvs_database.xlsx', 'jobs_database.xlsx', 'recommendations_database.xlsx']
-    for db_file in database_files:
-        db_path = os.path.join(app.config['DATABASE_FOLDER'], db_file)
-        if os.path.exists(db_path):
+        
+        for job in jobs_data:
             try:
-                os.remove(db_path)
-                print(f"✓ Deleted {db_file}")
+                remove_upload(job.get('upload_path'))
             except:
                 pass
-    
-    cvs_data = []
-    jobs_data = []
+        
+        # Delete Excel database files
+        database_files = ['cvs_database.xlsx', 'jobs_database.xlsx', 'recommendations_database.xlsx']
+        for db_file in database_files:
+            db_path = os.path.join(app.config['DATABASE_FOLDER'], db_file)
+            if os.path.exists(db_path):
+                try:
+                    os.remove(db_path)
+                    print(f"✓ Deleted {db_file}")
+                except:
+                    pass
+        
+        cvs_data = []
+        jobs_data = []
+        clear_stores()
+        section_scores = None
+        cv_attributes.clear()
+        cv_minhash.clear()
+        cv_index = None
+        cv_index_build = None
+        cv_weights_version += 1
+        corpus_version += 1
+        job_view.clear()
+        if pipeline:
+            pipeline.reset_corpus()
     
     return jsonify({'message': 'All data cleared successfully'}), 200
 
@@ -723,7 +1403,7 @@ def generate_report():
             # Generate recommendations
             cvs_df = pd.DataFrame(cvs_data)
             jobs_df = pd.DataFrame(jobs_data)
-            recommendations_df = pipeline.batch_recommend(jobs_df, cvs_df, top_n=len(cvs_df))
+            recommendations_df = get_recommendations(jobs_df, cvs_df, len(cvs_df))
             
             # Format recommendations
             job_recommendations = []
@@ -743,6 +1423,7 @@ def generate_report():
                         'similarity_score': round(row['similarity_score'], 4),
                         'match_percentage': round(row['similarity_score'] * 100, 2),
                         'summary': generate_candidate_summary(cv, row['similarity_score']),
+                        'duplicate_of': cv.get('duplicate_of') if cv else None,
                         'skills': cv['skills'][:300] if cv else '',
                         'experience': cv['experience'][:300] if cv else '',
                         'education': cv['education'][:200] if cv else ''
@@ -840,12 +1521,15 @@ if __name__ == '__main__':
     print("  GET  /                          - Web interface")
     print("  GET  /api/health                - Health check")
     print("  POST /api/upload-cvs-bulk       - Upload multiple CVs")
+    print("  POST /api/cvs/dedupe            - Flag near-duplicate CVs")
     print("  POST /api/upload-job-file       - Upload job document")
     print("  POST /api/add-job-text          - Add job as text")
     print("  POST /api/recommend             - Get ranked recommendations")
+    print("  GET  /api/candidates/<id>/jobs  - Get ranked jobs for a candidate")
     print("  GET  /api/cvs                   - List all CVs")
     print("  GET  /api/jobs                  - List all jobs")
     print("  GET  /api/database-status       - Check Excel database status")
+    print("  GET  /api/cache-stats           - Document/result cache counters")
     print("  POST /api/generate-report       - Generate PDF report")
     print("  GET  /api/reports               - List all generated reports")
     print("  GET  /api/download-report/<id>  - Download specific report")
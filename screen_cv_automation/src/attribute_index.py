@@ -0,0 +1,182 @@
+"""
+attribute_index.py
+Structured CV attributes (years of experience, degree level) in columnar
+arrays with bitmap indexes, used to pre-filter CVs before similarity scoring
+"""
+
+import re
+
+import numpy as np
+
+# Degree levels, lowest to highest; a 'degree' filter keeps this level and above
+DEGREE_LEVELS = {
+    'diploma': 1,
+    'bachelor': 2,
+    'master': 3,
+    'phd': 4
+}
+
+# Fields of study that mark a bare "BA"/"MS" as a degree ("BA HR", "BS Computer Science")
+DEGREE_FIELDS = (r'(?:hr|it|cs|computer|data|statistics|math(?:ematic)?s?|economics|engineering|business|'
+                 r'finance|accounting|marketing|management|physics|chemistry|biology|psychology|history|'
+                 r'english|law|nursing|arts?|sciences?|sociology|philosophy|communications?|design)')
+
+# Degree context that must follow an ambiguous word ("Master of ...", "Associate degree"),
+# so "Scrum Master" or "Associate Data Scientist" do not count
+DEGREE_CONTEXT = r'(?=\s*(?:\(?hons\b|degrees?\b|in\s+\w|of\s+\w))'
+
+# Short forms also accept a field of study, but not e.g. "MS Office"
+SHORT_DEGREE_CONTEXT = rf'(?=\s*(?:\(?hons\b|degrees?\b|in\s+\w|of\s+\w|{DEGREE_FIELDS}\b))'
+
+
+def short_degree(letter):
+    """Pattern for MA/MS or BA/BS: fully dotted ("M.S."), or followed by degree context ("MS in ...")"""
+    return rf'\b{letter}\.[as]\.(?!\w)|\b{letter}\.?[as]\b\.?{SHORT_DEGREE_CONTEXT}'
+
+
+# Spellings of each degree level as they appear in education sections
+DEGREE_PATTERNS = [
+    ('phd', re.compile(r'\b(ph\.?\s?d|doctorate|doctoral|dphil)\b', re.IGNORECASE)),
+    ('master', re.compile(r'\b(master\'?s\b|masters\b|master' + DEGREE_CONTEXT + r'|m\.?sc\b|m\.?eng\b|m\.?phil\b|mba\b)|'
+                          + short_degree('m'), re.IGNORECASE)),
+    ('bachelor', re.compile(r'\b(bachelor|b\.?sc\b|b\.?eng\b|b\.?tech\b|b\.?com\b|undergraduate\b)|'
+                            + short_degree('b'), re.IGNORECASE)),
+    ('diploma', re.compile(r'\b(diploma|associate\'?s?' + DEGREE_CONTEXT + r'|hnd\b|certificate\b)', re.IGNORECASE))
+]
+
+# "3 years", "1 yr", "2-4 years", "2 to 4 years", "5+ years"
+YEARS = r'(?<![\d.])(\d+(?:\.\d+)?)\s*(?:(?:-|–|to)\s*\d+(?:\.\d+)?\s*)?\+?\s*(?:years?|yrs?)\b'
+
+# Mentions that are about experience: "5 years of (relevant) experience", "experience: 3 years",
+# "worked for 2 years", or a section that opens with the duration ("3 years as Data Analyst")
+EXPERIENCE_YEARS_PATTERNS = [
+    re.compile(YEARS + r"'?\s+(?:of\s+)?(?:[a-z-]+\s+){0,2}(?:experience|exp)\b", re.IGNORECASE),
+    re.compile(r'\b(?:experience|worked|working)\b[^.\d]{0,20}?' + YEARS, re.IGNORECASE),
+    re.compile(r'^\W*' + YEARS, re.IGNORECASE)
+]
+
+# Thresholds with a precomputed "at least N years" bitmap; other values scan the column
+MAX_INDEXED_YEARS = 40
+
+
+def parse_years(text):
+    """
+    Years of experience mentioned in a text
+
+    Only durations phrased as experience count (see EXPERIENCE_YEARS_PATTERNS),
+    so dates, ages or project lengths further down a section are ignored.
+    Ranges count with their lower bound; with several mentions, the largest wins.
+
+    Args:
+        text (str): Experience section (or any text)
+
+    Returns:
+        float: Years of experience, NaN if none is mentioned
+    """
+    if not isinstance(text, str):
+        return np.nan
+    values = [float(match) for pattern in EXPERIENCE_YEARS_PATTERNS for match in pattern.findall(text)]
+    return max(values) if values else np.nan
+
+
+def parse_degree(text):
+    """
+    Highest degree level mentioned in a text
+
+    Args:
+        text (str): Education section (or any text)
+
+    Returns:
+        int: Level from DEGREE_LEVELS, 0 if no degree is recognized
+    """
+    if not isinstance(text, str):
+        return 0
+    for name, pattern in DEGREE_PATTERNS:
+        if pattern.search(text):
+            return DEGREE_LEVELS[name]
+    return 0
+
+
+class AttributeIndex:
+    """
+    Columnar attributes of the CV corpus (rows aligned with the vector store)
+
+    Columns are compact arrays (float32 years, int8 degree level). Each degree
+    level and each whole number of years up to MAX_INDEXED_YEARS has a packed
+    "at least" bitmap, so a filter is a few ANDs over N/8 bytes.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self.years)
+
+    def clear(self):
+        """Remove all rows"""
+        self.years = np.zeros(0, dtype=np.float32)
+        self.degree = np.zeros(0, dtype=np.int8)
+        self.build_bitmaps()
+
+    def append(self, experience_texts, education_texts):
+        """
+        Parse and append the attributes of new CVs
+
+        Args:
+            experience_texts: Experience section of each new CV
+            education_texts: Education section of each new CV (same length)
+        """
+        years = np.array([parse_years(text) for text in experience_texts], dtype=np.float32)
+        degree = np.array([parse_degree(text) for text in education_texts], dtype=np.int8)
+        if len(years) != len(degree):
+            raise ValueError(f"Got {len(years)} experience and {len(degree)} education texts")
+
+        self.years = np.concatenate([self.years, years])
+        self.degree = np.concatenate([self.degree, degree])
+        self.build_bitmaps()
+
+    def build_bitmaps(self):
+        """Rebuild the packed bitmaps from the columns"""
+        # NaN (unknown) compares False, so such CVs never pass a years filter
+        self.years_bitmaps = {
+            threshold: np.packbits(self.years >= threshold)
+            for threshold in range(1, MAX_INDEXED_YEARS + 1)
+        }
+        self.degree_bitmaps = {
+            level: np.packbits(self.degree >= level)
+            for level in DEGREE_LEVELS.values()
+        }
+
+    def mask(self, min_years=None, degree=None):
+        """
+        Rows passing all given filters
+
+        Args:
+            min_years (float): Minimum years of experience
+            degree (str): Minimum degree level, a key of DEGREE_LEVELS
+
+        Returns:
+            Boolean array with one entry per row, or None when no filter is given
+        """
+        bitmaps = []
+
+        if min_years is not None:
+            min_years = float(min_years)
+            if min_years > 0 and min_years.is_integer() and min_years <= MAX_INDEXED_YEARS:
+                bitmaps.append(self.years_bitmaps[int(min_years)])
+            elif min_years > 0:
+                bitmaps.append(np.packbits(self.years >= min_years))
+
+        if degree is not None:
+            level = DEGREE_LEVELS.get(str(degree).lower())
+            if level is None:
+                raise ValueError(f"Unknown degree '{degree}' (expected one of {list(DEGREE_LEVELS)})")
+            bitmaps.append(self.degree_bitmaps[level])
+
+        if min_years is None and degree is None:
+            return None
+
+        combined = np.full((len(self) + 7) // 8, 0xFF, dtype=np.uint8)
+        for bitmap in bitmaps:
+            combined &= bitmap
+        return np.unpackbits(combined, count=len(self)).astype(bool)
@@ -0,0 +1,60 @@
+# benchmark_docx_extraction.py
+# Throughput of DOCX text extraction: the python-docx object model against
+# the streaming document.xml extractor, on CVs built by repeating the sample
+# CV of create_sample_docs.py (parsed from memory, like uploads)
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from create_sample_docs import create_sample_cv_docx
+from document_parser import DocumentParser
+
+COPIES = [1, 10, 100]
+SECONDS_PER_RUN = 2.0
+
+parser = DocumentParser()
+variants = [
+    ('python-docx', lambda data: parser.clean_extracted_text(parser.docx_document_text(data))),
+    ('streaming', parser.parse_docx),
+]
+
+
+def measure(parse, data):
+    """Documents per second over SECONDS_PER_RUN and peak traced memory in MB"""
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < SECONDS_PER_RUN:
+        parse(data)
+        count += 1
+    per_second = count / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return per_second, peak / 1e6
+
+
+print(f"{'Copies':>7}{'KB':>8}{'Extractor':>14}{'docs/s':>10}{'MB/s':>8}{'Peak MB':>10}")
+
+with tempfile.TemporaryDirectory() as folder:
+    for copies in COPIES:
+        file_path = os.path.join(folder, f'cv_{copies}.docx')
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_sample_cv_docx(file_path, copies=copies)
+        with open(file_path, 'rb') as f:
+            data = f.read()
+
+        texts = [parse(data) for _, parse in variants]
+        assert all(text == texts[0] for text in texts), "extractors disagree"
+
+        for name, parse in variants:
+            per_second, peak_mb = measure(parse, data)
+            print(f"{copies:>7}{len(data) / 1024:>8.0f}{name:>14}{per_second:>10.1f}"
+                  f"{per_second * len(data) / 1e6:>8.2f}{peak_mb:>10.1f}")
+
+# End of benchmark_docx_extraction.py
@@ -0,0 +1,120 @@
+# benchmark_hashing.py
+# Compare the fitted TF-IDF vectorizer with the fit-free hashing mode:
+# vectorization throughput and ranking agreement on a synthetic corpus
+# built from results/cvs_cleaned.csv
+
+import os
+import pickle
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+
+from hashing_vectorizer import HashingTfidfVectorizer
+from scoring import top_k_similarities
+
+N_DOCUMENTS = 20000
+CHUNK_SIZE = 2000
+WORKERS = 4
+TOP_K = [5, 10, 50]
+
+rng = np.random.default_rng(42)
+
+# ----------------------------
+# Synthetic corpus: shuffled, partially mixed copies of the cleaned CVs
+# ----------------------------
+cvs = pd.read_csv("../results/cvs_cleaned.csv")
+jobs = pd.read_csv("../results/jobs_cleaned.csv")
+base_tokens = [str(text).split() for text in cvs['cleaned_text'].fillna('')]
+
+corpus = []
+for _ in range(N_DOCUMENTS):
+    tokens = list(base_tokens[rng.integers(len(base_tokens))])
+    tokens += list(rng.choice(base_tokens[rng.integers(len(base_tokens))], size=3))
+    keep = rng.random(len(tokens)) > 0.2
+    corpus.append(' '.join(np.array(tokens)[keep][rng.permutation(int(keep.sum()))]))
+
+job_texts = jobs['cleaned_text'].fillna('').tolist()
+
+with open("../models/vectorizer.pkl", "rb") as f:
+    tfidf = pickle.load(f)
+
+vocabulary = set(tfidf.vocabulary_)
+job_tokens = [token for text in job_texts for token in text.split()]
+oov = sum(token not in vocabulary for token in job_tokens) / max(1, len(job_tokens))
+
+
+def hashing_transform(chunk, table_path):
+    """Worker: vectorize one chunk with a shared, read-only IDF table"""
+    return HashingTfidfVectorizer.load(table_path).transform(chunk)
+
+
+# ----------------------------
+# Throughput
+# ----------------------------
+start = time.perf_counter()
+tfidf_vectors = tfidf.transform(corpus)
+tfidf_seconds = time.perf_counter() - start
+
+hashing = HashingTfidfVectorizer()
+start = time.perf_counter()
+for i in range(0, len(corpus), CHUNK_SIZE):  # streaming IDF update, chunk by chunk
+    hashing.partial_fit(corpus[i:i + CHUNK_SIZE])
+fit_seconds = time.perf_counter() - start
+
+start = time.perf_counter()
+hashing_vectors = hashing.transform(corpus)
+hashing_seconds = time.perf_counter() - start
+
+table_path = os.path.join(tempfile.mkdtemp(), "hashing_idf.npz")
+hashing.save(table_path)
+chunks = [corpus[i:i + CHUNK_SIZE] for i in range(0, len(corpus), CHUNK_SIZE)]
+start = time.perf_counter()
+with ProcessPoolExecutor(max_workers=WORKERS) as executor:
+    list(executor.map(hashing_transform, chunks, [table_path] * len(chunks)))
+parallel_seconds = time.perf_counter() - start
+
+# ----------------------------
+# Ranking agreement with the fitted TF-IDF mode
+# ----------------------------
+tfidf_jobs = tfidf.transform(job_texts)
+hashing_jobs = hashing.transform(job_texts)
+
+tfidf_idx, tfidf_scores = top_k_similarities(tfidf_jobs, tfidf_vectors, N_DOCUMENTS)
+hashing_idx, hashing_scores = top_k_similarities(hashing_jobs, hashing_vectors, N_DOCUMENTS)
+
+overlaps = {k: [] for k in TOP_K}
+correlations = []
+for job in range(len(job_texts)):
+    full_tfidf = np.empty(N_DOCUMENTS)
+    full_tfidf[tfidf_idx[job]] = tfidf_scores[job]
+    full_hashing = np.empty(N_DOCUMENTS)
+    full_hashing[hashing_idx[job]] = hashing_scores[job]
+
+    for k in TOP_K:
+        # Compare by score cutoff so exact ties at the k-th place do not count as misses
+        cutoff = hashing_scores[job, k - 1]
+        overlaps[k].append(np.mean(full_hashing[tfidf_idx[job, :k]] >= cutoff))
+
+    correlations.append(spearmanr(full_tfidf, full_hashing).correlation)
+
+# ----------------------------
+# Report
+# ----------------------------
+print(f"Corpus: {N_DOCUMENTS} synthetic CVs, {len(job_texts)} jobs")
+print(f"Job tokens outside the fitted vocabulary (dropped by TF-IDF mode): {oov:.1%}")
+print()
+print(f"{'Mode':<32}{'Seconds':>10}{'Docs/s':>12}")
+print(f"{'TF-IDF transform':<32}{tfidf_seconds:>10.3f}{N_DOCUMENTS / tfidf_seconds:>12.0f}")
+print(f"{'Hashing partial_fit (streamed)':<32}{fit_seconds:>10.3f}{N_DOCUMENTS / fit_seconds:>12.0f}")
+print(f"{'Hashing transform':<32}{hashing_seconds:>10.3f}{N_DOCUMENTS / hashing_seconds:>12.0f}")
+print(f"{f'Hashing transform ({WORKERS} workers)':<32}{parallel_seconds:>10.3f}{N_DOCUMENTS / parallel_seconds:>12.0f}")
+print()
+for k in TOP_K:
+    print(f"Top-{k} agreement with TF-IDF mode: {np.mean(overlaps[k]):.3f}")
+print(f"Mean Spearman correlation of scores: {np.mean(correlations):.3f}")
+
+# End of benchmark_hashing.py
@@ -0,0 +1,73 @@
+# benchmark_inverted_index.py
+# Latency of top-k retrieval with the inverted index against exact blocked
+# scoring, on a synthetic corpus built from results/cvs_cleaned.csv with a
+# long-tail skill vocabulary added to every CV and job
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from hashing_vectorizer import HashingTfidfVectorizer
+from inverted_index import InvertedIndex
+from scoring import top_k_similarities
+
+N_DOCUMENTS = 200000
+N_QUERIES = 50
+SKILL_VOCABULARY = 50000
+SKILLS_PER_DOCUMENT = 15
+TOP_K = [5, 20, 100]
+
+rng = np.random.default_rng(42)
+
+# ----------------------------
+# Synthetic corpus: cleaned CVs/jobs plus Zipf-distributed skill terms
+# ----------------------------
+cvs = pd.read_csv("../results/cvs_cleaned.csv")
+jobs = pd.read_csv("../results/jobs_cleaned.csv")
+cv_texts = cvs['cleaned_text'].fillna('').tolist()
+job_texts = jobs['cleaned_text'].fillna('').tolist()
+
+
+def skills(n):
+    """n skill tokens from a long-tail vocabulary"""
+    ranks = np.minimum(rng.zipf(1.3, size=n), SKILL_VOCABULARY)
+    return ' '.join(f"skill{rank}" for rank in ranks)
+
+
+corpus = [f"{cv_texts[rng.integers(len(cv_texts))]} {skills(SKILLS_PER_DOCUMENT)}" for _ in range(N_DOCUMENTS)]
+queries = [f"{job_texts[rng.integers(len(job_texts))]} {skills(SKILLS_PER_DOCUMENT)}" for _ in range(N_QUERIES)]
+
+vectorizer = HashingTfidfVectorizer()
+vectorizer.partial_fit(corpus)
+corpus_vectors = vectorizer.transform(corpus)
+query_vectors = vectorizer.transform(queries)
+
+# ----------------------------
+# Index build
+# ----------------------------
+start = time.perf_counter()
+index = InvertedIndex(corpus_vectors)
+build_seconds = time.perf_counter() - start
+
+# ----------------------------
+# Per-query latency (one job at a time, as /api/recommend sees them)
+# ----------------------------
+print(f"Corpus: {N_DOCUMENTS} synthetic CVs, {N_QUERIES} jobs, {corpus_vectors.nnz} non-zeros")
+print(f"Index build: {build_seconds:.2f}s")
+print()
+print(f"{'k':>5}{'Exact ms/query':>18}{'Index ms/query':>18}{'Identical':>12}")
+
+for k in TOP_K:
+    start = time.perf_counter()
+    exact = [top_k_similarities(query_vectors[i], corpus_vectors, k) for i in range(N_QUERIES)]
+    exact_ms = (time.perf_counter() - start) * 1000 / N_QUERIES
+
+    start = time.perf_counter()
+    indexed = [index.top_k(query_vectors[i], k) for i in range(N_QUERIES)]
+    index_ms = (time.perf_counter() - start) * 1000 / N_QUERIES
+
+    identical = all((a[0] == b[0]).all() for a, b in zip(exact, indexed))
+    print(f"{k:>5}{exact_ms:>18.2f}{index_ms:>18.2f}{str(identical):>12}")
+
+# End of benchmark_inverted_index.py
@@ -0,0 +1,104 @@
+# benchmark_lsa_index.py
+# Recall@k vs latency of the LSA + IVF index against exact cosine_similarity,
+# on synthetic corpora built from data/cvs_100.csv (cleaned CVs plus
+# long-tail skill terms that mostly follow the CV they are added to)
+
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics.pairwise import cosine_similarity
+
+from hashing_vectorizer import HashingTfidfVectorizer
+from lsa_index import LsaIndex
+from text_cleaning import clean_text
+
+CORPUS_SIZES = [50000, 200000]
+N_QUERIES = 50
+N_COMPONENTS = 128
+N_PROBES = [1, 4, 16]
+RERANKS = [1, 10, 100]  # exact TF-IDF re-scoring of the best k * rerank LSA candidates
+SKILL_VOCABULARY = 500  # per topic
+SKILLS_PER_DOCUMENT = 10
+OFF_TOPIC_SKILLS = 0.2
+K = 10
+
+rng = np.random.default_rng(42)
+
+# ----------------------------
+# Base documents: the 100 sample CVs, cleaned
+# ----------------------------
+cvs = pd.read_csv("../data/cvs_100.csv")
+base_texts = [
+    clean_text(f"{cv['skills']} {cv['experience']} {cv['education']} {cv['cv_text']}")
+    for _, cv in cvs.iterrows()
+]
+base_tokens = [text.split() for text in base_texts]
+
+
+def skills(n, topic):
+    """n skill tokens from a long-tail vocabulary, mostly from the given topic"""
+    ranks = np.minimum(rng.zipf(1.5, size=n), SKILL_VOCABULARY)
+    topics = np.where(rng.random(n) < OFF_TOPIC_SKILLS, rng.integers(len(base_tokens), size=n), topic)
+    return ' '.join(f"skill{t}x{rank}" for t, rank in zip(topics, ranks))
+
+
+def synthetic_document():
+    """A sample CV with ~20% of its tokens dropped and skills of its topic added"""
+    topic = rng.integers(len(base_tokens))
+    tokens = np.array(base_tokens[topic])
+    tokens = tokens[rng.random(len(tokens)) > 0.2]
+    return f"{' '.join(tokens)} {skills(SKILLS_PER_DOCUMENT, topic)}"
+
+
+print(f"{'CVs':>8}{'Search':>14}{'Probes':>8}{'Rerank':>8}{f'Recall@{K}':>11}{'ms/query':>11}")
+
+for n_documents in CORPUS_SIZES:
+    corpus = [synthetic_document() for _ in range(n_documents)]
+    queries = [synthetic_document() for _ in range(N_QUERIES)]
+
+    vectorizer = HashingTfidfVectorizer()
+    vectorizer.partial_fit(corpus)
+    corpus_vectors = vectorizer.transform(corpus)
+    query_vectors = vectorizer.transform(queries)
+
+    # ----------------------------
+    # Exact search, one job at a time
+    # ----------------------------
+    start = time.perf_counter()
+    exact_scores = []
+    for i in range(N_QUERIES):
+        scores = cosine_similarity(query_vectors[i], corpus_vectors)[0]
+        np.argpartition(-scores, K)[:K]
+        exact_scores.append(scores)
+    exact_ms = (time.perf_counter() - start) * 1000 / N_QUERIES
+    print(f"{n_documents:>8}{'exact':>14}{'-':>8}{'-':>8}{1.0:>11.3f}{exact_ms:>11.2f}")
+
+    # ----------------------------
+    # LSA + IVF
+    # ----------------------------
+    start = time.perf_counter()
+    index = LsaIndex(n_components=N_COMPONENTS).fit(corpus_vectors)
+    build_seconds = time.perf_counter() - start
+
+    n_partitions = len(index.offsets) - 1
+    for n_probe in N_PROBES + [n_partitions]:
+        for rerank in RERANKS:
+            start = time.perf_counter()
+            results = [
+                index.top_k(query_vectors[i], K, n_probe=n_probe, rerank=rerank)[0][0]
+                for i in range(N_QUERIES)
+            ]
+            lsa_ms = (time.perf_counter() - start) * 1000 / N_QUERIES
+
+            # Count a hit when the exact score reaches the exact k-th score (ties are not misses)
+            recall = np.mean([
+                np.mean(scores[found] >= np.sort(scores)[-K])
+                for scores, found in zip(exact_scores, results)
+            ])
+            print(f"{n_documents:>8}{'LSA + IVF':>14}{n_probe:>8}{rerank:>8}{recall:>11.3f}{lsa_ms:>11.2f}")
+
+    print(f"{'':>8}(index build: {build_seconds:.1f}s, {n_partitions} partitions, "
+          f"{index.vectors.nbytes / 1e6:.0f}MB of float32 vectors)")
+
+# End of benchmark_lsa_index.py
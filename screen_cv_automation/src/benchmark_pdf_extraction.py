@@ -0,0 +1,79 @@
+# benchmark_pdf_extraction.py
+# Time and peak memory of PDF text extraction: the previous whole-document
+# parse_pdf (string concatenation, PyPDF2 re-read when pdfplumber finds nothing)
+# against the streaming page-by-page extractor, with and without a budget,
+# on multi-page PDFs built by repeating the sample CV of create_sample_docs.py
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pdfplumber
+import PyPDF2
+
+from create_sample_docs import create_sample_cv_pdf
+from document_parser import DocumentParser
+
+PAGE_COUNTS = [1, 10, 50, 200]
+PAGE_BUDGET = 10
+CHAR_BUDGET = 20000
+REPEATS = 3
+
+
+def whole_document_parse(parser, file_path):
+    """parse_pdf as it was before streaming extraction"""
+    text = ""
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+    if not text.strip():
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page in pdf_reader.pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text += page_text + "\n"
+    return parser.clean_extracted_text(text)
+
+
+def measure(parse, file_path):
+    """Best time in ms over REPEATS runs, peak traced memory in MB and text length"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        text = parse(file_path)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(file_path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best * 1000, peak / 1e6, len(text)
+
+
+streaming = DocumentParser()
+variants = [
+    ('whole document', lambda path: whole_document_parse(streaming, path)),
+    ('streaming', streaming.parse_pdf),
+    (f'{PAGE_BUDGET}-page budget', DocumentParser(page_budget=PAGE_BUDGET).parse_pdf),
+    (f'{CHAR_BUDGET}-char budget', DocumentParser(char_budget=CHAR_BUDGET).parse_pdf),
+]
+
+print(f"{'Pages':>6}{'Extractor':>20}{'ms':>10}{'Peak MB':>10}{'Chars':>10}")
+
+with tempfile.TemporaryDirectory() as folder:
+    for pages in PAGE_COUNTS:
+        file_path = os.path.join(folder, f'cv_{pages}.pdf')
+        with contextlib.redirect_stdout(io.StringIO()):
+            create_sample_cv_pdf(file_path, pages=pages)
+
+        for name, parse in variants:
+            ms, peak_mb, chars = measure(parse, file_path)
+            print(f"{pages:>6}{name:>20}{ms:>10.1f}{peak_mb:>10.1f}{chars:>10}")
+
+# End of benchmark_pdf_extraction.py
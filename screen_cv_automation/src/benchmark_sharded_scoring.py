@@ -0,0 +1,82 @@
+# benchmark_sharded_scoring.py
+# Scaling of sharded exact scoring with the number of worker processes,
+# on a synthetic corpus built from results/cvs_cleaned.csv
+# Pool workers are started with forkserver and import this script, hence the main guard
+
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from scoring import get_scoring_pool, sharded_top_k_similarities, shutdown_scoring_pool, top_k_similarities
+
+N_DOCUMENTS = 1000000
+TOP_N = 20
+REPEATS = 3
+
+
+def build_corpus():
+    """Synthetic corpus: the cleaned CVs with ~20% of their tokens dropped"""
+    rng = np.random.default_rng(42)
+    cvs = pd.read_csv("../results/cvs_cleaned.csv")
+    jobs = pd.read_csv("../results/jobs_cleaned.csv")
+    base_tokens = [np.array(str(text).split()) for text in cvs['cleaned_text'].fillna('')]
+
+    corpus = []
+    for _ in range(N_DOCUMENTS):
+        tokens = base_tokens[rng.integers(len(base_tokens))]
+        corpus.append(' '.join(tokens[rng.random(len(tokens)) > 0.2]))
+
+    with open("../models/vectorizer.pkl", "rb") as f:
+        vectorizer = pickle.load(f)
+
+    cv_vectors = vectorizer.transform(corpus).astype(np.float32)
+    job_vectors = vectorizer.transform(jobs['cleaned_text'].fillna('')).astype(np.float32)
+    return job_vectors, cv_vectors
+
+
+def main():
+    job_vectors, cv_vectors = build_corpus()
+
+    # ----------------------------
+    # Single process vs. the shared pool at increasing sizes
+    # Each pool is started and warmed up (workers attach the corpus) before
+    # timing, as in the app where the pool outlives requests
+    # ----------------------------
+    start = time.perf_counter()
+    expected = top_k_similarities(job_vectors, cv_vectors, TOP_N)
+    single_seconds = time.perf_counter() - start
+
+    print(f"Corpus: {N_DOCUMENTS} synthetic CVs, {job_vectors.shape[0]} jobs, {os.cpu_count()} CPUs")
+    print()
+    print(f"{'Workers':>8}{'Startup':>10}{'Seconds':>10}{'Speedup':>10}{'Efficiency':>12}{'Identical':>11}")
+    print(f"{1:>8}{'-':>10}{single_seconds:>10.2f}{1.0:>10.2f}{1.0:>12.2f}{'-':>11}")
+
+    workers = 2
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        get_scoring_pool(workers)
+        sharded_top_k_similarities(job_vectors, cv_vectors, TOP_N, workers=workers, corpus_key=N_DOCUMENTS)
+        startup_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            indices, scores = sharded_top_k_similarities(job_vectors, cv_vectors, TOP_N,
+                                                         workers=workers, corpus_key=N_DOCUMENTS)
+        seconds = (time.perf_counter() - start) / REPEATS
+
+        speedup = single_seconds / seconds
+        identical = (indices == expected[0]).all() and np.array_equal(scores, expected[1])
+        print(f"{workers:>8}{startup_seconds:>10.2f}{seconds:>10.2f}{speedup:>10.2f}"
+              f"{speedup / workers:>12.2f}{str(identical):>11}")
+        workers *= 2
+
+    shutdown_scoring_pool()
+
+
+if __name__ == "__main__":
+    main()
+
+# End of benchmark_sharded_scoring.py
@@ -0,0 +1,48 @@
+# benchmark_text_cleaning.py
+# Inline cleaning against a process pool, to calibrate MIN_CHARS_PER_WORKER in
+# recommendation_pipeline.py: pool startup, the per-call cost of a warm pool and
+# inline throughput per character, on batches built from data/cvs_100.csv
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from text_cleaning import clean_text, init_worker
+
+WORKERS = 2
+BATCH_SIZES = [64, 512, 2000]
+REPEATS = [1, 30]  # copies of each CV per document: ~120 and ~3600 characters
+
+cvs = pd.read_csv("../data/cvs_100.csv")
+base = (cvs['skills'].fillna('') + ' ' + cvs['experience'].fillna('') + ' '
+        + cvs['education'].fillna('') + ' ' + cvs['cv_text'].fillna('')).tolist()
+init_worker()
+
+
+def best_time(function, repeats=3):
+    """Best wall time in seconds over a few runs"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+start = time.perf_counter()
+with ProcessPoolExecutor(max_workers=WORKERS, initializer=init_worker) as executor:
+    list(executor.map(clean_text, base[:WORKERS]))
+    print(f"Pool startup ({WORKERS} workers, first call): {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    print(f"{'Chars/doc':>10}{'Docs':>7}{'Inline ms':>11}{'Warm pool ms':>14}{'us/char':>9}")
+    for repeat in REPEATS:
+        documents = [' '.join([text] * repeat) for text in base] * 20
+        for n in BATCH_SIZES:
+            batch = documents[:n]
+            chars = sum(len(text) for text in batch)
+            inline = best_time(lambda: [clean_text(text) for text in batch])
+            pooled = best_time(lambda: list(executor.map(clean_text, batch, chunksize=max(1, n // (WORKERS * 4)))))
+            print(f"{chars // n:>10}{n:>7}{inline * 1000:>11.1f}{pooled * 1000:>14.1f}{inline / chars * 1e6:>9.3f}")
+
+# End of benchmark_text_cleaning.py
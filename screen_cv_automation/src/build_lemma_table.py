@@ -0,0 +1,56 @@
+# build_lemma_table.py
+# Precompute the WordNet noun lemma table used by text_cleaning.py,
+# so the app can lemmatize without NLTK data or network access.
+# Needs the NLTK 'wordnet' corpus on the machine where it is run.
+
+import json
+import nltk
+from nltk.corpus import wordnet
+from nltk.stem import WordNetLemmatizer
+
+# Download WordNet if it is not installed yet
+try:
+    wordnet.ensure_loaded()
+except LookupError:
+    nltk.download('wordnet', quiet=True)
+
+lemmatizer = WordNetLemmatizer()
+
+# ----------------------------
+# Collect every word the lemmatizer can change
+# ----------------------------
+# WordNetLemmatizer.lemmatize(word) only differs from word when word is in
+# the noun exception list, or when one of the noun suffix rules maps it to
+# a WordNet noun. Inverting the rules on every noun gives all such words.
+substitutions = wordnet.MORPHOLOGICAL_SUBSTITUTIONS['n']
+
+candidates = set(wordnet._exception_map['n'])
+for lemma in wordnet.all_lemma_names('n'):
+    for old, new in substitutions:
+        if lemma.endswith(new):
+            candidates.add(lemma[:len(lemma) - len(new)] + old)
+
+# Tokens only ever contain [a-z] after cleaning
+candidates = {word for word in candidates if word.isascii() and word.isalpha() and word.islower()}
+
+# ----------------------------
+# Lemmatize and keep the words that change
+# ----------------------------
+lemmas = {}
+for word in sorted(candidates):
+    lemma = lemmatizer.lemmatize(word)
+    if lemma != word:
+        lemmas[word] = lemma
+
+table = {
+    'version': 1,
+    'nltk_version': nltk.__version__,
+    'lemmas': lemmas
+}
+
+with open("../models/lemma_table.json", "w") as f:
+    json.dump(table, f, separators=(',', ':'), sort_keys=True)
+
+print(f"Lemma table completed. {len(lemmas)} entries saved in /models/lemma_table.json")
+
+# End of build_lemma_table.py
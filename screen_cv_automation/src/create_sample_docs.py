@@ -4,56 +4,104 @@ Create sample CV and Job Description documents for testing
 
 from docx import Document
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet
 
-def create_sample_cv_docx():
-    """Create a sample CV in DOCX format"""
-    doc = Document()
-    
-    doc.add_heading('John Doe', 0)
-    doc.add_paragraph('Senior Data Scientist')
-    
-    doc.add_heading('SKILLS', 1)
-    doc.add_paragraph(
-        'Python, Machine Learning, TensorFlow, Keras, PyTorch, Scikit-learn, '
-        'Pandas, NumPy, Data Analysis, Deep Learning, Neural Networks, '
-        'Computer Vision, NLP, SQL, Big Data, Spark, Docker, Git'
-    )
-    
-    doc.add_heading('EXPERIENCE', 1)
-    doc.add_paragraph('Senior Data Scientist at Tech Corp (2020-2024)')
-    doc.add_paragraph(
-        '• Led a team of 5 data scientists in developing ML models for customer segmentation\n'
-        '• Implemented recommendation systems that increased revenue by 30%\n'
-        '• Built and deployed 10+ production ML models using TensorFlow and PyTorch\n'
-        '• Designed data pipelines processing 1M+ records daily using Apache Spark\n'
-        '• Mentored junior data scientists and conducted code reviews'
-    )
-    
-    doc.add_paragraph('Data Scientist at AI Solutions (2018-2020)')
-    doc.add_paragraph(
-        '• Developed predictive models for financial forecasting\n'
-        '• Created NLP solutions for text classification and sentiment analysis\n'
-        '• Collaborated with engineering teams to deploy ML models to production\n'
-        '• Improved model accuracy by 25% through feature engineering'
-    )
-    
-    doc.add_heading('EDUCATION', 1)
-    doc.add_paragraph('Master of Science in Computer Science')
-    doc.add_paragraph('Stanford University (2016-2018)')
-    doc.add_paragraph('Specialization: Machine Learning and Artificial Intelligence')
+SAMPLE_CV_TEXT = """
+JOHN DOE
+Senior Data Scientist
+Email: john.doe@email.com | Phone: (555) 123-4567
+
+SKILLS
+Python, Machine Learning, TensorFlow, Keras, PyTorch, Scikit-learn, Pandas, NumPy, 
+Data Analysis, Deep Learning, Neural Networks, Computer Vision, NLP, SQL, Big Data, 
+Spark, Docker, Git, AWS, Statistical Analysis, Data Visualization
+
+EXPERIENCE
+
+Senior Data Scientist | Tech Corp | 2020-2024
+• Led a team of 5 data scientists in developing ML models for customer segmentation
+• Implemented recommendation systems that increased revenue by 30%
+• Built and deployed 10+ production ML models using TensorFlow and PyTorch
+• Designed data pipelines processing 1M+ records daily using Apache Spark
+• Mentored junior data scientists and conducted code reviews
+
+Data Scientist | AI Solutions | 2018-2020
+• Developed predictive models for financial forecasting
+• Created NLP solutions for text classification and sentiment analysis
+• Collaborated with engineering teams to deploy ML models to production
+• Improved model accuracy by 25% through feature engineering
+
+EDUCATION
+
+Master of Science in Computer Science
+Stanford University | 2016-2018
+Specialization: Machine Learning and Artificial Intelligence
+
+Bachelor of Science in Mathematics
+MIT | 2012-2016
+
+CERTIFICATIONS
+• TensorFlow Developer Certificate
+• AWS Certified Machine Learning - Specialty
+• Deep Learning Specialization (Coursera)
+"""
+
+def create_sample_cv_docx(file_path='sample_cv.docx', copies=1):
+    """
+    Create a sample CV in DOCX format
     
-    doc.add_paragraph('Bachelor of Science in Mathematics')
-    doc.add_paragraph('MIT (2012-2016)')
+    Args:
+        file_path (str): Where to write the DOCX
+        copies (int): Number of times the CV content is repeated, to build long documents
+    """
+    doc = Document()
     
-    doc.add_heading('CERTIFICATIONS', 1)
-    doc.add_paragraph('• TensorFlow Developer Certificate')
-    doc.add_paragraph('• AWS Certified Machine Learning - Specialty')
-    doc.add_paragraph('• Deep Learning Specialization (Coursera)')
+    # Repeat the CV to build long documents
+    for _ in range(copies):
+        doc.add_heading('John Doe', 0)
+        doc.add_paragraph('Senior Data Scientist')
+        
+        doc.add_heading('SKILLS', 1)
+        doc.add_paragraph(
+            'Python, Machine Learning, TensorFlow, Keras, PyTorch, Scikit-learn, '
+            'Pandas, NumPy, Data Analysis, Deep Learning, Neural Networks, '
+            'Computer Vision, NLP, SQL, Big Data, Spark, Docker, Git'
+        )
+        
+        doc.add_heading('EXPERIENCE', 1)
+        doc.add_paragraph('Senior Data Scientist at Tech Corp (2020-2024)')
+        doc.add_paragraph(
+            '• Led a team of 5 data scientists in developing ML models for customer segmentation\n'
+            '• Implemented recommendation systems that increased revenue by 30%\n'
+            '• Built and deployed 10+ production ML models using TensorFlow and PyTorch\n'
+            '• Designed data pipelines processing 1M+ records daily using Apache Spark\n'
+            '• Mentored junior data scientists and conducted code reviews'
+        )
+        
+        doc.add_paragraph('Data Scientist at AI Solutions (2018-2020)')
+        doc.add_paragraph(
+            '• Developed predictive models for financial forecasting\n'
+            '• Created NLP solutions for text classification and sentiment analysis\n'
+            '• Collaborated with engineering teams to deploy ML models to production\n'
+            '• Improved model accuracy by 25% through feature engineering'
+        )
+        
+        doc.add_heading('EDUCATION', 1)
+        doc.add_paragraph('Master of Science in Computer Science')
+        doc.add_paragraph('Stanford University (2016-2018)')
+        doc.add_paragraph('Specialization: Machine Learning and Artificial Intelligence')
+        
+        doc.add_paragraph('Bachelor of Science in Mathematics')
+        doc.add_paragraph('MIT (2012-2016)')
+        
+        doc.add_heading('CERTIFICATIONS', 1)
+        doc.add_paragraph('• TensorFlow Developer Certificate')
+        doc.add_paragraph('• AWS Certified Machine Learning - Specialty')
+        doc.add_paragraph('• Deep Learning Specialization (Coursera)')
     
-    doc.save('sample_cv.docx')
-    print("✓ Created sample_cv.docx")
+    doc.save(file_path)
+    print(f"✓ Created {file_path}")
 
 def create_sample_job_docx():
     """Create a sample job description in DOCX format"""
@@ -114,50 +162,31 @@ def create_sample_job_docx():
 
 def create_sample_cv_txt():
     """Create a sample CV in TXT format"""
-    content = """
-JOHN DOE
-Senior Data Scientist
-Email: john.doe@email.com | Phone: (555) 123-4567
-
-SKILLS
-Python, Machine Learning, TensorFlow, Keras, PyTorch, Scikit-learn, Pandas, NumPy, 
-Data Analysis, Deep Learning, Neural Networks, Computer Vision, NLP, SQL, Big Data, 
-Spark, Docker, Git, AWS, Statistical Analysis, Data Visualization
-
-EXPERIENCE
-
-Senior Data Scientist | Tech Corp | 2020-2024
-• Led a team of 5 data scientists in developing ML models for customer segmentation
-• Implemented recommendation systems that increased revenue by 30%
-• Built and deployed 10+ production ML models using TensorFlow and PyTorch
-• Designed data pipelines processing 1M+ records daily using Apache Spark
-• Mentored junior data scientists and conducted code reviews
-
-Data Scientist | AI Solutions | 2018-2020
-• Developed predictive models for financial forecasting
-• Created NLP solutions for text classification and sentiment analysis
-• Collaborated with engineering teams to deploy ML models to production
-• Improved model accuracy by 25% through feature engineering
-
-EDUCATION
-
-Master of Science in Computer Science
-Stanford University | 2016-2018
-Specialization: Machine Learning and Artificial Intelligence
-
-Bachelor of Science in Mathematics
-MIT | 2012-2016
-
-CERTIFICATIONS
-• TensorFlow Developer Certificate
-• AWS Certified Machine Learning - Specialty
-• Deep Learning Specialization (Coursera)
-"""
-    
     with open('sample_cv.txt', 'w') as f:
-        f.write(content)
+        f.write(SAMPLE_CV_TEXT)
     print("✓ Created sample_cv.txt")
 
+def create_sample_cv_pdf(file_path='sample_cv.pdf', pages=1):
+    """
+    Create a sample CV in PDF format
+    
+    Args:
+        file_path (str): Where to write the PDF
+        pages (int): Number of pages; each one repeats the sample CV, to build long documents
+    """
+    styles = getSampleStyleSheet()
+    story = []
+    for page in range(pages):
+        if page:
+            story.append(PageBreak())
+        story.append(Paragraph(f'Page {page + 1}', styles['Heading2']))
+        for block in SAMPLE_CV_TEXT.strip().split('\n\n'):
+            story.append(Paragraph(block.replace('\n', '<br/>'), styles['Normal']))
+            story.append(Spacer(1, 6))
+    
+    SimpleDocTemplate(file_path, pagesize=letter).build(story)
+    print(f"✓ Created {file_path}")
+
 def create_sample_job_txt():
     """Create a sample job description in TXT format"""
     content = """
@@ -219,12 +248,16 @@ if __name__ == "__main__":
         create_sample_cv_txt()
         create_sample_job_txt()
         
+        # Create PDF file
+        create_sample_cv_pdf()
+        
         print("\n" + "="*50)
         print("✓ All sample documents created successfully!")
         print("="*50)
         print("\nYou can now use these files to test the upload functionality:")
         print("• sample_cv.docx")
         print("• sample_cv.txt")
+        print("• sample_cv.pdf")
         print("• sample_job.docx")
         print("• sample_job.txt")
         
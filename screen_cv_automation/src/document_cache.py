@@ -0,0 +1,166 @@
+"""
+document_cache.py
+Content-addressed on-disk cache for parsed and cleaned documents
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+# Bump when the layout of cache entries changes
+CACHE_FORMAT_VERSION = 2
+
+
+class DocumentCache:
+    """
+    Cache of document parsing results keyed by the SHA-256 of the uploaded bytes,
+    their file extension (which picks the parser), the cache format and the
+    settings that produced them
+    Each entry is one JSON file; the least recently used entries are evicted
+    once the cache grows beyond max_bytes
+    """
+
+    def __init__(self, cache_dir='cache/documents', max_bytes=200 * 1024 * 1024, settings=None):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Folder where cache entries are stored
+            max_bytes: Maximum total size of the cache on disk
+            settings: JSON-serializable dict of everything that changes the cached
+                      output (parser/cleaner versions, page and character budgets);
+                      entries written under other settings are never served
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.settings = settings or {}
+        self.key_prefix = json.dumps(
+            {'format': CACHE_FORMAT_VERSION, 'settings': self.settings}, sort_keys=True
+        ).encode('utf-8')
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Track entry sizes so eviction does not need to rescan the folder
+        self.sizes = {}
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith('.json'):
+                self.sizes[filename[:-5]] = os.path.getsize(os.path.join(self.cache_dir, filename))
+        self.total_bytes = sum(self.sizes.values())
+
+    def key_for(self, data, extension):
+        """
+        Compute the cache key for a document under the cache's format and settings
+
+        Args:
+            data (bytes): Raw document bytes
+            extension (str): File extension the bytes were uploaded with (e.g. 'pdf'
+                             or '.PDF'); the same bytes parse differently as another type
+
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        digest = hashlib.sha256(self.key_prefix)
+        digest.update(b'\0')
+        digest.update(extension.lstrip('.').lower().encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        """Path of the JSON file holding a cache entry"""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Look up a cached document
+
+        Args:
+            key (str): Cache key from key_for()
+
+        Returns:
+            dict: Cached entry ({text, sections, cleaned_sections}) or None on a miss
+        """
+        with self.lock:
+            path = self.entry_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+
+            # Mark as recently used
+            os.utime(path)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        """
+        Store a document in the cache, evicting least recently used entries if needed
+
+        Args:
+            key (str): Cache key from key_for()
+            entry (dict): JSON-serializable entry ({text, sections, cleaned_sections})
+        """
+        data = json.dumps(entry).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+
+        with self.lock:
+            path = self.entry_path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self.total_bytes += len(data) - self.sizes.get(key, 0)
+            self.sizes[key] = len(data)
+
+            if self.total_bytes > self.max_bytes:
+                self.evict(keep=key)
+
+    def evict(self, keep=None):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        for key in self.sizes:
+            if key == keep:
+                continue
+            try:
+                entries.append((os.path.getmtime(self.entry_path(key)), key))
+            except OSError:
+                entries.append((0, key))
+        entries.sort()
+
+        for _, key in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(self.entry_path(key))
+            except OSError:
+                pass
+            self.total_bytes -= self.sizes.pop(key)
+            self.evictions += 1
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: Hits, misses, hit rate, evictions, entries and size
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.sizes),
+                'size_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes
+            }
@@ -1,121 +1,279 @@
 import PyPDF2
 import pdfplumber
 from docx import Document
+import io
+import itertools
+import math
+import multiprocessing
 import os
 import re
+import signal
+import time
+import zipfile
+from xml.etree import ElementTree
+
+try:
+    import resource
+except ImportError:  # not available on Windows: parse workers then run without rlimits
+    resource = None
+
+# Bump whenever a change alters the text extracted from a document
+# (part of the document cache key, so older cached results are not served)
+PARSER_VERSION = 3
+
+# Seconds a single document may take in parse_many() before it is reported as failed
+PARSE_TIMEOUT = 60
+
+# Extra seconds parse_many() waits for workers stuck where the timeout alarm cannot fire
+PARSE_GRACE = 5
+
+# Per-document limits inside parse_many() workers
+PARSE_MAX_CPU_SECONDS = 30
+PARSE_MAX_MEMORY = 512 * 1024 * 1024  # bytes of address space on top of the worker's own
+
+# Documents a parse worker handles before it is replaced by a fresh process
+PARSE_TASKS_PER_WORKER = 20
+
+# Seconds between parse_many() checks on running tasks (worker died, deadline passed)
+PARSE_POLL_INTERVAL = 0.05
+
+# Seconds to wait for the result of a task whose worker has exited before failing it
+PARSE_RESULT_GRACE = 1
+
+# WordprocessingML namespace, as ElementTree tag prefix
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Text of run elements, as python-docx renders them (w:t and w:br are handled separately)
+RUN_TEXT = {W + 'tab': '\t', W + 'ptab': '\t', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+
+# Per-process state of parse_many() workers (see init_parse_worker)
+_worker_parser = None
+_worker_limits = None
+_worker_started = None
+_worker_busy = False
+
+
+class ParseTimeout(BaseException):
+    """
+    Raised inside a parse worker when a document exceeds its time or CPU budget
+    A BaseException, so the parsers' own 'except Exception' blocks do not swallow it
+    """
 
 
 class DocumentParser:
     """Parse documents and extract text content"""
     
-    def __init__(self):
+    def __init__(self, max_pages=None, page_budget=None, char_budget=None):
+        """
+        Args:
+            max_pages (int): PDFs with more pages are rejected (None: no limit)
+            page_budget (int): Only the first pages of a PDF are read (None: all)
+            char_budget (int): PDF text is cut off at this many characters (None: no cutoff)
+        """
         self.supported_formats = ['.pdf', '.docx', '.txt']
+        self.max_pages = max_pages
+        self.page_budget = page_budget
+        self.char_budget = char_budget
     
-    def parse_file(self, file_path):
+    def parse_file(self, file_path, content=None):
         """
         Parse a file and extract text based on its format
         
         Args:
-            file_path (str): Path to the file
+            file_path (str): Path to the file (only its extension is used when content is given)
+            content: The file's content as bytes or a binary file-like object,
+                     to parse an upload without writing it to disk first
             
         Returns:
             str: Extracted text content
         """
         file_extension = os.path.splitext(file_path)[1].lower()
         
+        # The parsers take a path or bytes
+        source = file_path
+        if content is not None:
+            source = content if isinstance(content, (bytes, bytearray)) else content.read()
+        
         if file_extension == '.pdf':
-            return self.parse_pdf(file_path)
+            return self.parse_pdf(source)
         elif file_extension == '.docx':
-            return self.parse_docx(file_path)
+            return self.parse_docx(source)
         elif file_extension == '.txt':
-            return self.parse_txt(file_path)
+            return self.parse_txt(source)
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
     
     def parse_pdf(self, file_path):
         """
         Extract text from PDF file
-        Uses pdfplumber as primary method, falls back to PyPDF2
+        Reads pages one at a time and stops once the page or character budget is used
         
         Args:
-            file_path (str): Path to PDF file
+            file_path (str or bytes): Path to PDF file, or its content
             
         Returns:
             str: Extracted text
         """
-        text = ""
+        parts = []
+        length = 0
+        pages = self.iter_pdf_pages(file_path)
         
         try:
-            # Method 1: pdfplumber (better for complex PDFs)
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            
-            # If pdfplumber fails, try PyPDF2
-            if not text.strip():
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
+            # islice stops before the generator extracts the page after the budget
+            for page_text in itertools.islice(pages, self.page_budget):
+                if page_text:
+                    parts.append(page_text + "\n")
+                    length += len(parts[-1])
+                if self.char_budget is not None and length >= self.char_budget:
+                    break
         
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
         
+        finally:
+            # Closes the PDF now rather than when the generator is collected
+            pages.close()
+        
+        text = "".join(parts)
+        if self.char_budget is not None:
+            text = text[:self.char_budget]
         return self.clean_extracted_text(text)
     
+    def iter_pdf_pages(self, file_path):
+        """
+        Yield the text of each page of a PDF
+        Uses pdfplumber as primary method, falls back to PyPDF2 for pages where it finds no text
+        
+        Args:
+            file_path (str or bytes): Path to PDF file, or its content
+            
+        Yields:
+            str: Text of the page ('' when neither library finds any)
+        """
+        with open_source(file_path) as file, pdfplumber.open(file) as pdf:
+            if self.max_pages is not None and len(pdf.pages) > self.max_pages:
+                raise ValueError(f"{len(pdf.pages)} pages, the limit is {self.max_pages}")
+            
+            # PyPDF2 only opens the file once a page needs it
+            fallback_file = None
+            try:
+                for number, page in enumerate(pdf.pages):
+                    page_text = page.extract_text()
+                    # Release the page's layout objects and text map, they are not needed again
+                    page.close()
+                    if not (page_text or '').strip():
+                        if fallback_file is None:
+                            # Its own stream: pdfplumber expects its file position to stay put
+                            fallback_file = open_source(file_path)
+                            pdf_reader = PyPDF2.PdfReader(fallback_file)
+                        page_text = pdf_reader.pages[number].extract_text()
+                    yield page_text or ''
+            finally:
+                if fallback_file is not None:
+                    fallback_file.close()
+    
     def parse_docx(self, file_path):
         """
         Extract text from DOCX file
+        Streams the document XML (see iter_docx_blocks), falls back to python-docx
+        for packages without a readable main document part
         
         Args:
-            file_path (str): Path to DOCX file
+            file_path (str or bytes): Path to DOCX file, or its content
             
         Returns:
             str: Extracted text
         """
         try:
-            doc = Document(file_path)
-            text = ""
-            
-            # Extract text from paragraphs
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " "
-                text += "\n"
+            try:
+                text = "".join(self.iter_docx_blocks(file_path))
+            except (KeyError, ElementTree.ParseError):
+                text = self.docx_document_text(file_path)
             
             return self.clean_extracted_text(text)
         
         except Exception as e:
             raise Exception(f"Error parsing DOCX: {str(e)}")
     
+    def iter_docx_blocks(self, file_path):
+        """
+        Yield the text of each body paragraph and table of a DOCX file, in document order
+        Reads the document XML incrementally, so only one block is held in memory at a time
+        
+        Text matches python-docx: a paragraph is followed by a newline, each table
+        cell by a space (spanned cells repeat) and each table by a newline.
+        
+        Args:
+            file_path (str or bytes): Path to DOCX file, or its content
+            
+        Yields:
+            str: Text of the paragraph or table
+        """
+        with open_source(file_path) as file, zipfile.ZipFile(file) as package:
+            with package.open(docx_main_part(package)) as document:
+                depth = 0
+                body = None
+                for event, element in ElementTree.iterparse(document, events=('start', 'end')):
+                    if event == 'start':
+                        depth += 1
+                        if depth == 2 and element.tag == W + 'body':
+                            body = element
+                        continue
+                    
+                    depth -= 1
+                    if depth != 2 or body is None:
+                        continue
+                    if element.tag == W + 'p':
+                        yield docx_paragraph_text(element) + "\n"
+                    elif element.tag == W + 'tbl':
+                        yield docx_table_text(element) + "\n"
+                    # Drop the finished block
+                    body.clear()
+    
+    def docx_document_text(self, file_path):
+        """
+        Extract text from DOCX file with the python-docx object model
+        Paragraphs come first, then tables
+        
+        Args:
+            file_path (str or bytes): Path to DOCX file, or its content
+            
+        Returns:
+            str: Raw extracted text
+        """
+        with open_source(file_path) as file:
+            doc = Document(file)
+        
+        # Extract text from paragraphs
+        parts = [paragraph.text + "\n" for paragraph in doc.paragraphs]
+        
+        # Extract text from tables
+        for table in doc.tables:
+            for row in table.rows:
+                parts.extend(cell.text + " " for cell in row.cells)
+            parts.append("\n")
+        
+        return "".join(parts)
+    
     def parse_txt(self, file_path):
         """
         Extract text from TXT file
         
         Args:
-            file_path (str): Path to TXT file
+            file_path (str or bytes): Path to TXT file, or its content
             
         Returns:
             str: Extracted text
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
+            with io.TextIOWrapper(open_source(file_path), encoding='utf-8') as file:
                 text = file.read()
             return self.clean_extracted_text(text)
         
         except UnicodeDecodeError:
             # Try different encoding if UTF-8 fails
             try:
-                with open(file_path, 'r', encoding='latin-1') as file:
+                with io.TextIOWrapper(open_source(file_path), encoding='latin-1') as file:
                     text = file.read()
                 return self.clean_extracted_text(text)
             except Exception as e:
@@ -158,6 +316,103 @@ class DocumentParser:
         file_extension = os.path.splitext(filename)[1].lower()
         return file_extension in self.supported_formats
     
+    def parse_many(self, paths, contents=None, workers=None, timeout=PARSE_TIMEOUT,
+                   max_cpu_seconds=PARSE_MAX_CPU_SECONDS, max_memory=PARSE_MAX_MEMORY,
+                   tasks_per_worker=PARSE_TASKS_PER_WORKER):
+        """
+        Parse and section-extract many files in sandboxed worker processes
+        
+        Each file gets its own wall-clock, CPU-time and memory budget (and this
+        parser's page limits), so one hostile document can only fail itself; it
+        never grows the calling process or holds up the rest of the batch.
+        Workers are replaced after tasks_per_worker documents to return memory
+        that parsers leave fragmented.
+        
+        Args:
+            paths (list): Paths of the files to parse
+            contents (list): Content (bytes) of each file, to parse uploads from
+                             memory; the paths then only give the formats
+            workers (int): Number of worker processes (default: number of CPUs)
+            timeout (float): Seconds allowed per file
+            max_cpu_seconds (int): CPU seconds allowed per file (None: no limit)
+            max_memory (int): Bytes of memory allowed per file (None: no limit)
+            tasks_per_worker (int): Files per worker process before it is recycled
+            
+        Returns:
+            list: One dict per path, in input order: {'path', 'text', 'sections'}
+                  on success, {'path', 'error'} on failure
+        """
+        paths = list(paths)
+        if not paths:
+            return []
+        
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = max(1, min(workers, len(paths)))
+        
+        if contents is None:
+            contents = [None] * len(paths)
+        
+        # Workers write their process ID into a task's slot when they start it, so each file
+        # gets its own deadline and a worker that dies (or is stuck in native code, where
+        # the alarm cannot fire) only fails its own file; the pool replaces the process and
+        # goes on with the batch. Plain shared memory: a killed worker cannot hold a lock.
+        started = multiprocessing.RawArray('l', len(paths))
+        pool = multiprocessing.Pool(
+            workers,
+            initializer=init_parse_worker,
+            initargs=(self, timeout, max_cpu_seconds, max_memory, started),
+            maxtasksperchild=tasks_per_worker
+        )
+        results = [None] * len(paths)
+        try:
+            pending = {task: pool.apply_async(parse_worker, (path, content, task))
+                       for task, (path, content) in enumerate(zip(paths, contents))}
+            running = {}  # task -> (worker pid, start time)
+            
+            # Backstop for tasks that never start: every file had its full budget by then
+            deadline = time.monotonic() + (timeout + PARSE_GRACE) * -(-len(paths) // workers) + PARSE_GRACE
+            
+            while pending:
+                next(iter(pending.values())).wait(PARSE_POLL_INTERVAL)
+                
+                now = time.monotonic()
+                for task, result in list(pending.items()):
+                    if task not in running and started[task]:
+                        running[task] = (started[task], now)
+                    
+                    error = None
+                    pid, start = running.get(task, (None, None))
+                    if result.ready():
+                        try:
+                            results[task] = result.get()
+                        except Exception as e:
+                            error = str(e)
+                    elif pid is not None and not process_alive(pid):
+                        # A recycled worker exits right after sending its last result
+                        result.wait(PARSE_RESULT_GRACE)
+                        if result.ready():
+                            continue
+                        error = "Parse worker died"
+                    elif pid is not None and now - start > timeout + PARSE_GRACE:
+                        # Stuck where the alarm cannot fire: free the slot for the next file
+                        kill_process(pid)
+                        error = f"Parsing timed out after {timeout}s"
+                    elif pid is None and now > deadline:
+                        error = f"Parsing timed out after {timeout}s"
+                    else:
+                        continue
+                    
+                    if error is not None:
+                        results[task] = {'path': paths[task], 'error': error}
+                    del pending[task]
+                    running.pop(task, None)
+        finally:
+            # Also kills workers still busy with a timed-out document
+            pool.terminate()
+        
+        return results
+    
     def extract_sections(self, text):
         """
         Extract common CV/Job sections using pattern matching
@@ -215,6 +470,206 @@ class DocumentParser:
         return sections
 
 
+def open_source(source):
+    """Binary file object for a path or for in-memory content"""
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return open(source, 'rb')
+
+
+def docx_main_part(package):
+    """Name of the main document part of a DOCX package (normally word/document.xml)"""
+    relationships = ElementTree.fromstring(package.read('_rels/.rels'))
+    for relationship in relationships:
+        if relationship.get('Type', '').endswith('/officeDocument'):
+            return relationship.get('Target').lstrip('/')
+    raise KeyError('No main document part')
+
+
+def docx_paragraph_text(paragraph):
+    """Text of a w:p element: its runs, including the runs of hyperlinks"""
+    parts = []
+    for child in paragraph:
+        if child.tag == W + 'r':
+            parts.append(docx_run_text(child))
+        elif child.tag == W + 'hyperlink':
+            parts.extend(docx_run_text(run) for run in child.findall(W + 'r'))
+    return "".join(parts)
+
+
+def docx_run_text(run):
+    """Text of a w:r element"""
+    parts = []
+    for child in run:
+        if child.tag == W + 't':
+            parts.append(child.text or '')
+        elif child.tag == W + 'br':
+            # Page and column breaks have no text
+            if child.get(W + 'type', 'textWrapping') == 'textWrapping':
+                parts.append("\n")
+        else:
+            parts.append(RUN_TEXT.get(child.tag, ''))
+    return "".join(parts)
+
+
+def docx_table_text(table):
+    """Text of a w:tbl element: each cell followed by a space, once per grid column it spans"""
+    parts = []
+    # Grid column -> text of the cell there in the previous row, for vertically merged cells
+    above = {}
+    for row in table.findall(W + 'tr'):
+        grid_before = row.find(f'{W}trPr/{W}gridBefore')
+        column = int(grid_before.get(W + 'val')) if grid_before is not None else 0
+        texts = {}
+        for cell in row.findall(W + 'tc'):
+            grid_span = cell.find(f'{W}tcPr/{W}gridSpan')
+            span = int(grid_span.get(W + 'val')) if grid_span is not None else 1
+            v_merge = cell.find(f'{W}tcPr/{W}vMerge')
+            if v_merge is not None and v_merge.get(W + 'val', 'continue') == 'continue':
+                text = above.get(column, '')
+            else:
+                text = "\n".join(docx_paragraph_text(p) for p in cell.findall(W + 'p'))
+            texts[column] = text
+            parts.extend([text + " "] * span)
+            column += span
+        above = texts
+    return "".join(parts)
+
+
+def init_parse_worker(parser, timeout, max_cpu_seconds, max_memory, started=None):
+    """
+    Set up a parse_many() worker process
+    
+    Args:
+        parser (DocumentParser): Parser whose settings (page limits, budgets) the worker uses
+        timeout (float): Seconds allowed per file
+        max_cpu_seconds (int): CPU seconds allowed per file
+        max_memory (int): Bytes of memory allowed per file
+        started (multiprocessing.RawArray): Slot per task, set to the worker's process ID
+                                            when it starts the file
+    """
+    global _worker_parser, _worker_limits, _worker_started
+    
+    _worker_parser = parser
+    _worker_limits = {'timeout': timeout, 'cpu': max_cpu_seconds, 'memory': max_memory}
+    _worker_started = started
+    if hasattr(signal, 'SIGALRM'):
+        signal.signal(signal.SIGALRM, raise_parse_timeout)
+    if hasattr(signal, 'SIGXCPU'):
+        signal.signal(signal.SIGXCPU, raise_parse_timeout)
+
+
+def raise_parse_timeout(signum, frame):
+    """SIGALRM / SIGXCPU handler of parse workers"""
+    # A late signal outside a document (e.g. while the pool unpickles the next task)
+    # must not raise into multiprocessing's worker loop, which would kill the process
+    if not _worker_busy:
+        return
+    if signum == getattr(signal, 'SIGXCPU', None):
+        raise ParseTimeout(f"CPU time limit of {_worker_limits['cpu']}s exceeded")
+    raise ParseTimeout(f"Parsing timed out after {_worker_limits['timeout']}s")
+
+
+def address_space_size():
+    """Current virtual memory size of this process in bytes (None where /proc is missing)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def set_document_limits():
+    """Give the next document of this worker a fresh CPU and memory budget"""
+    if resource is None:
+        return
+    
+    # RLIMIT_CPU counts the whole process life, so the budget starts at the time used so far
+    if _worker_limits['cpu'] is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = math.ceil(usage.ru_utime + usage.ru_stime + _worker_limits['cpu'])
+        hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    
+    # RSS limits are not enforced by Linux; address space is, and failed allocations raise MemoryError
+    current = address_space_size()
+    if _worker_limits['memory'] is not None and current is not None:
+        hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+        soft = current + _worker_limits['memory']
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def reset_document_limits():
+    """Lift the per-document CPU and memory limits once a document is done"""
+    if resource is None:
+        return
+    for limit in (resource.RLIMIT_CPU, resource.RLIMIT_AS):
+        hard = resource.getrlimit(limit)[1]
+        resource.setrlimit(limit, (hard, hard))
+
+
+def process_alive(pid):
+    """Whether a process with this ID still exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def kill_process(pid):
+    """Kill a process, if it still exists"""
+    try:
+        os.kill(pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def parse_worker(path, content=None, task=None):
+    """
+    Parse and section-extract one file inside a worker process
+    
+    Args:
+        path (str): Path to the file
+        content (bytes): Content of the file, if it is not read from path
+        task (int): Task number reported to parse_many() when the file is started
+        
+    Returns:
+        dict: {'path', 'text', 'sections'} or {'path', 'error'}
+    """
+    global _worker_busy
+    
+    if _worker_started is not None:
+        _worker_started[task] = os.getpid()
+    
+    # Without SIGALRM (Windows) only the per-task deadline in parse_many() applies
+    alarm = hasattr(signal, 'setitimer')
+    try:
+        _worker_busy = True
+        set_document_limits()
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, _worker_limits['timeout'])
+        text = _worker_parser.parse_file(path, content)
+        return {'path': path, 'text': text, 'sections': _worker_parser.extract_sections(text)}
+    except ParseTimeout as e:
+        return {'path': path, 'error': str(e)}
+    except Exception as e:
+        # The parsers re-raise errors with their own message; the original is the context
+        if isinstance(e, MemoryError) or isinstance(e.__context__, MemoryError):
+            return {'path': path, 'error': f"Memory limit of {_worker_limits['memory'] // 2 ** 20}MB exceeded"}
+        return {'path': path, 'error': str(e)}
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        _worker_busy = False
+        reset_document_limits()
+
 # Example usage
 if __name__ == "__main__":
     parser = DocumentParser()
@@ -0,0 +1,173 @@
+"""
+hashing_vectorizer.py
+Stateless hashed TF-IDF vectorization with a separately maintained IDF table
+"""
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class IdfTable:
+    """
+    Per-column document frequencies, updated as documents are added
+    (the app only ever deletes CVs all at once, which resets the table)
+    IDF uses the same smoothed formula as sklearn's TfidfVectorizer
+    """
+
+    def __init__(self, n_features):
+        """
+        Initialize an empty table
+
+        Args:
+            n_features: Number of columns (vocabulary size or hash buckets)
+        """
+        self.n_features = n_features
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+
+    def add(self, counts):
+        """
+        Count a batch of documents
+
+        Args:
+            counts: Sparse term-count matrix (one row per document)
+        """
+        counts = counts.tocsr()
+        counts.sum_duplicates()
+        self.document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += counts.shape[0]
+
+    def reset(self):
+        """Forget all documents"""
+        self.document_frequency[:] = 0
+        self.n_documents = 0
+
+    def idf(self, dtype=np.float64):
+        """
+        Smoothed inverse document frequency per column
+
+        Args:
+            dtype: Float type of the result
+
+        Returns:
+            1D array of IDF weights
+        """
+        return (np.log((1 + self.n_documents) / (1 + self.document_frequency)) + 1).astype(dtype)
+
+    def weight(self, counts, dtype=np.float64, idf=None):
+        """
+        Turn raw term counts into l2-normalized TF-IDF vectors
+
+        Args:
+            counts: Sparse term-count matrix (one row per document)
+            dtype: Float type of the result
+            idf: IDF weights to use instead of the table's current ones
+                 (e.g. those of an earlier refresh)
+
+        Returns:
+            TF-IDF vectors (sparse matrix, one row per document)
+        """
+        vectors = counts.tocsr().astype(dtype)
+        idf = self.idf(dtype) if idf is None else np.asarray(idf, dtype=dtype)
+        vectors.data *= idf[vectors.indices]
+        return normalize(vectors, copy=False)
+
+
+class HashingTfidfVectorizer:
+    """
+    TF-IDF vectorizer built on a stateless HashingVectorizer
+
+    Term counts need no fitted vocabulary, so new skill terms are never dropped
+    and documents can be vectorized in any order, batch or process. Only the
+    document-frequency table is state; it is updated with partial_fit() and
+    saved separately from the vectors. Weighting matches TfidfVectorizer's
+    defaults (smooth idf, raw tf, l2 norm).
+    """
+
+    def __init__(self, n_features=2 ** 18, dtype=np.float32):
+        """
+        Initialize with an empty document-frequency table
+
+        Args:
+            n_features: Number of hash buckets (columns)
+            dtype: Float type of the produced vectors
+        """
+        self.n_features = n_features
+        self.dtype = dtype
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+            dtype=dtype
+        )
+        self.idf_table = IdfTable(n_features)
+
+    def count(self, texts):
+        """
+        Hashed raw term counts, no fitting needed
+
+        Args:
+            texts: List of cleaned text strings
+
+        Returns:
+            Sparse matrix of term counts (one row per text)
+        """
+        return self.hasher.transform(texts)
+
+    def partial_fit(self, texts):
+        """
+        Add documents to the document-frequency table
+
+        Args:
+            texts: List of cleaned text strings
+
+        Returns:
+            self
+        """
+        self.idf_table.add(self.count(texts))
+        return self
+
+    @property
+    def idf_(self):
+        """Smoothed inverse document frequency per column (same formula as TfidfVectorizer)"""
+        return self.idf_table.idf(self.dtype)
+
+    def transform(self, texts):
+        """
+        Convert cleaned texts to l2-normalized TF-IDF vectors
+
+        Args:
+            texts: List of cleaned text strings
+
+        Returns:
+            TF-IDF vectors (sparse matrix, one row per text)
+        """
+        return self.idf_table.weight(self.count(texts), self.dtype)
+
+    def save(self, path):
+        """Save the document-frequency table (.npz)"""
+        np.savez_compressed(
+            path,
+            n_features=self.n_features,
+            n_documents=self.idf_table.n_documents,
+            document_frequency=self.idf_table.document_frequency
+        )
+
+    @classmethod
+    def load(cls, path, dtype=np.float32):
+        """
+        Load a document-frequency table saved with save()
+
+        Args:
+            path: Path to the .npz file
+            dtype: Float type of the produced vectors
+
+        Returns:
+            HashingTfidfVectorizer
+        """
+        with np.load(path) as table:
+            vectorizer = cls(n_features=int(table['n_features']), dtype=dtype)
+            vectorizer.idf_table.n_documents = int(table['n_documents'])
+            vectorizer.idf_table.document_frequency = table['document_frequency'].astype(np.int64)
+        return vectorizer
@@ -0,0 +1,211 @@
+"""
+inverted_index.py
+Top-k cosine similarity search over term posting lists with early termination
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+from sklearn.preprocessing import normalize
+
+# Postings read per term in the first round; later rounds read 4x deeper
+INITIAL_DEPTH = 64
+DEPTH_GROWTH = 4
+
+# Once the postings left to read exceed this fraction of the corpus, pruning is not
+# paying off (common terms only) and the rest is scored with one sparse product
+FULL_SCAN_FRACTION = 0.5
+
+# Slack on the pruning bound, so float rounding never drops a document that ties the threshold
+BOUND_EPSILON = 1e-5
+
+
+class InvertedIndex:
+    """
+    Inverted index of l2-normalized document vectors
+
+    Every term keeps a posting list of (document, weight) pairs sorted by
+    descending weight. A query reads each of its terms' lists progressively
+    deeper and scores the documents it meets exactly; once k documents are
+    scored, their k-th best score is a threshold, and (MaxScore bound) a
+    document can only beat it if, for one of its terms,
+
+        query_weight * weight >= threshold - (sum of the other terms' upper bounds)
+
+    so each list only has to be read down to that weight. Most documents are
+    never scored. Results are identical to scoring.top_k_similarities, ties
+    included (lower corpus index first).
+    """
+
+    def __init__(self, corpus_vectors):
+        """
+        Build the index
+
+        Args:
+            corpus_vectors: Corpus vectors, e.g. CVs (sparse matrix, one row per document)
+        """
+        self.corpus = normalize(csr_matrix(corpus_vectors))
+        self.n_documents, self.n_features = self.corpus.shape
+
+        postings = self.corpus.tocsc()
+        postings.sort_indices()
+        terms = np.repeat(np.arange(self.n_features), np.diff(postings.indptr))
+        # Within each term: weight descending, then document ascending (lexsort is stable)
+        order = np.lexsort((-postings.data, terms))
+
+        self.term_ptr = postings.indptr.astype(np.int64)
+        self.documents = postings.indices[order]
+        self.weights = postings.data[order]
+
+        self.max_weight = np.zeros(self.n_features, dtype=self.weights.dtype)
+        nonempty = np.diff(self.term_ptr) > 0
+        self.max_weight[nonempty] = self.weights[self.term_ptr[:-1][nonempty]]
+
+    def __len__(self):
+        return self.n_documents
+
+    def top_k(self, query_vectors, k):
+        """
+        Find the k most similar documents (cosine similarity) for every query row
+
+        Args:
+            query_vectors: Query vectors, e.g. jobs (sparse matrix or array)
+            k: Number of results per query
+
+        Returns:
+            Tuple (indices, scores), both arrays of shape (n_queries, min(k, n_documents)),
+            sorted by descending score, as returned by scoring.top_k_similarities
+        """
+        queries = normalize(csr_matrix(query_vectors) if issparse(query_vectors) else csr_matrix(np.asarray(query_vectors)))
+        k = max(0, min(k, self.n_documents))
+
+        top_indices = np.zeros((queries.shape[0], k), dtype=np.int64)
+        top_scores = np.zeros((queries.shape[0], k), dtype=np.result_type(queries.dtype, self.corpus.dtype))
+        if k == 0:
+            return top_indices, top_scores
+
+        for row in range(queries.shape[0]):
+            indices, scores = self.search(queries[row], k)
+            top_indices[row] = indices
+            top_scores[row] = scores
+
+        return top_indices, top_scores
+
+    def search(self, query, k):
+        """
+        Top-k search for a single normalized query row
+
+        Args:
+            query: 1 x n_features CSR row
+            k: Number of results (at most n_documents)
+
+        Returns:
+            Tuple (indices, scores) of length k, sorted by descending score
+        """
+        keep = query.data > 0
+        # Terms in ascending order of their largest possible contribution
+        upper_bounds = query.data[keep] * self.max_weight[query.indices[keep]]
+        order = np.argsort(upper_bounds, kind='stable')
+        terms = query.indices[keep][order]
+        query_weights = query.data[keep][order]
+        upper_bounds = upper_bounds[order]
+        starts = self.term_ptr[terms]
+        lengths = self.term_ptr[terms + 1] - starts
+
+        cumulative_bounds = np.cumsum(upper_bounds)
+        others = cumulative_bounds[-1] - upper_bounds if len(terms) else upper_bounds
+
+        dense_query = np.zeros(self.n_features, dtype=query.dtype)
+        dense_query[terms] = query_weights
+
+        scored = np.zeros(self.n_documents, dtype=bool)
+        first_seen = np.empty(self.n_documents, dtype=np.int64)
+        documents = []
+        scores = []
+        n_scored = 0
+        threshold = None
+        depth = INITIAL_DEPTH
+        done = np.zeros(len(terms), dtype=np.int64)  # postings already read per term
+
+        while True:
+            # How far down each posting list a document can still reach the threshold
+            limits = lengths.copy()
+            if threshold is not None:
+                # Non-essential terms: together they cannot reach the threshold, so a
+                # document found only in their lists can be skipped (MaxScore)
+                n_nonessential = np.searchsorted(cumulative_bounds, threshold - BOUND_EPSILON)
+                limits[:n_nonessential] = done[:n_nonessential]
+
+                min_weights = (threshold - others) / query_weights - BOUND_EPSILON
+                for i in np.nonzero(min_weights > 0)[0]:
+                    if i < n_nonessential:
+                        continue
+                    segment = self.weights[starts[i] + done[i]:starts[i] + lengths[i]]
+                    limits[i] = done[i] + np.searchsorted(-segment, -min_weights[i], side='right')
+
+            if threshold is not None and (limits - done).sum() > FULL_SCAN_FRACTION * self.n_documents:
+                return self.full_scan(dense_query, k)
+
+            reads = np.maximum(np.minimum(limits, depth), done)
+            candidates = np.concatenate(
+                [self.documents[s + d:s + n] for s, d, n in zip(starts, done, reads)]
+                or [np.zeros(0, dtype=np.int64)]
+            )
+            done = reads
+
+            # Drop documents already scored, then duplicates within the batch
+            candidates = candidates[~scored[candidates]]
+            first_seen[candidates] = np.arange(len(candidates))
+            candidates = candidates[first_seen[candidates] == np.arange(len(candidates))]
+
+            if len(candidates):
+                scored[candidates] = True
+                documents.append(candidates)
+                scores.append(self.corpus[candidates] @ dense_query)
+                n_scored += len(candidates)
+
+                if n_scored >= k:
+                    all_scores = np.concatenate(scores)
+                    threshold = np.partition(all_scores, len(all_scores) - k)[len(all_scores) - k]
+
+            if (reads >= limits).all():
+                break
+            depth *= DEPTH_GROWTH
+
+        documents = np.concatenate(documents) if documents else np.zeros(0, dtype=np.int64)
+        scores = np.concatenate(scores) if scores else np.zeros(0, dtype=self.corpus.dtype)
+        return self.select(documents, scores, k)
+
+    def full_scan(self, dense_query, k):
+        """Score every document, for queries the bound cannot prune"""
+        scores = self.corpus @ dense_query
+        return self.select(np.arange(self.n_documents), scores, k)
+
+    def select(self, documents, scores, k):
+        """
+        Best k of the scored documents, padded with unscored (zero-score) documents
+
+        Args:
+            documents: Indices of the scored documents
+            scores: Their scores
+            k: Number of results
+
+        Returns:
+            Tuple (indices, scores) of length k, sorted by descending score, then index
+        """
+        if len(documents) > k:
+            part = np.argpartition(-scores, k - 1)[:k]
+            cutoff = scores[part].min()
+            # Keep every document tied with the cutoff, the index tie-break decides below
+            keep = scores >= cutoff
+            documents, scores = documents[keep], scores[keep]
+
+        # Fewer than k documents share a term with the query: pad with zero scores
+        if len(documents) < k:
+            unmatched = np.ones(self.n_documents, dtype=bool)
+            unmatched[documents] = False
+            padding = np.flatnonzero(unmatched)[:k - len(documents)]
+            documents = np.concatenate([documents, padding])
+            scores = np.concatenate([scores, np.zeros(len(padding), dtype=scores.dtype)])
+
+        order = np.lexsort((documents, -scores))[:k]
+        return documents[order].astype(np.int64), scores[order]
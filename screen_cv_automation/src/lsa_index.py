@@ -0,0 +1,287 @@
+"""
+lsa_index.py
+Approximate top-k search in a reduced LSA space with a cluster-partitioned (IVF) index
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+from sklearn.utils.extmath import row_norms
+
+
+def reserve(array, n_rows):
+    """Array with room for at least n_rows along the first axis (doubling), keeping the content"""
+    if n_rows <= len(array):
+        return array
+    grown = np.empty((max(n_rows, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class LsaIndex:
+    """
+    Approximate nearest-neighbour index over TF-IDF vectors
+
+    Vectors are projected with a truncated SVD (LSA) to a few hundred dense
+    dimensions and partitioned with k-means. Each partition keeps its rows in
+    one contiguous float32 buffer, so a query scores the cluster centroids,
+    then only the rows of its n_probe nearest clusters. The best LSA
+    candidates are re-scored with the exact TF-IDF cosine against the indexed
+    matrix itself (referenced, not copied), so returned scores match the
+    exact path; which documents are found is approximate, see
+    benchmark_lsa_index.py for recall@k against exact search.
+
+    Documents added after the fit are projected with the fitted SVD and
+    appended to their nearest partition's buffer (capacity doubles when full),
+    so an append costs only the new rows. Refit once drift (the share of such
+    documents) makes the projection and partitions a poor fit. Searches running
+    during an append see the index as it was before it.
+    """
+
+    def __init__(self, n_components=128, n_clusters=None, n_probe=8, rerank=100, random_state=42, normalized=False):
+        """
+        Initialize an empty index
+
+        Args:
+            n_components: Number of LSA dimensions (capped by the corpus shape)
+            n_clusters: Number of k-means partitions (default: sqrt of the corpus size)
+            n_probe: Number of nearest partitions scored per query
+            rerank: Re-score the best k * rerank LSA candidates with the exact
+                    TF-IDF cosine (0 or 1 keeps LSA scores)
+            random_state: Seed for the SVD and k-means
+            normalized: Indexed rows are already L2-normalized (e.g. stored vectors),
+                        so exact re-scoring uses them as they are instead of dividing
+                        by each row's norm
+        """
+        self.n_components = n_components
+        self.n_clusters = n_clusters
+        self.n_probe = n_probe
+        self.rerank = rerank
+        self.random_state = random_state
+        self.normalized = normalized
+
+        self.corpus = None
+        self.norms = np.zeros(0, dtype=np.float32)
+        self.components = None
+        self.centroids = None
+        self.partition_documents = []
+        self.partition_vectors = []
+        self.partition_sizes = np.zeros(0, dtype=np.int64)
+        self.n_documents = 0
+        self.n_fitted = 0
+
+    def __len__(self):
+        return self.n_documents
+
+    def fit(self, corpus_vectors):
+        """
+        Fit the projection and the partitions, and index the corpus
+
+        Args:
+            corpus_vectors: Corpus vectors, e.g. CVs (sparse matrix, one row per document);
+                            kept by reference for exact re-scoring, so it must not change
+
+        Returns:
+            self
+        """
+        corpus = csr_matrix(corpus_vectors)
+        n_documents, n_features = corpus.shape
+        n_components = max(1, min(self.n_components, n_features - 1, n_documents - 1))
+
+        svd = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+        svd.fit(normalize(corpus))
+        self.components = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+        vectors = self.project(corpus)
+
+        n_clusters = self.n_clusters or int(np.sqrt(n_documents))
+        n_clusters = max(1, min(n_clusters, n_documents))
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=self.random_state, n_init=3)
+        labels = kmeans.fit_predict(vectors)
+        self.centroids = normalize(kmeans.cluster_centers_).astype(np.float32)
+        self.n_fitted = n_documents
+
+        self.clear_partitions()
+        self.append_rows(corpus, vectors, labels)
+        return self
+
+    def add(self, corpus_vectors):
+        """
+        Index the rows of corpus_vectors beyond the indexed ones, without refitting
+
+        Args:
+            corpus_vectors: The indexed corpus with new rows appended (sparse matrix);
+                            kept by reference like in fit()
+
+        Returns:
+            self
+        """
+        if self.components is None:
+            raise ValueError("Index is not fitted, call fit() first")
+        corpus = csr_matrix(corpus_vectors)
+        new = corpus[self.n_documents:]
+        if new.shape[0] == 0:
+            return self
+
+        vectors = self.project(new)
+        self.append_rows(corpus, vectors, np.argmax(vectors @ self.centroids.T, axis=1))
+        return self
+
+    def reweighted(self, corpus_vectors):
+        """
+        New index over re-weighted vectors (e.g. after an IDF refresh) with this index's fit
+        Every row is projected with the fitted SVD into its nearest partition
+
+        Args:
+            corpus_vectors: Vectors of all documents (sparse matrix, one row per document)
+
+        Returns:
+            LsaIndex
+        """
+        if self.components is None:
+            raise ValueError("Index is not fitted, call fit() first")
+        index = LsaIndex(self.n_components, self.n_clusters, self.n_probe, self.rerank,
+                         self.random_state, self.normalized)
+        index.components = self.components
+        index.centroids = self.centroids
+        index.n_fitted = self.n_fitted
+        index.clear_partitions()
+        index.add(corpus_vectors)
+        return index
+
+    @property
+    def drift(self):
+        """Documents added since the fit, as a fraction of the fitted ones"""
+        return (len(self) - self.n_fitted) / max(1, self.n_fitted)
+
+    def clear_partitions(self):
+        """Start every partition empty"""
+        n_clusters, n_components = len(self.centroids), self.components.shape[1]
+        self.corpus = None
+        self.norms = np.zeros(0, dtype=np.float32)
+        self.partition_documents = [np.zeros(0, dtype=np.int64) for _ in range(n_clusters)]
+        self.partition_vectors = [np.zeros((0, n_components), dtype=np.float32) for _ in range(n_clusters)]
+        self.partition_sizes = np.zeros(n_clusters, dtype=np.int64)
+        self.n_documents = 0
+
+    def append_rows(self, corpus, vectors, labels):
+        """
+        Append the rows after the indexed ones to their partitions
+
+        Args:
+            corpus: The whole corpus, new rows last (sparse matrix)
+            vectors: Projected vectors of the new rows
+            labels: Partition of each new row
+        """
+        first = self.n_documents
+        n_documents = first + len(vectors)
+
+        # Exact re-scoring data first, sizes last: a concurrent search only sees finished rows
+        if not self.normalized:
+            norms = reserve(self.norms, n_documents)
+            norms[first:n_documents] = row_norms(corpus[first:n_documents])
+            self.norms = norms
+        self.corpus = corpus
+
+        order = np.argsort(labels, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=len(self.centroids)))])
+        sizes = self.partition_sizes.copy()
+        for cluster in np.flatnonzero(np.diff(bounds)):
+            rows = order[bounds[cluster]:bounds[cluster + 1]]
+            size, end = sizes[cluster], sizes[cluster] + len(rows)
+            documents = reserve(self.partition_documents[cluster], end)
+            partition_vectors = reserve(self.partition_vectors[cluster], end)
+            documents[size:end] = first + rows
+            partition_vectors[size:end] = vectors[rows]
+            self.partition_documents[cluster] = documents
+            self.partition_vectors[cluster] = partition_vectors
+            sizes[cluster] = end
+        self.partition_sizes = sizes
+        self.n_documents = n_documents
+
+    def partition_rows(self, cluster, sizes=None):
+        """
+        Documents and projected vectors of one partition
+
+        Args:
+            cluster: Partition number
+            sizes: Partition sizes to read up to (default: the current ones)
+
+        Returns:
+            Tuple (documents, vectors) of views into the partition buffers
+        """
+        size = (self.partition_sizes if sizes is None else sizes)[cluster]
+        return self.partition_documents[cluster][:size], self.partition_vectors[cluster][:size]
+
+    def project(self, vectors):
+        """
+        Project TF-IDF vectors into the LSA space
+
+        Args:
+            vectors: Sparse matrix or array with the corpus' number of features
+
+        Returns:
+            l2-normalized float32 array of shape (n_rows, n_components)
+        """
+        # Row scaling does not change the normalized projection, so rows are not normalized first
+        reduced = (csr_matrix(vectors) if issparse(vectors) else np.asarray(vectors)) @ self.components
+        return normalize(np.asarray(reduced, dtype=np.float32))
+
+    def top_k(self, query_vectors, k, n_probe=None, rerank=None):
+        """
+        Find the (approximately) k most similar documents for every query row
+
+        Args:
+            query_vectors: Query vectors, e.g. jobs (sparse matrix or array)
+            k: Number of results per query
+            n_probe: Partitions scored per query (default: self.n_probe); more
+                     partitions are probed if these hold fewer than k documents
+            rerank: Exact re-scoring factor (default: self.rerank)
+
+        Returns:
+            Tuple (indices, scores), both arrays of shape (n_queries, min(k, n_documents)),
+            sorted by descending score, then ascending corpus index. Scores are
+            exact TF-IDF cosines when reranking, LSA-space cosines otherwise.
+        """
+        n_probe = n_probe or self.n_probe
+        rerank = self.rerank if rerank is None else rerank
+        exact_queries = normalize(csr_matrix(query_vectors) if issparse(query_vectors) else np.asarray(query_vectors))
+        queries = self.project(exact_queries)
+
+        # Snapshot, so rows appended during the search are left out
+        n_documents, sizes, corpus, norms = self.n_documents, self.partition_sizes, self.corpus, self.norms
+        k = max(0, min(k, n_documents))
+        n_candidates = min(n_documents, k * max(1, rerank))
+
+        top_indices = np.zeros((queries.shape[0], k), dtype=np.int64)
+        top_scores = np.zeros((queries.shape[0], k), dtype=np.result_type(corpus.dtype, np.float32))
+        if k == 0:
+            return top_indices, top_scores
+
+        centroid_scores = queries @ self.centroids.T
+
+        for row, query in enumerate(queries):
+            clusters = np.argsort(-centroid_scores[row], kind='stable')
+            needed = np.searchsorted(np.cumsum(sizes[clusters]), n_candidates) + 1
+            clusters = clusters[:max(n_probe, needed)]
+
+            partitions = [self.partition_rows(c, sizes) for c in clusters]
+            documents = np.concatenate([documents for documents, _ in partitions])
+            scores = np.concatenate([vectors @ query for _, vectors in partitions])
+
+            if rerank > 1:
+                best = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+                documents = documents[best]
+                exact_query = exact_queries[row]
+                exact_query = exact_query.toarray().ravel() if issparse(exact_query) else exact_query
+                scores = corpus[documents] @ exact_query
+                if not self.normalized:
+                    document_norms = norms[documents]
+                    scores = scores / np.where(document_norms > 0, document_norms, 1)
+
+            order = np.lexsort((documents, -scores))[:k]
+            top_indices[row] = documents[order]
+            top_scores[row] = scores[order]
+
+        return top_indices, top_scores
@@ -0,0 +1,167 @@
+"""
+minhash_index.py
+MinHash signatures with an LSH banding index for near-duplicate detection
+"""
+
+import zlib
+
+import numpy as np
+
+# Mersenne prime for the universal hash family (a * x + b) mod p
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHashIndex:
+    """
+    Near-duplicate lookup over cleaned texts
+
+    Each text becomes a set of word shingles, summarized by num_perm MinHash
+    values; the fraction of equal values estimates the Jaccard similarity of
+    two sets. Signatures are split into bands, and each band is hashed into a
+    bucket, so a query only compares against documents sharing a bucket
+    instead of the whole corpus. With 16 bands of 8 rows, pairs at Jaccard 0.8
+    collide with probability ~0.9 and pairs at 0.5 with ~0.06; candidates are
+    then checked against the threshold on the full signature.
+    """
+
+    def __init__(self, num_perm=128, bands=16, threshold=0.8, shingle_size=3, seed=42):
+        """
+        Initialize an empty index
+
+        Args:
+            num_perm: Number of hash functions (signature length)
+            bands: Number of LSH bands (must divide num_perm)
+            threshold: Minimum estimated Jaccard similarity of a near-duplicate
+            shingle_size: Number of consecutive words per shingle
+            seed: Seed of the hash functions (signatures are only comparable
+                  between indexes with the same seed and num_perm)
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, int(MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self.clear()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def clear(self):
+        """Remove all documents"""
+        self.ids = []
+        self.positions = {}
+        self.signatures = {}
+        self.buckets = [{} for _ in range(self.bands)]
+
+    def shingles(self, text):
+        """
+        Hashed word shingles of a text
+
+        Args:
+            text (str): Cleaned text
+
+        Returns:
+            1D uint64 array of distinct 32-bit shingle hashes (empty for empty text)
+        """
+        tokens = str(text).split() if isinstance(text, str) else []
+        if not tokens:
+            return np.zeros(0, dtype=np.uint64)
+
+        size = min(self.shingle_size, len(tokens))
+        shingles = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+        return np.array([zlib.crc32(shingle.encode('utf-8')) for shingle in shingles], dtype=np.uint64)
+
+    def signature(self, text):
+        """
+        MinHash signature of a text
+
+        Args:
+            text (str): Cleaned text
+
+        Returns:
+            1D uint64 array of num_perm values, or None for an empty text
+        """
+        hashes = self.shingles(text)
+        if len(hashes) == 0:
+            return None
+
+        # uint64 products wrap around; the result is still a usable hash family
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(hashes, self.a) + self.b) % MERSENNE_PRIME
+        return (permuted & MAX_HASH).min(axis=0)
+
+    def band_keys(self, signature):
+        """Bucket key of each band of a signature"""
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, doc_id, signature):
+        """
+        Index a document
+
+        Args:
+            doc_id: Document ID
+            signature: Signature from signature() (None is ignored)
+        """
+        if signature is None:
+            return
+        self.positions[doc_id] = len(self.ids)
+        self.ids.append(doc_id)
+        self.signatures[doc_id] = signature
+        for band, key in enumerate(self.band_keys(signature)):
+            self.buckets[band].setdefault(key, []).append(doc_id)
+
+    def query(self, signature):
+        """
+        Near-duplicates of a signature among the indexed documents
+
+        Args:
+            signature: Signature from signature()
+
+        Returns:
+            List of (doc_id, estimated Jaccard similarity), most similar first,
+            ties in indexing order
+        """
+        if signature is None:
+            return []
+
+        candidates = set()
+        for band, key in enumerate(self.band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+
+        matches = []
+        for doc_id in candidates:
+            similarity = float(np.mean(self.signatures[doc_id] == signature))
+            if similarity >= self.threshold:
+                matches.append((doc_id, similarity))
+        return sorted(matches, key=lambda match: (-match[1], self.positions[match[0]]))
+
+    def find_duplicates(self, ids, texts):
+        """
+        Batch mode: match every document against the ones before it, then index it
+
+        Args:
+            ids: List of document IDs
+            texts: Cleaned text of each document
+
+        Returns:
+            Dict duplicate ID -> (ID of the most similar kept document, similarity);
+            documents without a near-duplicate are not in the dict
+        """
+        duplicates = {}
+        for doc_id, text in zip(ids, texts):
+            signature = self.signature(text)
+            matches = self.query(signature)
+            if matches:
+                # Only kept documents are indexed, so duplicates never chain
+                duplicates[doc_id] = matches[0]
+            else:
+                self.add(doc_id, signature)
+        return duplicates
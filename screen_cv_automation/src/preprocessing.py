@@ -1,38 +1,7 @@
 # preprocessing.py
 
 import pandas as pd
-import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-
-# Download NLTK data
-nltk.download('stopwords')
-nltk.download('punkt')
-nltk.download('wordnet')
-
-# Initialize lemmatizer and stopwords
-lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words('english'))
-
-# ----------------------------
-# Function to clean text
-# ----------------------------
-def clean_text(text):
-    if pd.isna(text):
-        return ""
-    # Lowercase
-    text = text.lower()
-    # Remove punctuation and numbers
-    text = re.sub(r'[^a-z\s]', '', text)
-    # Tokenize
-    words = nltk.word_tokenize(text)
-    # Remove stopwords
-    words = [w for w in words if w not in stop_words]
-    # Lemmatize
-    words = [lemmatizer.lemmatize(w) for w in words]
-    # Join back into string
-    return ' '.join(words)
+from text_cleaning import clean_text
 
 # ----------------------------
 # Load datasets
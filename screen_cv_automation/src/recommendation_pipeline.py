@@ -5,25 +5,72 @@ Complete pipeline for candidate recommendation using trained models
 
 import pandas as pd
 import numpy as np
+import os
 import pickle
-import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from src import text_cleaning
+from src.hashing_vectorizer import HashingTfidfVectorizer, IdfTable
+from src.inverted_index import InvertedIndex
+from src.scoring import sharded_top_k_similarities, top_shared_terms
 
-# Download required NLTK data (silent mode)
-try:
-    stopwords.words('english')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
-    nltk.download('punkt', quiet=True)
-    nltk.download('punkt_tab', quiet=True)
-    nltk.download('wordnet', quiet=True)
+# Below this much text per worker, cleaning inline beats sending the batch to the pool.
+# Inline cleaning runs at roughly 0.06 us per character and a call on the warm pool
+# costs a few ms of dispatch and pickling, so 250k characters (about 70 typical CVs,
+# ~15 ms of work) per worker is where the pool starts to pay off; see
+# benchmark_text_cleaning.py. Pool startup (~25 ms) is paid once, the pool is reused.
+MIN_CHARS_PER_WORKER = 250000
 
-# Initialize lemmatizer and stopwords
-lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words('english'))
+# Long-lived cleaning pool shared by all pipelines of the process (created on first use)
+_cleaning_pool = None
+_cleaning_pool_workers = 0
+
+
+def get_cleaning_pool(workers):
+    """
+    Get the shared cleaning pool, (re)creating it when the worker count changes
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor whose workers have loaded the cleaning resources
+    """
+    global _cleaning_pool, _cleaning_pool_workers
+    if _cleaning_pool is None or _cleaning_pool_workers != workers:
+        shutdown_cleaning_pool()
+        # Each worker loads the lemma table once in its initializer
+        _cleaning_pool = ProcessPoolExecutor(max_workers=workers, initializer=text_cleaning.init_worker)
+        _cleaning_pool_workers = workers
+    return _cleaning_pool
+
+
+def shutdown_cleaning_pool():
+    """Stop the shared cleaning pool, if it was started"""
+    global _cleaning_pool, _cleaning_pool_workers
+    if _cleaning_pool is not None:
+        _cleaning_pool.shutdown()
+        _cleaning_pool = None
+        _cleaning_pool_workers = 0
+
+# Largest top_n answered from an InvertedIndex; early termination gains little for longer lists
+INDEX_MAX_TOP_N = 100
+
+# Sections from DocumentParser.extract_sections and the CV / job fields that hold them
+CV_SECTION_FIELDS = {
+    'skills': 'skills',
+    'experience': 'experience',
+    'education': 'education',
+    'full_text': 'cv_text'
+}
+JOB_SECTION_FIELDS = {
+    'skills': 'required_skills',
+    'experience': 'experience_required',
+    'education': 'education_required',
+    'full_text': 'job_description'
+}
 
 
 class CandidateRecommendationPipeline:
@@ -32,14 +79,63 @@ class CandidateRecommendationPipeline:
     Loads trained models and provides real-time recommendations
     """
     
-    def __init__(self, vectorizer_path='models/vectorizer.pkl'):
-        """Initialize the pipeline by loading the trained vectorizer"""
+    def __init__(self, vectorizer_path='models/vectorizer.pkl', dtype=np.float32,
+                 mode='tfidf', idf_path='models/hashing_idf.npz', live_idf=False,
+                 idf_refresh_fraction=0.0, scoring_workers=None, result_cache=None):
+        """
+        Initialize the pipeline by loading the trained vectorizer
+        
+        Args:
+            vectorizer_path: Path to the pickled TF-IDF vectorizer
+            dtype: Float type of the produced vectors (float32 halves memory
+                   and matmul bandwidth; scores are rounded to 4 decimals anyway)
+            mode: 'tfidf' for the fitted vocabulary in vectorizer_path,
+                  'hashing' for the fit-free HashingTfidfVectorizer
+            idf_path: Document-frequency table used in 'hashing' mode
+            live_idf: Weight terms by the IDF of the documents added with
+                      add_to_corpus() instead of the frozen training IDF
+            idf_refresh_fraction: With live_idf, only move to a new IDF once the corpus
+                                  has grown by this fraction since the last refresh
+                                  (0: on every add_to_corpus call); in between, new
+                                  documents are weighted with the IDF of the last refresh
+            scoring_workers: Processes for exact scoring of large CV sets
+                             (default: number of CPUs; small sets are scored in-process)
+            result_cache: Optional ResultCache for per-job results, used by
+                          recommend_candidates/batch_recommend when the caller
+                          passes a corpus_version
+        """
+        if mode not in ('tfidf', 'hashing'):
+            raise ValueError(f"Unknown vectorizer mode: {mode}")
+        
         self.vectorizer = None
         self.vectorizer_path = vectorizer_path
+        self.dtype = dtype
+        self.mode = mode
+        self.idf_path = idf_path
+        self.scoring_workers = scoring_workers
+        self.result_cache = result_cache
         self.load_vectorizer()
+        
+        self.idf_table = None
+        if live_idf:
+            if mode == 'hashing':
+                n_features = self.vectorizer.n_features
+            else:
+                n_features = len(self.vectorizer.vocabulary_)
+            self.idf_table = IdfTable(n_features)
+        self.idf_refresh_fraction = idf_refresh_fraction
+        self.reset_corpus()
     
     def load_vectorizer(self):
-        """Load the trained TF-IDF vectorizer from pickle file"""
+        """Load the trained TF-IDF vectorizer (or the hashing IDF table in 'hashing' mode)"""
+        if self.mode == 'hashing':
+            try:
+                self.vectorizer = HashingTfidfVectorizer.load(self.idf_path, dtype=self.dtype)
+                print(f"✓ Hashing IDF table loaded successfully from {self.idf_path}")
+            except FileNotFoundError:
+                raise Exception(f"IDF table not found at {self.idf_path}. Please train the model first.")
+            return
+        
         try:
             with open(self.vectorizer_path, 'rb') as f:
                 self.vectorizer = pickle.load(f)
@@ -60,26 +156,42 @@ class CandidateRecommendationPipeline:
         4. Remove stopwords
         5. Lemmatize
         """
-        if pd.isna(text) or text == "":
-            return ""
+        return text_cleaning.clean_text(text)
+    
+    def clean_texts(self, texts, workers=None, chunksize=None):
+        """
+        Clean a batch of texts, spread across the shared process pool for large batches
         
-        # Lowercase
-        text = str(text).lower()
+        Args:
+            texts: Iterable of raw text strings
+            workers: Number of worker processes (default: number of CPUs; capped so
+                     every worker gets at least MIN_CHARS_PER_WORKER characters)
+            chunksize: Number of texts sent to a worker at a time
+                       (default: about 4 chunks per worker)
         
-        # Remove punctuation and numbers
-        text = re.sub(r'[^a-z\s]', '', text)
+        Returns:
+            List of cleaned texts, in input order
+        """
+        texts = list(texts)
         
-        # Tokenize
-        words = nltk.word_tokenize(text)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        total_chars = sum(len(text) for text in texts if isinstance(text, str))
+        workers = min(workers, len(texts), total_chars // MIN_CHARS_PER_WORKER)
         
-        # Remove stopwords
-        words = [w for w in words if w not in stop_words]
+        # Small batches: clean inline
+        if workers <= 1:
+            return [self.clean_text(text) for text in texts]
         
-        # Lemmatize
-        words = [lemmatizer.lemmatize(w) for w in words]
+        if chunksize is None:
+            chunksize = max(1, len(texts) // (workers * 4))
         
-        # Join back into string
-        return ' '.join(words)
+        try:
+            return list(get_cleaning_pool(workers).map(text_cleaning.clean_text, texts, chunksize=chunksize))
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OS); start a fresh pool next time
+            shutdown_cleaning_pool()
+            return [self.clean_text(text) for text in texts]
     
     def process_cv(self, skills='', experience='', education='', cv_text=''):
         """
@@ -137,7 +249,241 @@ class CandidateRecommendationPipeline:
         if self.vectorizer is None:
             raise Exception("Vectorizer not loaded. Call load_vectorizer() first.")
         
-        return self.vectorizer.transform([text])
+        return self.vectorize_texts([text])
+    
+    def count_texts(self, texts):
+        """
+        Raw term counts over the vectorizer's columns, before IDF weighting
+        
+        Args:
+            texts: List of cleaned text strings
+        
+        Returns:
+            Sparse matrix of term counts (one row per text)
+        """
+        if self.vectorizer is None:
+            raise Exception("Vectorizer not loaded. Call load_vectorizer() first.")
+        
+        if self.mode == 'hashing':
+            return self.vectorizer.count(list(texts))
+        # The fitted vocabulary's counts, without the trained IDF step
+        return CountVectorizer.transform(self.vectorizer, list(texts))
+    
+    def add_to_corpus(self, texts):
+        """
+        Add documents to the live IDF table and vectorize them with the IDF in use
+        
+        The IDF in use is refreshed from the table once the corpus has grown by
+        idf_refresh_fraction since the last refresh. Vectors stored earlier are then
+        weighted by the old IDF; multiplying their columns by the returned factors
+        and re-normalizing the rows (see VectorStore.rescale_columns) brings them
+        up to date.
+        
+        Args:
+            texts: List of cleaned text strings
+        
+        Returns:
+            Tuple (vectors, factors): TF-IDF vectors of the texts, and the per-column
+            ratio new_idf / old_idf (None when live IDF is off or was not refreshed)
+        """
+        if self.idf_table is None:
+            return self.vectorize_texts(texts), None
+        
+        counts = self.count_texts(texts)
+        self.idf_table.add(counts)
+        
+        factors = None
+        if self.idf_table.n_documents > self.idf_documents * (1 + self.idf_refresh_fraction):
+            new_idf = self.idf_table.idf()
+            factors = new_idf / self.idf_weights
+            self.idf_weights = new_idf
+            self.idf_documents = self.idf_table.n_documents
+        return self.idf_table.weight(counts, self.dtype, idf=self.idf_weights), factors
+    
+    def reset_corpus(self):
+        """Forget all documents added with add_to_corpus()"""
+        if self.idf_table is not None:
+            self.idf_table.reset()
+            # IDF in use and the corpus size it was computed from
+            self.idf_weights = self.idf_table.idf()
+            self.idf_documents = 0
+    
+    def save_corpus(self, path):
+        """
+        Write the live IDF state (document frequencies and the IDF in use) to an .npz file
+        
+        Args:
+            path: Destination file (replaced atomically)
+        """
+        if self.idf_table is None:
+            return
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f,
+                     document_frequency=self.idf_table.document_frequency,
+                     n_documents=self.idf_table.n_documents,
+                     idf_weights=self.idf_weights,
+                     idf_documents=self.idf_documents)
+        os.replace(tmp_path, path)
+    
+    def load_corpus(self, path):
+        """
+        Restore the live IDF state written by save_corpus()
+        
+        Args:
+            path: File written by save_corpus()
+        
+        Returns:
+            bool: True if the state was restored (always True when live IDF is off)
+        """
+        if self.idf_table is None:
+            return True
+        if not os.path.exists(path):
+            return False
+        
+        with np.load(path) as state:
+            if state['document_frequency'].shape != self.idf_table.document_frequency.shape:
+                return False
+            self.idf_table.document_frequency[:] = state['document_frequency']
+            self.idf_table.n_documents = int(state['n_documents'])
+            self.idf_weights = state['idf_weights']
+            self.idf_documents = int(state['idf_documents'])
+        return True
+    
+    def vectorize_texts(self, texts):
+        """
+        Convert a batch of cleaned texts to TF-IDF vectors in one call
+        
+        Args:
+            texts: List of cleaned text strings
+        
+        Returns:
+            TF-IDF vectors (sparse matrix, one row per text)
+        """
+        if self.vectorizer is None:
+            raise Exception("Vectorizer not loaded. Call load_vectorizer() first.")
+        
+        if self.idf_table is not None:
+            return self.idf_table.weight(self.count_texts(texts), self.dtype, idf=self.idf_weights)
+        return self.vectorizer.transform(list(texts)).astype(self.dtype, copy=False)
+    
+    def clean_sections(self, records, fields, workers=None):
+        """
+        Clean every section of a batch of CVs or jobs in one cleaning pass
+        Cleaning works word by word, so join_sections() of the result equals
+        the cleaned whole document (process_cv / process_job) without cleaning it again
+        
+        Args:
+            records: List of CV or job dictionaries
+            fields: Mapping section -> record field (CV_SECTION_FIELDS or JOB_SECTION_FIELDS)
+            workers: Number of cleaning processes (default: number of CPUs)
+        
+        Returns:
+            List with one dict section -> cleaned text per record
+        """
+        texts = [record.get(field) or '' for record in records for field in fields.values()]
+        cleaned = iter(self.clean_texts(texts, workers=workers))
+        return [{section: next(cleaned) for section in fields} for _ in records]
+    
+    @staticmethod
+    def join_sections(cleaned_sections):
+        """
+        Cleaned text of a whole document from its cleaned sections
+        
+        Args:
+            cleaned_sections: Dict section -> cleaned text, in field order (from clean_sections)
+        
+        Returns:
+            Cleaned text string
+        """
+        return ' '.join(text for text in cleaned_sections.values() if text)
+    
+    def vectorize_sections(self, records, fields, workers=None):
+        """
+        Vectorize every section of a batch of CVs or jobs separately
+        Reuses each record's 'cleaned_sections' when present instead of re-cleaning;
+        the other records share one cleaning pass, and all sections one vectorizer call
+        
+        Args:
+            records: List of CV or job dictionaries
+            fields: Mapping section -> record field (CV_SECTION_FIELDS or JOB_SECTION_FIELDS)
+            workers: Number of cleaning processes (default: number of CPUs)
+        
+        Returns:
+            Dict section -> TF-IDF vectors (sparse matrix, one row per record)
+        """
+        uncleaned = [record for record in records if record.get('cleaned_sections') is None]
+        cleaned = iter(self.clean_sections(uncleaned, fields, workers=workers))
+        sections = [record.get('cleaned_sections') or next(cleaned) for record in records]
+        
+        texts = [record_sections[section] for section in fields for record_sections in sections]
+        vectors = self.vectorize_texts(texts)
+        
+        n = len(records)
+        return {section: vectors[i * n:(i + 1) * n] for i, section in enumerate(fields)}
+    
+    def vectorize_cvs(self, cvs_df):
+        """
+        Vectorize all CVs in a DataFrame
+        Reuses the 'cleaned_text' column when present instead of re-cleaning
+        
+        Args:
+            cvs_df: DataFrame with candidate CVs
+        
+        Returns:
+            TF-IDF vectors (sparse matrix, one row per CV)
+        """
+        cleaned_texts = []
+        for _, cv in cvs_df.iterrows():
+            cv_cleaned = cv.get('cleaned_text', None)
+            if not isinstance(cv_cleaned, str):
+                cv_cleaned = self.process_cv(
+                    skills=cv.get('skills', ''),
+                    experience=cv.get('experience', ''),
+                    education=cv.get('education', ''),
+                    cv_text=cv.get('cv_text', '')
+                )
+            cleaned_texts.append(cv_cleaned)
+        
+        return self.vectorize_texts(cleaned_texts)
+    
+    def vectorize_jobs(self, jobs_df):
+        """
+        Vectorize all jobs in a DataFrame
+        Reuses the 'cleaned_text' column when present instead of re-cleaning
+        
+        Args:
+            jobs_df: DataFrame with job descriptions
+        
+        Returns:
+            TF-IDF vectors (sparse matrix, one row per job)
+        """
+        return self.vectorize_texts(self.cleaned_job_texts(jobs_df))
+    
+    def cleaned_job_texts(self, jobs_df):
+        """
+        Cleaned text of every job in a DataFrame
+        Reuses the 'cleaned_text' column when present instead of re-cleaning
+        
+        Args:
+            jobs_df: DataFrame with job descriptions
+        
+        Returns:
+            List of cleaned texts (one per job)
+        """
+        cleaned_texts = []
+        for _, job in jobs_df.iterrows():
+            job_cleaned = job.get('cleaned_text', None)
+            if not isinstance(job_cleaned, str):
+                job_cleaned = self.process_job(
+                    required_skills=job.get('required_skills', ''),
+                    experience_required=job.get('experience_required', ''),
+                    education_required=job.get('education_required', ''),
+                    job_description=job.get('job_description', '')
+                )
+            cleaned_texts.append(job_cleaned)
+        
+        return cleaned_texts
     
     def compute_similarity(self, cv_vectors, job_vectors):
         """
@@ -152,7 +498,121 @@ class CandidateRecommendationPipeline:
         """
         return cosine_similarity(job_vectors, cv_vectors)
     
-    def recommend_candidates(self, job_data, cv_data_list, top_n=5):
+    def top_candidates(self, job_vectors, cv_vectors, top_n, cv_index=None):
+        """
+        Top N CVs per job, from the inverted index when top_n is small enough
+        
+        Args:
+            job_vectors: Job vectors (sparse matrix, one row per job)
+            cv_vectors: CV vectors, L2-normalized as the vectorizer and VectorStore
+                        keep them (unused when the index answers)
+            top_n: Number of top candidates per job
+            cv_index: Optional InvertedIndex (exact) or LsaIndex (approximate)
+                      over the same CVs
+        
+        Returns:
+            Tuple (indices, scores) as returned by scoring.top_k_similarities
+        """
+        if cv_index is not None and top_n <= INDEX_MAX_TOP_N:
+            return cv_index.top_k(job_vectors, top_n)
+        return sharded_top_k_similarities(job_vectors, cv_vectors, top_n, workers=self.scoring_workers,
+                                          normalized=True)
+    
+    def exact_candidates(self, cv_index, top_n):
+        """
+        Whether top_candidates returns exact results for this index and top_n
+        (an InvertedIndex is exact, an LsaIndex approximate)
+        """
+        return cv_index is None or top_n > INDEX_MAX_TOP_N or isinstance(cv_index, InvertedIndex)
+    
+    def term_names(self, cleaned_text):
+        """
+        Map the columns of a text's terms back to the terms
+        Works for the fitted vocabulary and for hashed columns alike
+        
+        Args:
+            cleaned_text: Cleaned text string
+        
+        Returns:
+            Dict column -> term
+        """
+        terms = sorted(set(str(cleaned_text).split()))
+        counts = self.count_texts(terms).tocsr()
+        
+        names = {}
+        for row, term in enumerate(terms):
+            for column in counts.indices[counts.indptr[row]:counts.indptr[row + 1]]:
+                names.setdefault(int(column), term)
+        return names
+    
+    def explain_matches(self, job_cleaned, job_vector, cv_vectors, n_terms=5):
+        """
+        Top shared weighted terms between a job and each of several CVs
+        All CVs are explained in one sparse pass over the job's terms
+        
+        Args:
+            job_cleaned: Cleaned job text (names the terms)
+            job_vector: Job vector (sparse matrix with one row)
+            cv_vectors: Vectors of the CVs to explain (sparse matrix)
+            n_terms: Number of terms per CV
+        
+        Returns:
+            List (one per CV) of [{term, contribution}, ...], largest first;
+            contributions add up to at most the similarity score
+        """
+        columns, contributions = top_shared_terms(job_vector, cv_vectors, n_terms)
+        names = self.term_names(job_cleaned)
+        
+        explanations = []
+        for row_columns, row_contributions in zip(columns, contributions):
+            explanations.append([
+                {'term': names.get(int(column), f"#{column}"), 'contribution': round(float(contribution), 4)}
+                for column, contribution in zip(row_columns, row_contributions)
+                if column >= 0
+            ])
+        return explanations
+    
+    def cached_results(self, job_texts, top_n, corpus_version):
+        """
+        Look up per-job results in the result cache
+        
+        Args:
+            job_texts: Cleaned job texts
+            top_n: Number of top candidates per job
+            corpus_version: Version of the CV corpus (None disables the cache)
+        
+        Returns:
+            Tuple (results, missing): one (indices, scores) pair or None per job,
+            and the positions of the jobs that still need scoring
+        """
+        if self.result_cache is None or corpus_version is None:
+            return [None] * len(job_texts), list(range(len(job_texts)))
+        
+        results = [self.result_cache.get(self.result_cache.key_for(text, corpus_version, top_n))
+                   for text in job_texts]
+        return results, [i for i, result in enumerate(results) if result is None]
+    
+    def store_results(self, results, missing, job_texts, top_n, corpus_version, top_indices, top_scores):
+        """
+        Fill in freshly scored jobs and add them to the result cache
+        
+        Args:
+            results: List from cached_results(), updated in place
+            missing: Positions of the scored jobs (one per row of top_indices)
+            job_texts: Cleaned job texts
+            top_n: Number of top candidates per job
+            corpus_version: Version of the CV corpus (None keeps the results out of the
+                            cache, e.g. approximate ones)
+            top_indices: CV indices of the scored jobs
+            top_scores: Matching similarity scores
+        """
+        for row, position in enumerate(missing):
+            results[position] = (top_indices[row], top_scores[row])
+            if self.result_cache is not None and corpus_version is not None:
+                key = self.result_cache.key_for(job_texts[position], corpus_version, top_n)
+                self.result_cache.put(key, top_indices[row], top_scores[row])
+    
+    def recommend_candidates(self, job_data, cv_data_list, top_n=5, cv_index=None, corpus_version=None):
         """
         Recommend top N candidates for a given job
         
@@ -162,6 +622,10 @@ class CandidateRecommendationPipeline:
             cv_data_list: List of dictionaries with CV fields
                          [{candidate_id, skills, experience, education, cv_text}, ...]
             top_n: Number of top candidates to recommend
+            cv_index: Optional InvertedIndex or LsaIndex built from the vectors of cv_data_list
+                      (same order); CVs are then not re-vectorized for small top_n
+            corpus_version: Version of cv_data_list, bumped by the caller whenever
+                            the CVs change; enables the result cache
         
         Returns:
             List of dictionaries with recommendations
@@ -175,49 +639,83 @@ class CandidateRecommendationPipeline:
             job_description=job_data.get('job_description', '')
         )
         
-        # Vectorize job
-        job_vector = self.vectorize_text(job_cleaned)
+        candidate_ids = [cv_data.get('candidate_id', f"CV_{i+1}") for i, cv_data in enumerate(cv_data_list)]
         
-        # Process and vectorize all CVs
-        cv_vectors_list = []
-        candidate_ids = []
+        if cv_index is not None and len(cv_index) != len(cv_data_list):
+            raise ValueError(f"Index has {len(cv_index)} CVs, got {len(cv_data_list)}")
         
-        for cv_data in cv_data_list:
-            cv_cleaned = self.process_cv(
-                skills=cv_data.get('skills', ''),
-                experience=cv_data.get('experience', ''),
-                education=cv_data.get('education', ''),
-                cv_text=cv_data.get('cv_text', '')
-            )
+        results, missing = self.cached_results([job_cleaned], top_n, corpus_version)
+        if missing:
+            # Vectorize job
+            job_vector = self.vectorize_text(job_cleaned)
             
-            cv_vector = self.vectorize_text(cv_cleaned)
-            cv_vectors_list.append(cv_vector)
-            candidate_ids.append(cv_data.get('candidate_id', f"CV_{len(candidate_ids)+1}"))
-        
-        # Stack CV vectors
-        from scipy.sparse import vstack
-        cv_vectors = vstack(cv_vectors_list)
-        
-        # Compute similarity
-        similarity_scores = self.compute_similarity(cv_vectors, job_vector)
-        scores = similarity_scores[0]  # Get scores for the single job
+            # Process and vectorize all CVs in one call, unless the index answers alone
+            cv_vectors = None
+            if cv_index is None or top_n > INDEX_MAX_TOP_N:
+                cv_cleaned_list = []
+                for cv_data in cv_data_list:
+                    cv_cleaned = self.process_cv(
+                        skills=cv_data.get('skills', ''),
+                        experience=cv_data.get('experience', ''),
+                        education=cv_data.get('education', ''),
+                        cv_text=cv_data.get('cv_text', '')
+                    )
+                    cv_cleaned_list.append(cv_cleaned)
+                
+                cv_vectors = self.vectorize_texts(cv_cleaned_list)
+            
+            # Compute similarity and get top N candidates
+            top_indices, top_scores = self.top_candidates(job_vector, cv_vectors, top_n, cv_index)
+            # Only exact results are cached, so a hit is right whichever index answers later
+            cache_version = corpus_version if self.exact_candidates(cv_index, top_n) else None
+            self.store_results(results, missing, [job_cleaned], top_n, cache_version, top_indices, top_scores)
         
-        # Get top N candidates
-        top_indices = np.argsort(scores)[::-1][:top_n]
+        top_indices, top_scores = results[0]
         
         # Build recommendations
         recommendations = []
-        for rank, idx in enumerate(top_indices, start=1):
+        for rank, (idx, score) in enumerate(zip(top_indices, top_scores), start=1):
             recommendations.append({
                 'candidate_id': candidate_ids[idx],
-                'similarity_score': float(round(scores[idx], 4)),
+                'similarity_score': round(float(score), 4),
                 'rank': rank,
-                'match_percentage': float(round(scores[idx] * 100, 2))
+                'match_percentage': round(float(score) * 100, 2)
             })
         
         return recommendations
     
-    def batch_recommend(self, jobs_df, cvs_df, top_n=5):
+    def recommend_jobs(self, candidate_id, top_n, cv_store, job_store):
+        """
+        Get top N job recommendations for a stored candidate (reverse matching)
+        Scores the candidate's stored vector against all stored job vectors at once
+        
+        Args:
+            candidate_id: ID of a candidate in cv_store
+            top_n: Number of top jobs to recommend
+            cv_store: VectorStore with the CV vectors
+            job_store: VectorStore with the job vectors (same vectorizer and IDF)
+        
+        Returns:
+            List of dictionaries with recommendations
+            [{job_id, similarity_score, rank}, ...]
+        """
+        cv_vector = cv_store.rows([candidate_id])
+        top_indices, top_scores = sharded_top_k_similarities(cv_vector, job_store.matrix, top_n,
+                                                             workers=self.scoring_workers, normalized=True)
+        
+        recommendations = []
+        for rank, (idx, score) in enumerate(zip(top_indices[0], top_scores[0]), start=1):
+            recommendations.append({
+                'job_id': job_store.ids[idx],
+                'similarity_score': round(float(score), 4),
+                'rank': rank,
+                'match_percentage': round(float(score) * 100, 2)
+            })
+        
+        return recommendations
+    
+    def batch_recommend(self, jobs_df, cvs_df, top_n=5, cv_vectors=None, cv_index=None,
+                        corpus_version=None):
         """
         Process batch recommendations from DataFrames
         
@@ -225,57 +723,68 @@ class CandidateRecommendationPipeline:
             jobs_df: DataFrame with job descriptions
             cvs_df: DataFrame with candidate CVs
             top_n: Number of top candidates per job
+            cv_vectors: Optional precomputed CV vectors (one row per row of cvs_df),
+                        e.g. from a VectorStore filled at upload time
+            cv_index: Optional InvertedIndex or LsaIndex over the same CVs, used when top_n
+                      is at most INDEX_MAX_TOP_N
+            corpus_version: Version of cvs_df, bumped by the caller whenever the
+                            CVs change; enables the result cache
         
         Returns:
             DataFrame with all recommendations
         """
-        all_recommendations = []
+        if cv_index is not None and len(cv_index) != len(cvs_df):
+            raise ValueError(f"Index has {len(cv_index)} CVs, got {len(cvs_df)}")
         
-        # Process all CVs
-        cv_vectors_list = []
-        for _, cv in cvs_df.iterrows():
-            cv_cleaned = self.process_cv(
-                skills=cv.get('skills', ''),
-                experience=cv.get('experience', ''),
-                education=cv.get('education', ''),
-                cv_text=cv.get('cv_text', '')
-            )
-            cv_vector = self.vectorize_text(cv_cleaned)
-            cv_vectors_list.append(cv_vector)
-        
-        # Stack CV vectors
-        from scipy.sparse import vstack
-        cv_vectors = vstack(cv_vectors_list)
-        
-        # Process each job
-        for _, job in jobs_df.iterrows():
-            job_cleaned = self.process_job(
-                required_skills=job.get('required_skills', ''),
-                experience_required=job.get('experience_required', ''),
-                education_required=job.get('education_required', ''),
-                job_description=job.get('job_description', '')
-            )
-            
-            job_vector = self.vectorize_text(job_cleaned)
-            
-            # Compute similarity
-            similarity_scores = self.compute_similarity(cv_vectors, job_vector)
-            scores = similarity_scores[0]
-            
-            # Get top N candidates
-            top_indices = np.argsort(scores)[::-1][:top_n]
+        if cv_vectors is not None and cv_vectors.shape[0] != len(cvs_df):
+            raise ValueError(f"Got {cv_vectors.shape[0]} CV vectors for {len(cvs_df)} CVs")
+        
+        job_texts = self.cleaned_job_texts(jobs_df)
+        results, missing = self.cached_results(job_texts, top_n, corpus_version)
+        
+        if missing:
+            # Reuse stored CV vectors, vectorize only if none were given
+            if cv_vectors is None and (cv_index is None or top_n > INDEX_MAX_TOP_N):
+                cv_vectors = self.vectorize_cvs(cvs_df)
             
-            # Build recommendations for this job
-            for rank, idx in enumerate(top_indices, start=1):
+            # Score all uncached jobs against all CVs at once (blocked or indexed, top N per job)
+            job_vectors = self.vectorize_texts([job_texts[i] for i in missing])
+            top_indices, top_scores = self.top_candidates(job_vectors, cv_vectors, top_n, cv_index)
+            # Only exact results are cached, so a hit is right whichever index answers later
+            cache_version = corpus_version if self.exact_candidates(cv_index, top_n) else None
+            self.store_results(results, missing, job_texts, top_n, cache_version, top_indices, top_scores)
+        
+        return self.recommendations_frame(jobs_df['job_id'].tolist(), cvs_df['candidate_id'].to_numpy(),
+                                          [result[0] for result in results], [result[1] for result in results])
+    
+    def recommendations_frame(self, job_ids, candidate_ids, top_indices, top_scores):
+        """
+        Turn top-k results into the batch_recommend DataFrame
+        
+        Args:
+            job_ids: Job IDs (one per row of top_indices)
+            candidate_ids: Array of candidate IDs, indexed by top_indices
+            top_indices: CV indices per job (array or list of rows), best first
+            top_scores: Matching similarity scores
+        
+        Returns:
+            DataFrame with all recommendations
+        """
+        all_recommendations = []
+        
+        # Build recommendations for each job
+        for job_idx, job_id in enumerate(job_ids):
+            for rank, (idx, score) in enumerate(zip(top_indices[job_idx], top_scores[job_idx]), start=1):
                 all_recommendations.append({
-                    'job_id': job['job_id'],
-                    'candidate_id': cvs_df.iloc[idx]['candidate_id'],
-                    'similarity_score': round(scores[idx], 4),
+                    'job_id': job_id,
+                    'candidate_id': candidate_ids[idx],
+                    'similarity_score': round(float(score), 4),
                     'rank': rank,
-                    'match_percentage': round(scores[idx] * 100, 2)
+                    'match_percentage': round(float(score) * 100, 2)
                 })
         
-        return pd.DataFrame(all_recommendations)
+        return pd.DataFrame(all_recommendations,
+                            columns=['job_id', 'candidate_id', 'similarity_score', 'rank', 'match_percentage'])
 
 
 # Example usage
@@ -0,0 +1,77 @@
+"""
+record_store.py
+Append-only JSON-lines file of the CV or job records stored next to their vectors
+"""
+
+import json
+import os
+
+
+class RecordStore:
+    """
+    Document records (one JSON object per line) kept in the same order as the
+    rows of their VectorStore, so both can be restored after a restart
+    New records are appended; a line cut short by an interrupted write is
+    dropped when loading
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the store
+
+        Args:
+            path: Path to the .jsonl file (created on the first append)
+        """
+        self.path = path
+
+    def load(self):
+        """
+        Read all complete records (dropping an incomplete last line from the file)
+
+        Returns:
+            List of record dicts, in append order (empty if the file does not exist)
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        records = []
+        complete = 0
+        with open(self.path, 'r+b') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                records.append(json.loads(line))
+                complete += len(line)
+            # Cut an interrupted last line so the next append starts on a fresh line
+            f.truncate(complete)
+        return records
+
+    def append(self, records):
+        """
+        Append records to the end of the file
+
+        Args:
+            records: List of JSON-serializable dicts
+        """
+        if not records:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in records))
+
+    def rewrite(self, records):
+        """
+        Replace the whole file, e.g. after records were updated in place
+
+        Args:
+            records: List of JSON-serializable dicts
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(record) + '\n' for record in records))
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove all records"""
+        self.rewrite([])
@@ -0,0 +1,123 @@
+"""
+result_cache.py
+In-memory LRU cache of per-job similarity results
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ResultCache:
+    """
+    Cache of top-N results (CV indices and scores) for one job at a time
+    Keys combine the job's cleaned text, the corpus version and top_n, so any
+    change to the CVs (a new corpus version) makes old entries unreachable;
+    they age out through LRU eviction once the cache grows beyond max_bytes
+    The pipeline only stores exact results, never those of an approximate index
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Maximum total size of the cached arrays
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key_for(cleaned_text, corpus_version, top_n):
+        """
+        Compute the cache key for a job
+
+        Args:
+            cleaned_text (str): Cleaned job text
+            corpus_version (int): Version of the CV corpus the job is scored against
+            top_n (int): Number of results
+
+        Returns:
+            tuple: (hex SHA-256 of the text, corpus_version, top_n)
+        """
+        return hashlib.sha256(cleaned_text.encode('utf-8')).hexdigest(), corpus_version, top_n
+
+    def get(self, key):
+        """
+        Look up cached results
+
+        Args:
+            key (tuple): Cache key from key_for()
+
+        Returns:
+            tuple: (indices, scores) arrays or None on a miss
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            # Mark as recently used
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, indices, scores):
+        """
+        Store results, evicting least recently used entries if needed
+
+        Args:
+            key (tuple): Cache key from key_for()
+            indices: 1D array of CV indices, best first
+            scores: 1D array of matching scores
+        """
+        # Own copies, so a row does not keep a whole result matrix alive
+        entry = (np.array(indices), np.array(scores))
+        size = entry[0].nbytes + entry[1].nbytes
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[0].nbytes + old[1].nbytes
+            self.entries[key] = entry
+            self.total_bytes += size
+
+            while self.total_bytes > self.max_bytes:
+                _, (old_indices, old_scores) = self.entries.popitem(last=False)
+                self.total_bytes -= old_indices.nbytes + old_scores.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries (counters are kept)"""
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: Hits, misses, hit rate, evictions, entries and size
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'size_bytes': self.total_bytes,
+                'max_bytes': self.max_bytes
+            }
@@ -0,0 +1,428 @@
+"""
+scoring.py
+Batched cosine similarity scoring with bounded memory and top-k selection
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+from sklearn.preprocessing import normalize
+
+# Default block sizes: one dense score block is at most
+# QUERY_BLOCK_SIZE x CORPUS_BLOCK_SIZE floats (~16MB in float32, ~32MB in float64)
+QUERY_BLOCK_SIZE = 256
+CORPUS_BLOCK_SIZE = 16384
+
+# Below this many corpus rows per shard, a process pool costs more than it saves
+MIN_SHARD_ROWS = 50000
+
+# Shared scoring pool (see get_scoring_pool) and the shared-memory copy of the
+# last keyed in-memory corpus it scored: (key, specs, blocks)
+_scoring_pool = None
+_scoring_pool_workers = 0
+_shared_corpus = None
+_scoring_lock = threading.Lock()
+
+# Corpus arrays attached by each scoring worker (see attach_corpus)
+_corpus = None
+_corpus_key = None
+_corpus_memory = []
+
+
+def select_top_k(scores, indices, k):
+    """
+    Keep the k best entries of every row
+
+    Ordering is by score (descending), ties broken by the lower index,
+    so the result does not depend on how the corpus was split into blocks.
+
+    Args:
+        scores: 2D array of scores
+        indices: 2D array of corpus indices (same shape as scores)
+        k: Number of entries to keep per row
+
+    Returns:
+        Tuple (scores, indices) with k columns each, in no particular order
+    """
+    if scores.shape[1] <= k:
+        return scores, indices
+
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, part, axis=1)
+    top_indices = np.take_along_axis(indices, part, axis=1)
+
+    # Rows where a score tied with the cutoff was left out need an exact tie-break
+    cutoff = top_scores.min(axis=1)
+    ambiguous = np.nonzero((scores >= cutoff[:, None]).sum(axis=1) > k)[0]
+    for row in ambiguous:
+        order = np.lexsort((indices[row], -scores[row]))[:k]
+        top_scores[row] = scores[row, order]
+        top_indices[row] = indices[row, order]
+
+    return top_scores, top_indices
+
+
+def top_k_similarities(query_vectors, corpus_vectors, k,
+                       query_block_size=QUERY_BLOCK_SIZE,
+                       corpus_block_size=CORPUS_BLOCK_SIZE,
+                       normalized=False):
+    """
+    Find the k most similar corpus rows (cosine similarity) for every query row
+
+    The queries x corpus score matrix is computed block by block with sparse
+    matrix products, so memory stays bounded by the block sizes, and only a
+    running top-k per query is kept between corpus blocks.
+
+    Args:
+        query_vectors: Query vectors, e.g. jobs (sparse matrix or array)
+        corpus_vectors: Corpus vectors, e.g. CVs (sparse matrix or array)
+        k: Number of results per query
+        query_block_size: Number of query rows scored at once
+        corpus_block_size: Number of corpus rows scored at once
+        normalized: The corpus rows are already L2-normalized (e.g. stored vectors),
+            so they are scored as they are instead of through a normalized copy
+
+    Returns:
+        Tuple (indices, scores), both arrays of shape (n_queries, min(k, n_corpus)),
+        sorted by descending score. Scores keep the vectors' float dtype
+        (float32 vectors give float32 scores).
+    """
+    n_queries = query_vectors.shape[0]
+    n_corpus = corpus_vectors.shape[0]
+    k = max(0, min(k, n_corpus))
+
+    top_indices = np.zeros((n_queries, k), dtype=np.int64)
+    top_scores = np.zeros((n_queries, k), dtype=np.result_type(query_vectors.dtype, corpus_vectors.dtype, np.float32))
+    if n_queries == 0 or k == 0:
+        return top_indices, top_scores
+
+    queries = normalize(csr_matrix(query_vectors) if issparse(query_vectors) else np.asarray(query_vectors))
+    corpus = csr_matrix(corpus_vectors) if issparse(corpus_vectors) else np.asarray(corpus_vectors)
+    if not normalized:
+        corpus = normalize(corpus)
+
+    # Transpose each corpus block once, reuse it for every query block
+    corpus_blocks = []
+    for start in range(0, n_corpus, corpus_block_size):
+        corpus_blocks.append((start, corpus[start:start + corpus_block_size].T))
+
+    for q_start in range(0, n_queries, query_block_size):
+        query_block = queries[q_start:q_start + query_block_size]
+        best_scores = None
+        best_indices = None
+
+        for c_start, block_t in corpus_blocks:
+            scores = query_block @ block_t
+            scores = scores.toarray() if issparse(scores) else np.asarray(scores)
+            indices = np.broadcast_to(
+                np.arange(c_start, c_start + scores.shape[1]), scores.shape
+            )
+
+            if best_scores is not None:
+                scores = np.hstack([best_scores, scores])
+                indices = np.hstack([best_indices, indices])
+
+            best_scores, best_indices = select_top_k(scores, indices, k)
+
+        # Final ordering: descending score, then ascending corpus index
+        order = np.lexsort((best_indices, -best_scores), axis=1)
+        q_end = q_start + query_block.shape[0]
+        top_scores[q_start:q_end] = np.take_along_axis(best_scores, order, axis=1)
+        top_indices[q_start:q_end] = np.take_along_axis(best_indices, order, axis=1)
+
+    return top_indices, top_scores
+
+
+def share_array(array):
+    """
+    Copy an array into a new shared memory block
+
+    Returns:
+        Tuple (block, spec): the SharedMemory (owned by the caller, who must
+        close and unlink it) and the ('shm', name, dtype, length) needed to attach it
+    """
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+    return block, ('shm', block.name, array.dtype.str, len(array))
+
+
+def file_spec(array):
+    """
+    Where an array memory-mapped from a file (e.g. a VectorStore .npy) lives on disk
+
+    Returns:
+        ('file', path, inode, offset, dtype, length) for workers to map the same
+        bytes, or None if the array is not a contiguous view of a file mapping
+    """
+    mapping = array
+    while isinstance(mapping, np.ndarray) and not isinstance(mapping, np.memmap):
+        mapping = mapping.base
+    if not isinstance(mapping, np.memmap) or mapping.filename is None:
+        return None
+    while isinstance(mapping.base, np.memmap):
+        mapping = mapping.base
+
+    start = array.ctypes.data - mapping.ctypes.data
+    if not array.flags.c_contiguous or start < 0 or start + array.nbytes > mapping.nbytes:
+        return None
+    return ('file', mapping.filename, os.stat(mapping.filename).st_ino,
+            mapping.offset + start, array.dtype.str, len(array))
+
+
+def corpus_specs(corpus, corpus_key=None):
+    """
+    Specs for the scoring workers to attach the CSR arrays of a corpus
+
+    Arrays memory-mapped from files are attached in place. Otherwise the corpus
+    is copied into shared memory; with a corpus_key the copy is kept and reused
+    until a call with another key (or another shape) replaces it.
+
+    Args:
+        corpus: CSR matrix
+        corpus_key: Hashable version of the corpus (e.g. its weights version and
+            length), or None to copy it for this call only
+
+    Returns:
+        Tuple (specs, blocks): one spec per array, and the SharedMemory blocks
+        the caller must close and unlink after scoring (empty if kept or file-backed)
+    """
+    global _shared_corpus
+
+    arrays = (corpus.data, corpus.indices, corpus.indptr)
+    specs = [file_spec(array) for array in arrays]
+    if all(specs):
+        return specs, []
+
+    if corpus_key is not None:
+        key = (corpus_key, corpus.shape, corpus.nnz)
+        if _shared_corpus is not None and _shared_corpus[0] == key:
+            return _shared_corpus[1], []
+
+    blocks = []
+    specs = []
+    for array in arrays:
+        block, spec = share_array(array)
+        blocks.append(block)
+        specs.append(spec)
+    if corpus_key is None:
+        return specs, blocks
+
+    if _shared_corpus is not None:
+        release_blocks(_shared_corpus[2])
+    _shared_corpus = (key, specs, blocks)
+    return specs, []
+
+
+def release_blocks(blocks):
+    """Close and unlink shared memory blocks"""
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+def attach_corpus(specs, shape):
+    """
+    Worker side: map the CSR arrays of the corpus without copying, unless the
+    same corpus is already attached
+
+    Args:
+        specs: Specs of the data, indices and indptr arrays (see corpus_specs)
+        shape: Corpus matrix shape
+
+    Returns:
+        The corpus CSR matrix
+    """
+    global _corpus, _corpus_key
+
+    key = (tuple(specs), tuple(shape))
+    if _corpus_key == key:
+        return _corpus
+
+    for block in _corpus_memory:
+        block.close()
+    _corpus_memory.clear()
+
+    arrays = []
+    for spec in specs:
+        if spec[0] == 'file':
+            _, path, inode, offset, dtype, length = spec
+            with open(path, 'rb') as f:
+                # The store replaces its files when saving; never map a newer file
+                if os.fstat(f.fileno()).st_ino != inode:
+                    raise FileNotFoundError(f"{path} was replaced while scoring")
+                arrays.append(np.memmap(f, dtype=dtype, mode='r', offset=offset, shape=(length,)))
+        else:
+            _, name, dtype, length = spec
+            block = shared_memory.SharedMemory(name=name)
+            _corpus_memory.append(block)
+            arrays.append(np.ndarray((length,), dtype=dtype, buffer=block.buf))
+
+    _corpus = csr_matrix(tuple(arrays), shape=shape, copy=False)
+    _corpus_key = key
+    return _corpus
+
+
+def score_shard(specs, shape, query_vectors, start, end, k, query_block_size, corpus_block_size, normalized):
+    """
+    Worker task: top k of the corpus rows [start, end) for every query
+
+    Returns:
+        Tuple (indices, scores) with corpus-wide row indices
+    """
+    corpus = attach_corpus(specs, shape)
+    indices, scores = top_k_similarities(query_vectors, corpus[start:end], k,
+                                         query_block_size, corpus_block_size, normalized)
+    return indices + start, scores
+
+
+def get_scoring_pool(workers):
+    """
+    Get the shared scoring pool, (re)creating it when the worker count changes
+    (callers hold _scoring_lock)
+
+    Workers are started with forkserver (spawn where unavailable) rather than
+    forked from a threaded server, and live as long as the pool: they keep
+    the last corpus they attached between calls.
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor
+    """
+    global _scoring_pool, _scoring_pool_workers
+    if _scoring_pool is None or _scoring_pool_workers != workers:
+        if _scoring_pool is not None:
+            _scoring_pool.shutdown()
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        _scoring_pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        _scoring_pool_workers = workers
+    return _scoring_pool
+
+
+def shutdown_scoring_pool():
+    """Stop the shared scoring pool and free the kept shared corpus, if any"""
+    global _scoring_pool, _scoring_pool_workers, _shared_corpus
+    with _scoring_lock:
+        if _scoring_pool is not None:
+            _scoring_pool.shutdown()
+            _scoring_pool = None
+            _scoring_pool_workers = 0
+        if _shared_corpus is not None:
+            release_blocks(_shared_corpus[2])
+            _shared_corpus = None
+
+
+def sharded_top_k_similarities(query_vectors, corpus_vectors, k, workers=None,
+                               query_block_size=QUERY_BLOCK_SIZE,
+                               corpus_block_size=CORPUS_BLOCK_SIZE,
+                               corpus_key=None, normalized=False):
+    """
+    top_k_similarities with the corpus split into row shards scored in parallel
+
+    Shards are scored by the long-lived workers of the shared scoring pool,
+    which map a memory-mapped corpus (e.g. a VectorStore matrix) straight from
+    its files; any other corpus goes through shared memory (see corpus_specs).
+    The per-shard top k lists are merged here. Results are identical to
+    top_k_similarities, ties included. Small corpora (under MIN_SHARD_ROWS
+    rows per worker) are scored in-process.
+
+    Args:
+        query_vectors: Query vectors, e.g. jobs (sparse matrix or array)
+        corpus_vectors: Corpus vectors, e.g. CVs (sparse matrix, may be memory-mapped)
+        k: Number of results per query
+        workers: Number of worker processes (default: number of CPUs)
+        query_block_size: Number of query rows scored at once
+        corpus_block_size: Number of corpus rows scored at once
+        corpus_key: Hashable version of an in-memory corpus, so its shared
+            copy is reused by later calls with the same key
+        normalized: The corpus rows are already L2-normalized (see top_k_similarities)
+
+    Returns:
+        Tuple (indices, scores) as returned by top_k_similarities
+    """
+    n_corpus = corpus_vectors.shape[0]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    pool_workers = workers
+    workers = min(workers, n_corpus // MIN_SHARD_ROWS)
+
+    if workers <= 1 or not issparse(corpus_vectors):
+        return top_k_similarities(query_vectors, corpus_vectors, k, query_block_size, corpus_block_size, normalized)
+
+    corpus = csr_matrix(corpus_vectors)
+    queries = csr_matrix(query_vectors) if issparse(query_vectors) else np.asarray(query_vectors)
+
+    # Shards with about the same number of non-zeros, a few per worker to even out stragglers
+    n_shards = workers * 4
+    boundaries = np.searchsorted(corpus.indptr, np.linspace(0, corpus.nnz, n_shards + 1)[1:-1])
+    boundaries = np.unique(np.concatenate([[0], np.clip(boundaries, 0, n_corpus), [n_corpus]]))
+
+    # Calls take turns: they share the same workers, and a kept shared copy must
+    # not be replaced while the workers of another call attach it
+    with _scoring_lock:
+        pool = get_scoring_pool(pool_workers)
+        specs, blocks = corpus_specs(corpus, corpus_key)
+        try:
+            futures = [
+                pool.submit(score_shard, specs, corpus.shape, queries, int(start), int(end), k,
+                            query_block_size, corpus_block_size, normalized)
+                for start, end in zip(boundaries[:-1], boundaries[1:])
+            ]
+            results = [future.result() for future in futures]
+        finally:
+            release_blocks(blocks)
+
+    # Merge the per-shard top k lists
+    indices = np.hstack([result[0] for result in results])
+    scores = np.hstack([result[1] for result in results])
+    k = min(k, n_corpus)
+    order = np.lexsort((indices, -scores), axis=1)[:, :k]
+    return np.take_along_axis(indices, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def top_shared_terms(query_vector, corpus_vectors, n_terms):
+    """
+    Columns contributing most to the similarity of one query with each corpus row
+
+    The elementwise product of the query with a row holds each shared column's
+    share of their dot product (the cosine score for L2-normalized vectors).
+    Only the query's non-zero columns can contribute, so all rows are handled
+    in one pass over that column subset.
+
+    Args:
+        query_vector: One query vector, e.g. a job (sparse matrix with one row)
+        corpus_vectors: Corpus rows to explain, e.g. the top CVs (sparse matrix)
+        n_terms: Number of columns per row
+
+    Returns:
+        Tuple (columns, contributions), both of shape (n_rows, n_terms), by
+        descending contribution (ties by lower column). Rows with fewer shared
+        columns are padded with column -1 and contribution 0.
+    """
+    query = csr_matrix(query_vector)
+    columns = query.indices
+    n_rows = corpus_vectors.shape[0]
+
+    contributions = csr_matrix(corpus_vectors)[:, columns].multiply(query.data).toarray()
+    contributions = np.asarray(contributions, dtype=np.result_type(query.dtype, np.float32))
+
+    # Pad so that every row has at least n_terms candidates
+    padding = max(0, n_terms - len(columns))
+    if padding:
+        contributions = np.hstack([contributions, np.zeros((n_rows, padding), dtype=contributions.dtype)])
+        columns = np.concatenate([columns, np.full(padding, -1, dtype=columns.dtype)])
+    column_ids = np.broadcast_to(columns, contributions.shape)
+
+    # Non-shared columns (zero product) are never reported
+    column_ids = np.where(contributions > 0, column_ids, -1)
+    contributions, column_ids = select_top_k(contributions, column_ids, n_terms)
+    order = np.lexsort((np.where(column_ids < 0, np.iinfo(np.int64).max, column_ids), -contributions), axis=1)
+    return np.take_along_axis(column_ids, order, axis=1), np.take_along_axis(contributions, order, axis=1)
@@ -0,0 +1,177 @@
+"""
+section_scores.py
+Per-section job x CV similarity matrices, combined with adjustable weights
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+
+from src.scoring import CORPUS_BLOCK_SIZE, QUERY_BLOCK_SIZE, select_top_k
+
+
+def block_scores(job_vectors, cv_vectors, out,
+                 query_block_size=QUERY_BLOCK_SIZE, corpus_block_size=CORPUS_BLOCK_SIZE):
+    """
+    Write job x CV dot products into a dense array, block by block
+
+    Only one QUERY_BLOCK_SIZE x CORPUS_BLOCK_SIZE product is materialized at a time,
+    as in scoring.top_k_similarities
+
+    Args:
+        job_vectors: Job vectors (sparse, L2-normalized rows)
+        cv_vectors: CV vectors (sparse, L2-normalized rows)
+        out: Array of shape (n_jobs, n_cvs) to fill
+    """
+    for c_start in range(0, cv_vectors.shape[0], corpus_block_size):
+        block_t = cv_vectors[c_start:c_start + corpus_block_size].T
+        c_end = c_start + block_t.shape[1]
+        for q_start in range(0, job_vectors.shape[0], query_block_size):
+            scores = job_vectors[q_start:q_start + query_block_size] @ block_t
+            out[q_start:q_start + scores.shape[0], c_start:c_end] = scores.toarray()
+
+
+def grow(array, n_rows, n_cols):
+    """Array with room for at least n_rows x n_cols (doubling), keeping the current content"""
+    rows, cols = array.shape
+    if n_rows <= rows and n_cols <= cols:
+        return array
+    shape = (max(n_rows, 2 * rows) if n_rows > rows else rows,
+             max(n_cols, 2 * cols) if n_cols > cols else cols)
+    grown = np.zeros(shape, dtype=array.dtype)
+    grown[:rows, :cols] = array
+    return grown
+
+
+class SectionScores:
+    """
+    Cosine similarity of every job to every CV, computed once per section
+
+    A weighted score is a linear combination of the stored matrices, so changing
+    the weights does not re-clean, re-vectorize or re-score any document. Memory
+    is one float32 matrix of jobs x CVs per section. New CVs add columns and new
+    jobs add rows (into spare capacity that doubles when full), so only the new
+    pairs are scored.
+    """
+
+    def __init__(self, job_ids, job_sections, cv_sections):
+        """
+        Score all jobs against all CVs, section by section
+
+        Args:
+            job_ids: List of job IDs (one per row of each job matrix)
+            job_sections: Dict section -> job vectors (sparse, L2-normalized rows)
+            cv_sections: Dict section -> CV vectors (same sections, same vectorizer)
+        """
+        self.job_ids = []
+        self.positions = {}
+        self.n_cvs = 0
+        self.job_sections = {section: csr_matrix((0, vectors.shape[1]), dtype=np.float32)
+                             for section, vectors in job_sections.items()}
+        self._scores = {section: np.zeros((0, 0), dtype=np.float32) for section in job_sections}
+        self.add_cvs(cv_sections)
+        self.add_jobs(job_ids, job_sections, cv_sections)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    @property
+    def matrices(self):
+        """Dict section -> jobs x CVs similarities (views of the used part of each buffer)"""
+        return {section: scores[:len(self.job_ids), :self.n_cvs] for section, scores in self._scores.items()}
+
+    def add_cvs(self, cv_sections):
+        """
+        Score new CVs against all jobs (new columns)
+
+        Args:
+            cv_sections: Dict section -> vectors of the new CVs, appended after the ones already scored
+        """
+        n_new = next(iter(cv_sections.values())).shape[0]
+        n_cvs = self.n_cvs + n_new
+        for section, scores in self._scores.items():
+            scores = self._scores[section] = grow(scores, len(self.job_ids), n_cvs)
+            block_scores(self.job_sections[section], csr_matrix(cv_sections[section]),
+                         scores[:len(self.job_ids), self.n_cvs:n_cvs])
+        self.n_cvs = n_cvs
+
+    def add_jobs(self, job_ids, job_sections, cv_sections):
+        """
+        Score new jobs against all CVs (new rows)
+
+        Args:
+            job_ids: List of the new job IDs (one per row of each job matrix)
+            job_sections: Dict section -> vectors of the new jobs
+            cv_sections: Dict section -> all CV vectors, as counted by n_cvs
+        """
+        n_jobs = len(self.job_ids) + len(job_ids)
+        for section, scores in self._scores.items():
+            cv_vectors = cv_sections[section]
+            if cv_vectors.shape[0] != self.n_cvs:
+                raise ValueError(f"Scores cover {self.n_cvs} CVs, got {cv_vectors.shape[0]}")
+            job_vectors = csr_matrix(job_sections[section])
+            scores = self._scores[section] = grow(scores, n_jobs, self.n_cvs)
+            block_scores(job_vectors, csr_matrix(cv_vectors), scores[len(self.job_ids):n_jobs, :self.n_cvs])
+            self.job_sections[section] = vstack([self.job_sections[section], job_vectors], format='csr')
+
+        for job_id in job_ids:
+            self.positions[job_id] = len(self.job_ids)
+            self.job_ids.append(job_id)
+
+    @property
+    def sections(self):
+        return list(self.matrices)
+
+    def combine(self, weights, job_ids=None):
+        """
+        Weighted average of the section similarities
+
+        Args:
+            weights: Dict section -> non-negative weight (missing sections count 0)
+            job_ids: Optional list of job IDs to score (default: all jobs)
+
+        Returns:
+            2D float32 array of scores (one row per job, one column per CV)
+        """
+        unknown = set(weights) - set(self.matrices)
+        if unknown:
+            raise ValueError(f"Unknown sections: {sorted(unknown)} (expected {self.sections})")
+        if any(weight < 0 for weight in weights.values()):
+            raise ValueError("Section weights must not be negative")
+        total = sum(weights.values())
+        if total <= 0:
+            raise ValueError("At least one section weight must be positive")
+
+        rows = slice(None) if job_ids is None else [self.positions[job_id] for job_id in job_ids]
+        matrices = self.matrices
+        combined = None
+        for section, weight in weights.items():
+            if weight == 0:
+                continue
+            part = matrices[section][rows] * np.float32(weight / total)
+            combined = part if combined is None else combined + part
+        return combined
+
+    def top_k(self, weights, k, job_ids=None, cv_rows=None):
+        """
+        Top k CVs per job under the given section weights
+
+        Args:
+            weights: Dict section -> non-negative weight
+            k: Number of CVs per job
+            job_ids: Optional list of job IDs (default: all jobs)
+            cv_rows: Optional sorted array of CV indices to rank (default: all CVs)
+
+        Returns:
+            Tuple (indices, scores) ordered like scoring.top_k_similarities
+            (descending score, ties broken by the lower CV index)
+        """
+        scores = self.combine(weights, job_ids)
+        if cv_rows is None:
+            cv_rows = np.arange(scores.shape[1])
+        else:
+            scores = scores[:, cv_rows]
+        indices = np.broadcast_to(cv_rows, scores.shape)
+        scores, indices = select_top_k(scores, indices, k)
+
+        order = np.lexsort((indices, -scores), axis=1)
+        return np.take_along_axis(indices, order, axis=1), np.take_along_axis(scores, order, axis=1)
@@ -1,8 +1,6 @@
 # recommendation.py
 import pandas as pd
 import numpy as np
-import pickle
-from sklearn.metrics.pairwise import cosine_similarity
 
 # ----------------------------
 # Load cleaned datasets
@@ -13,38 +11,32 @@ jobs = pd.read_csv("../results/jobs_cleaned.csv")
 # ----------------------------
 # Load vectors
 # ----------------------------
-with open("../models/cv_vectors.pkl", "rb") as f:
-    cv_vectors = pickle.load(f)
+from vector_store import VectorStore
 
-with open("../models/job_vectors.pkl", "rb") as f:
-    job_vectors = pickle.load(f)
+# Memory-mapped: the arrays are paged in on demand, not read whole
+cv_vectors = VectorStore.load("../models/cv_vectors", mmap_mode='r').matrix
+job_vectors = VectorStore.load("../models/job_vectors", mmap_mode='r').matrix
 
 # ----------------------------
-# Compute Cosine Similarity
+# Compute Cosine Similarity and Recommend Top N Candidates
 # ----------------------------
-similarity_matrix = cosine_similarity(job_vectors, cv_vectors)
-# similarity_matrix[i][j] = similarity of job i with candidate j
+from scoring import sharded_top_k_similarities
 
-# ----------------------------
-# Recommend Top N Candidates
-# ----------------------------
 top_n = 5  # choose top 5 candidates
 
+# Large CV sets are split into shards scored by a process pool (one per CPU)
+top_indices, top_scores = sharded_top_k_similarities(job_vectors, cv_vectors, top_n)
+# top_indices[i] = best candidates for job i, top_scores[i] = their similarities
+
 recommendations = []
 
 for job_idx, job in jobs.iterrows():
-    # Get similarity scores for this job
-    scores = similarity_matrix[job_idx]
-    
-    # Get indices of top N candidates
-    top_indices = np.argsort(scores)[::-1][:top_n]
-    
-    for rank, idx in enumerate(top_indices, start=1):
+    for rank, (idx, score) in enumerate(zip(top_indices[job_idx], top_scores[job_idx]), start=1):
         recommendations.append({
             "job_id": job['job_id'],
             #"job_title": job['job_title'],
             "candidate_id": cvs.iloc[idx]['candidate_id'],
-            "similarity_score": round(scores[idx], 4),
+            "similarity_score": round(float(score), 4),
             "rank": rank
         })
 
@@ -0,0 +1,67 @@
+"""
+Tests for the structured attribute index (years of experience, degree level)
+Run from the screen_cv_automation folder: python -m pytest src/test_attribute_index.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.attribute_index import AttributeIndex, parse_degree, parse_years
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_parse_attributes():
+    assert parse_years('3 years') == 3
+    assert parse_years('1 year') == 1
+    assert parse_years('2-4 years') == 2  # ranges count with their lower bound
+    assert parse_years('5+ years in data science') == 5
+    assert np.isnan(parse_years('Fresh graduate'))
+
+    assert parse_degree('BSc Computer Science') == parse_degree('BA HR') == 2
+    assert parse_degree("Master's in Computer Science") == parse_degree('MSc Statistics') == 3
+    assert parse_degree('PhD in Physics') == 4
+    assert parse_degree('IT or Statistics') == 0
+    assert parse_degree('MS in Data Science') == parse_degree('M.S.') == 3
+    assert parse_degree('B.A. Economics') == parse_degree('BA (Hons) English') == 2
+
+
+def test_parse_attributes_needs_context():
+    # Skills and job titles that share spellings with degrees
+    assert parse_degree('MS Office, Excel') == 0
+    assert parse_degree('Skills: MS Word, MS Project, BA tools, BS detector') == 0
+    assert parse_degree('Scrum Master, Master Data Management') == 0
+    assert parse_degree('Associate Data Scientist') == 0
+    assert parse_degree('MS Office, Excel. Education: BSc IT') == 2
+
+    # Durations that are not experience (sections run to the end of the document)
+    assert np.isnan(parse_years('Data Analyst at Acme. Led a 2 year migration, 30 years old'))
+    assert np.isnan(parse_years('Skills: SQL. Education: BSc IT, 4 years'))
+    assert parse_years('Analyst. 5 years of professional experience. Project ran 12 years') == 5
+    assert parse_years('Experience: 3 years. Product with a 10 year warranty') == 3
+    assert parse_years('Worked for 2 years at Acme') == 2
+
+
+def test_mask_matches_column_filters():
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'data', 'cvs_100.csv'))
+    cvs.loc[::7, 'education'] = 'MSc Data Science'
+    index = AttributeIndex()
+    index.append(cvs['experience'][:60], cvs['education'][:60])
+    index.append(cvs['experience'][60:], cvs['education'][60:])
+
+    years = cvs['experience'].str.extract(r'(\d+)')[0].astype(float).to_numpy()
+    assert len(index) == len(cvs)
+    assert index.mask() is None
+    assert (index.mask(min_years=3) == (years >= 3)).all()
+    assert (index.mask(min_years=2.5) == (years >= 2.5)).all()
+    assert (index.mask(degree='master') == (np.arange(len(cvs)) % 7 == 0)).all()
+    assert (index.mask(min_years=2, degree='Bachelor') == (years >= 2)).all()
+
+    with pytest.raises(ValueError):
+        index.mask(degree='astronaut')
+
+    index.clear()
+    assert len(index.mask(min_years=1)) == 0
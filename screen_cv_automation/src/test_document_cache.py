@@ -0,0 +1,97 @@
+"""
+Tests for the on-disk cache of parsed and cleaned documents
+Run from the screen_cv_automation folder: python -m pytest src/test_document_cache.py
+"""
+
+import json
+import os
+
+from src.document_cache import DocumentCache
+
+
+def make_entry(i):
+    return {'text': f"cv {i}", 'sections': {'skills': 'python'}, 'cleaned_sections': {'skills': 'python'}}
+
+
+def entry_bytes(i):
+    return len(json.dumps(make_entry(i)).encode('utf-8'))
+
+
+def test_hits_misses_and_counters(tmp_path):
+    cache = DocumentCache(cache_dir=str(tmp_path))
+    key = cache.key_for(b'%PDF-1.4 first', 'pdf')
+
+    assert cache.get(key) is None
+    cache.put(key, make_entry(0))
+    assert cache.get(key) == make_entry(0)
+    assert cache.get(cache.key_for(b'%PDF-1.4 second', 'pdf')) is None
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 2, 0)
+    assert stats['hit_rate'] == round(1 / 3, 4)
+    assert stats['entries'] == 1 and stats['size_bytes'] == entry_bytes(0)
+
+    # Entries survive a restart, with their sizes
+    reopened = DocumentCache(cache_dir=str(tmp_path))
+    assert reopened.get(key) == make_entry(0)
+    assert reopened.stats()['size_bytes'] == entry_bytes(0)
+
+
+def test_lru_eviction(tmp_path):
+    cache = DocumentCache(cache_dir=str(tmp_path), max_bytes=2 * entry_bytes(0))
+    keys = [cache.key_for(f"document {i}".encode(), 'txt') for i in range(3)]
+
+    cache.put(keys[0], make_entry(0))
+    cache.put(keys[1], make_entry(1))
+    # Give the entries distinct ages, whatever the file system's timestamp resolution
+    for age, key in enumerate(keys[:2]):
+        os.utime(cache.entry_path(key), (1000 + age, 1000 + age))
+    assert cache.get(keys[0]) is not None  # keys[1] is now least recently used
+    cache.put(keys[2], make_entry(2))
+
+    assert cache.get(keys[1]) is None
+    assert not os.path.exists(cache.entry_path(keys[1]))
+    assert cache.get(keys[0]) == make_entry(0)
+    assert cache.get(keys[2]) == make_entry(2)
+
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['entries'] == 2
+    assert stats['size_bytes'] == entry_bytes(0) + entry_bytes(2)
+
+    # Entries larger than the whole cache are not stored
+    cache.put(cache.key_for(b'huge', 'txt'), {'text': 'x' * 1000})
+    assert cache.stats()['entries'] == 2
+
+
+def test_settings_are_part_of_the_key(tmp_path):
+    data = b'same bytes'
+    cache = DocumentCache(cache_dir=str(tmp_path), settings={'parser': 1, 'page_budget': 20})
+    cache.put(cache.key_for(data, 'docx'), make_entry(0))
+
+    same = DocumentCache(cache_dir=str(tmp_path), settings={'page_budget': 20, 'parser': 1})
+    assert same.get(same.key_for(data, 'docx')) == make_entry(0)
+
+    for settings in [{'parser': 2, 'page_budget': 20}, {'parser': 1, 'page_budget': 10}, None]:
+        other = DocumentCache(cache_dir=str(tmp_path), settings=settings)
+        assert other.key_for(data, 'docx') != cache.key_for(data, 'docx')
+        assert other.get(other.key_for(data, 'docx')) is None
+
+
+def test_extension_is_part_of_the_key(tmp_path):
+    data = b'%PDF-1.4 same bytes'
+    cache = DocumentCache(cache_dir=str(tmp_path))
+    cache.put(cache.key_for(data, 'pdf'), make_entry(0))
+
+    assert cache.get(cache.key_for(data, '.PDF')) == make_entry(0)
+    for extension in ['docx', 'txt']:
+        assert cache.get(cache.key_for(data, extension)) is None
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = DocumentCache(cache_dir=str(tmp_path))
+    key = cache.key_for(b'document', 'txt')
+    with open(cache.entry_path(key), 'w', encoding='utf-8') as f:
+        f.write('{not json')
+
+    assert cache.get(key) is None
+    assert cache.stats()['misses'] == 1
@@ -0,0 +1,90 @@
+"""
+Tests for the streaming DOCX extractor
+Run from the screen_cv_automation folder: python -m pytest src/test_docx_extraction.py
+"""
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.table import Table
+
+from src.create_sample_docs import create_sample_cv_docx, create_sample_job_docx
+from src.document_parser import DocumentParser
+
+
+def python_docx_blocks(path):
+    """Text of each body paragraph and table through python-docx, in document order"""
+    blocks = []
+    for block in Document(path).iter_inner_content():
+        if isinstance(block, Table):
+            blocks.append("".join(cell.text + " " for row in block.rows for cell in row.cells) + "\n")
+        else:
+            blocks.append(block.text + "\n")
+    return blocks
+
+
+def test_parity_with_python_docx(tmp_path):
+    doc = Document()
+    doc.add_heading('Jane Roe', 0)
+    run = doc.add_paragraph('Skills:\tPython, SQL\nand Spark').add_run(' - R')
+    run.add_break(WD_BREAK.PAGE)
+    run.add_break()
+
+    # Horizontally and vertically merged cells, a multi-paragraph cell, then more paragraphs
+    table = doc.add_table(rows=3, cols=3)
+    for r in range(3):
+        for c in range(3):
+            table.cell(r, c).text = f"r{r}c{c}"
+    table.cell(0, 0).merge(table.cell(0, 1))
+    table.cell(1, 2).merge(table.cell(2, 2))
+    table.cell(1, 0).add_paragraph('second line')
+    doc.add_paragraph('Experience: 4 years')
+
+    hyperlink = OxmlElement('w:hyperlink')
+    hyperlink.set(qn('r:id'), 'rId99')
+    link_run = OxmlElement('w:r')
+    link_text = OxmlElement('w:t')
+    link_text.text = 'portfolio'
+    link_run.append(link_text)
+    hyperlink.append(link_run)
+    doc.add_paragraph('See ')._p.append(hyperlink)
+
+    path = str(tmp_path / 'cv.docx')
+    doc.save(path)
+    parser = DocumentParser()
+
+    blocks = list(parser.iter_docx_blocks(path))
+    assert blocks == python_docx_blocks(path)
+    assert blocks[2].startswith('r0c0\nr0c1 r0c0\nr0c1 r0c2 ') and blocks[2].endswith('r1c2\nr2c2 \n')
+    assert blocks[-1] == 'See portfolio\n'
+    with open(path, 'rb') as f:
+        assert list(parser.iter_docx_blocks(f.read())) == blocks
+
+
+def test_same_text_as_object_model_extractor(tmp_path):
+    parser = DocumentParser()
+    paths = [str(tmp_path / 'cv.docx'), str(tmp_path / 'long_cv.docx')]
+    create_sample_cv_docx(paths[0])
+    create_sample_cv_docx(paths[1], copies=20)
+
+    # Tables last: the python-docx extractor's order is document order
+    doc = Document(paths[1])
+    doc.add_table(rows=2, cols=2).cell(1, 1).text = 'AWS Certified'
+    doc.save(paths[1])
+
+    for path in paths:
+        assert parser.parse_docx(path) == parser.clean_extracted_text(parser.docx_document_text(path))
+
+
+def test_unreadable_main_part_falls_back(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    create_sample_job_docx()
+    parser = DocumentParser()
+    expected = parser.parse_docx('sample_job.docx')
+
+    def missing_part(package):
+        raise KeyError('word/document.xml')
+
+    monkeypatch.setattr('src.document_parser.docx_main_part', missing_part)
+    assert parser.parse_docx('sample_job.docx') == expected
@@ -0,0 +1,54 @@
+"""
+Tests for match explanations (top shared weighted terms)
+Run from the screen_cv_automation folder: python -m pytest src/test_explanations.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.sparse import random as sparse_random
+
+from src.recommendation_pipeline import CandidateRecommendationPipeline
+from src.scoring import top_shared_terms
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_top_shared_terms_match_dense_products():
+    corpus = sparse_random(200, 60, density=0.1, format='csr', random_state=1, dtype=np.float32)
+    query = sparse_random(1, 60, density=0.3, format='csr', random_state=2, dtype=np.float32)
+    columns, contributions = top_shared_terms(query, corpus, 4)
+
+    products = corpus.toarray() * query.toarray()
+    for row in range(corpus.shape[0]):
+        shared = np.flatnonzero(products[row])
+        expected = shared[np.lexsort((shared, -products[row, shared]))][:4]
+        assert list(columns[row][columns[row] >= 0]) == list(expected)
+        assert np.allclose(contributions[row][:len(expected)], products[row, expected])
+        assert (contributions[row][len(expected):] == 0).all()
+
+
+@pytest.mark.parametrize('mode', ['tfidf', 'hashing'])
+def test_explanations_name_shared_terms(mode):
+    pipeline = CandidateRecommendationPipeline(
+        vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'),
+        idf_path=os.path.join(BASE_DIR, 'models', 'hashing_idf.npz'),
+        mode=mode
+    )
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'cvs_cleaned.csv'))
+    jobs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'jobs_cleaned.csv'))
+    job_text = jobs['cleaned_text'][0]
+    cv_texts = cvs['cleaned_text'].fillna('').tolist()[:20]
+
+    explanations = pipeline.explain_matches(job_text, pipeline.vectorize_text(job_text),
+                                            pipeline.vectorize_texts(cv_texts), n_terms=3)
+
+    assert len(explanations) == len(cv_texts)
+    for cv_text, terms in zip(cv_texts, explanations):
+        assert len(terms) <= 3
+        for term in terms:
+            assert term['term'] in job_text.split() and term['term'] in cv_text.split()
+        contributions = [term['contribution'] for term in terms]
+        assert contributions == sorted(contributions, reverse=True)
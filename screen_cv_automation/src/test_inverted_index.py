@@ -0,0 +1,44 @@
+"""
+Tests for inverted-index top-k retrieval
+Run from the screen_cv_automation folder: python -m pytest src/test_inverted_index.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import random as sparse_random, vstack
+
+from src.inverted_index import InvertedIndex
+from src.recommendation_pipeline import CandidateRecommendationPipeline
+from src.scoring import top_k_similarities
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_index_matches_exact_top_k():
+    for seed in range(3):
+        corpus = sparse_random(2000, 300, density=0.02, format='csr', random_state=seed)
+        corpus = vstack([corpus, corpus[:300]]).tocsr()  # duplicates give exact ties
+        queries = sparse_random(30, 300, density=0.03, format='csr', random_state=seed + 10)
+        index = InvertedIndex(corpus)
+
+        # Large k also covers queries sharing no term with enough documents (zero-score padding)
+        for k in [1, 5, 50, 2300]:
+            expected_indices, expected_scores = top_k_similarities(queries, corpus, k)
+            indices, scores = index.top_k(queries, k)
+
+            assert (indices == expected_indices).all()
+            assert np.allclose(scores, expected_scores)
+
+
+def test_batch_recommend_with_index():
+    pipeline = CandidateRecommendationPipeline(vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'))
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'cvs_cleaned.csv'))
+    jobs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'jobs_cleaned.csv'))
+
+    cv_vectors = pipeline.vectorize_cvs(cvs)
+    expected = pipeline.batch_recommend(jobs, cvs, top_n=10, cv_vectors=cv_vectors)
+    indexed = pipeline.batch_recommend(jobs, cvs, top_n=10, cv_index=InvertedIndex(cv_vectors))
+
+    pd.testing.assert_frame_equal(indexed, expected)
@@ -0,0 +1,116 @@
+"""
+Tests for incremental IDF maintenance as CVs arrive
+Run from the screen_cv_automation folder: python -m pytest src/test_live_idf.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.recommendation_pipeline import CandidateRecommendationPipeline
+from src.vector_store import VectorStore
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def load_cleaned_cvs():
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'cvs_cleaned.csv'))
+    return cvs['candidate_id'].tolist(), cvs['cleaned_text'].fillna('').tolist()
+
+
+@pytest.mark.parametrize('mode', ['tfidf', 'hashing'])
+def test_rescaled_vectors_match_revectorizing(mode):
+    pipeline = CandidateRecommendationPipeline(
+        vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'),
+        idf_path=os.path.join(BASE_DIR, 'models', 'hashing_idf.npz'),
+        mode=mode,
+        live_idf=True
+    )
+    ids, texts = load_cleaned_cvs()
+    store = VectorStore()
+
+    for start, end in [(0, 7), (7, 40), (40, len(texts))]:
+        vectors, factors = pipeline.add_to_corpus(texts[start:end])
+        store.rescale_columns(factors)
+        store.append(ids[start:end], vectors)
+
+    expected = pipeline.vectorize_texts(texts)
+    assert store.matrix.dtype == np.float32
+    assert np.allclose(store.matrix.toarray(), expected.toarray(), atol=1e-6)
+
+    # With every CV added, the live IDF equals the one fitted on the same corpus
+    if mode == 'tfidf':
+        assert np.allclose(pipeline.idf_table.idf(), pipeline.vectorizer.idf_)
+        assert np.allclose(expected.toarray(), pipeline.vectorizer.transform(texts).toarray(), atol=1e-6)
+
+
+def test_reset_corpus():
+    pipeline = CandidateRecommendationPipeline(
+        vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'),
+        live_idf=True
+    )
+    _, texts = load_cleaned_cvs()
+
+    pipeline.add_to_corpus(texts)
+    pipeline.reset_corpus()
+
+    assert pipeline.idf_table.n_documents == 0
+    assert not pipeline.idf_table.document_frequency.any()
+    # An empty table weights every term equally
+    vectors, factors = pipeline.add_to_corpus(texts[:1])
+    assert np.allclose(factors[vectors.indices], pipeline.idf_table.idf()[vectors.indices])
+
+
+def test_saved_corpus_restores_the_idf_in_use(tmp_path):
+    kwargs = dict(vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'),
+                  live_idf=True, idf_refresh_fraction=0.5)
+    pipeline = CandidateRecommendationPipeline(**kwargs)
+    _, texts = load_cleaned_cvs()
+    pipeline.add_to_corpus(texts[:40])
+    pipeline.add_to_corpus(texts[40:50])
+    pipeline.save_corpus(str(tmp_path / 'idf.npz'))
+
+    restored = CandidateRecommendationPipeline(**kwargs)
+    assert not restored.load_corpus(str(tmp_path / 'missing.npz'))
+    assert restored.load_corpus(str(tmp_path / 'idf.npz'))
+
+    # Same table and the same (older) IDF in use, so later batches get the same vectors
+    assert restored.idf_table.n_documents == 50 and restored.idf_documents == 40
+    for model in (pipeline, restored):
+        vectors, factors = model.add_to_corpus(texts[50:60])
+        assert factors is None
+    assert np.allclose(restored.vectorize_texts(texts[:5]).toarray(), pipeline.vectorize_texts(texts[:5]).toarray())
+    assert np.array_equal(restored.idf_table.document_frequency, pipeline.idf_table.document_frequency)
+
+
+def test_batched_idf_refresh():
+    pipeline = CandidateRecommendationPipeline(
+        vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'),
+        live_idf=True,
+        idf_refresh_fraction=0.5
+    )
+    ids, texts = load_cleaned_cvs()
+    store = VectorStore()
+
+    refreshed = []
+    for start, end in [(0, 20), (20, 25), (25, 29), (29, 40), (40, len(texts))]:
+        vectors, factors = pipeline.add_to_corpus(texts[start:end])
+        refreshed.append(factors is not None)
+        if factors is not None:
+            store.rescale_columns(factors)
+        store.append(ids[start:end], vectors)
+
+        # Stored and newly vectorized documents always share one IDF
+        expected = pipeline.vectorize_texts(texts[:end])
+        assert np.allclose(store.matrix.toarray(), expected.toarray(), atol=1e-6)
+
+    # Refreshed once the corpus grew by half since the last refresh: 20, 40, 100 CVs
+    assert refreshed == [True, False, False, True, True]
+
+    # Below the threshold, new documents keep the IDF of the last refresh
+    vectors, factors = pipeline.add_to_corpus(texts[:1])
+    assert factors is None and pipeline.idf_table.n_documents == len(texts) + 1
+    assert np.allclose(vectors.toarray(), pipeline.vectorize_texts(texts[:1]).toarray())
+    assert not np.allclose(pipeline.idf_weights, pipeline.idf_table.idf())
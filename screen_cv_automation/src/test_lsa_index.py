@@ -0,0 +1,99 @@
+"""
+Tests for the LSA + IVF approximate index
+Run from the screen_cv_automation folder: python -m pytest src/test_lsa_index.py
+"""
+
+import numpy as np
+from scipy.sparse import diags, random as sparse_random
+from sklearn.preprocessing import normalize
+
+from src.lsa_index import LsaIndex
+from src.scoring import top_k_similarities
+
+
+def partitions(index):
+    """Documents and projected vectors of every partition"""
+    return [index.partition_rows(cluster) for cluster in range(len(index.centroids))]
+
+
+def test_layout_and_exhaustive_search_matches_exact():
+    corpus = sparse_random(1000, 200, density=0.05, format='csr', random_state=3)
+    queries = sparse_random(20, 200, density=0.05, format='csr', random_state=4)
+    index = LsaIndex(n_components=32, n_clusters=16).fit(corpus)
+
+    rows = partitions(index)
+    assert all(vectors.dtype == np.float32 and vectors.flags.c_contiguous for _, vectors in rows)
+    assert sum(len(vectors) for _, vectors in rows) == 1000 and rows[0][1].shape[1] == 32
+    assert sorted(np.concatenate([documents for documents, _ in rows])) == list(range(1000))
+    # The corpus is referenced for re-scoring, not copied
+    assert np.shares_memory(index.corpus.data, corpus.data)
+
+    # Probing every partition and re-scoring every candidate is exact search
+    indices, scores = index.top_k(queries, 10, n_probe=16, rerank=100)
+    expected_indices, expected_scores = top_k_similarities(queries, corpus, 10)
+    assert (indices == expected_indices).all()
+    assert np.allclose(scores, expected_scores)
+
+
+def test_probing_fewer_partitions():
+    corpus = sparse_random(1000, 200, density=0.05, format='csr', random_state=5)
+    index = LsaIndex(n_components=32, n_clusters=50, n_probe=1).fit(corpus)
+
+    # Each document finds itself among its nearest neighbours
+    indices, scores = index.top_k(corpus[:50], 5)
+    assert indices.shape == (50, 5)
+    assert (indices[:, 0] == np.arange(50)).mean() > 0.9
+    assert (np.diff(scores, axis=1) <= 0).all()
+
+
+def test_added_documents_use_the_fitted_projection():
+    corpus = sparse_random(1200, 200, density=0.05, format='csr', random_state=6)
+    queries = sparse_random(20, 200, density=0.05, format='csr', random_state=7)
+    index = LsaIndex(n_components=32, n_clusters=16).fit(corpus[:1000])
+    components, centroids = index.components.copy(), index.centroids.copy()
+
+    fitted = [(documents.copy(), vectors.copy()) for documents, vectors in partitions(index)]
+    index.add(corpus[:1100]).add(corpus)
+
+    # No refit: same projection and partitions, new rows appended to their nearest partition
+    assert (index.components == components).all() and (index.centroids == centroids).all()
+    assert len(index) == 1200 and np.isclose(index.drift, 0.2)
+    labels = np.argmax(index.project(corpus[1000:]) @ centroids.T, axis=1)
+    for cluster, (documents, vectors) in enumerate(partitions(index)):
+        before = len(fitted[cluster][0])
+        assert (documents[:before] == fitted[cluster][0]).all() and (vectors[:before] == fitted[cluster][1]).all()
+        assert (documents[before:] >= 1000).all() and (labels[documents[before:] - 1000] == cluster).all()
+        assert np.allclose(vectors, index.project(corpus[documents]), atol=1e-6)
+
+    # Exhaustive search over the grown index is still exact
+    indices, scores = index.top_k(queries, 10, n_probe=16, rerank=200)
+    expected_indices, expected_scores = top_k_similarities(queries, corpus, 10)
+    assert (indices == expected_indices).all()
+    assert np.allclose(scores, expected_scores)
+
+
+def test_reweighted_index_keeps_the_fit():
+    corpus = sparse_random(600, 200, density=0.05, format='csr', random_state=8)
+    queries = sparse_random(10, 200, density=0.05, format='csr', random_state=9)
+    index = LsaIndex(n_components=32, n_clusters=8).fit(corpus[:500])
+    components = index.components.copy()
+
+    # Re-weighted columns, e.g. after an IDF refresh
+    reweighted = corpus @ diags(np.linspace(0.5, 2.0, 200))
+    index = index.reweighted(reweighted)
+
+    assert (index.components == components).all() and index.n_fitted == 500 and len(index) == 600
+    indices, scores = index.top_k(queries, 5, n_probe=8, rerank=600)
+    expected_indices, expected_scores = top_k_similarities(queries, reweighted, 5)
+    assert (indices == expected_indices).all()
+    assert np.allclose(scores, expected_scores)
+
+
+def test_normalized_corpus_is_rescored_as_stored():
+    corpus = normalize(sparse_random(300, 100, density=0.1, format='csr', random_state=10, dtype=np.float32))
+    queries = normalize(sparse_random(5, 100, density=0.1, format='csr', random_state=11, dtype=np.float32))
+    index = LsaIndex(n_components=16, n_clusters=4, normalized=True).fit(corpus)
+
+    indices, scores = index.top_k(queries, 5, n_probe=4, rerank=300)
+    expected = (queries @ corpus.T).toarray()
+    assert np.array_equal(scores, np.take_along_axis(expected, indices, axis=1))
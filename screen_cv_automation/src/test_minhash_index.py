@@ -0,0 +1,44 @@
+"""
+Tests for MinHash/LSH near-duplicate detection
+Run from the screen_cv_automation folder: python -m pytest src/test_minhash_index.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.minhash_index import MinHashIndex
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_near_duplicates_are_found_and_others_are_not():
+    rng = np.random.default_rng(0)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    documents = [list(rng.choice(vocabulary, 300)) for _ in range(50)]
+    index = MinHashIndex()
+    for i, tokens in enumerate(documents):
+        index.add(f"D{i}", index.signature(' '.join(tokens)))
+
+    # A resubmission with a few words edited matches its original only
+    edited = list(documents[7])
+    edited[100:104] = ['updated', 'phone', 'number', 'here']
+    matches = index.query(index.signature(' '.join(edited)))
+    assert [doc_id for doc_id, _ in matches] == ['D7']
+    assert 0.8 <= matches[0][1] < 1.0
+
+    assert index.query(index.signature(' '.join(rng.choice(vocabulary, 300)))) == []
+    assert index.signature('') is None and index.query(None) == []
+
+
+def test_batch_mode_on_cleaned_corpus():
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'cvs_cleaned.csv'))
+    index = MinHashIndex()
+    duplicates = index.find_duplicates(cvs['candidate_id'].tolist(), cvs['cleaned_text'].tolist())
+
+    # Identical texts map to their first occurrence; only kept CVs are indexed
+    first = cvs.groupby('cleaned_text')['candidate_id'].transform('first')
+    expected = {cid: kept for cid, kept in zip(cvs['candidate_id'], first) if cid != kept}
+    assert {cid: kept for cid, (kept, _) in duplicates.items()} == expected
+    assert len(index) == cvs['cleaned_text'].nunique()
@@ -0,0 +1,156 @@
+"""
+Tests for parallel document parsing
+Run from the screen_cv_automation folder: python -m pytest src/test_parse_many.py
+"""
+
+import io
+import os
+import signal
+import time
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate
+
+from src.create_sample_docs import create_sample_cv_docx, create_sample_cv_pdf, create_sample_cv_txt
+from src.document_parser import DocumentParser
+
+
+def test_results_in_order_with_per_file_errors(tmp_path):
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"cv_{i}.txt"
+        path.write_text(f"Skills: Python {i}\n\nExperience: {i} years")
+        paths.append(str(path))
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    paths.insert(2, str(broken))
+    paths.append(str(tmp_path / "notes.odt"))
+
+    parser = DocumentParser()
+    results = parser.parse_many(paths, workers=3)
+
+    assert [result['path'] for result in results] == paths
+    assert 'Error parsing PDF' in results[2]['error']
+    assert 'Unsupported file format' in results[-1]['error']
+
+    expected = parser.parse_file(paths[0])
+    assert results[0]['text'] == expected
+    assert results[0]['sections'] == parser.extract_sections(expected)
+
+
+def test_slow_file_times_out_alone(tmp_path, monkeypatch):
+    original = DocumentParser.parse_txt
+
+    def parse_txt(self, file_path):
+        if file_path.endswith('slow.txt'):
+            time.sleep(30)
+        return original(self, file_path)
+
+    # Worker processes are forked, so they inherit the patched method
+    monkeypatch.setattr(DocumentParser, 'parse_txt', parse_txt)
+    for name in ['fast.txt', 'slow.txt', 'other.txt']:
+        (tmp_path / name).write_text("Skills: SQL")
+
+    start = time.monotonic()
+    results = DocumentParser().parse_many(
+        [str(tmp_path / name) for name in ['fast.txt', 'slow.txt', 'other.txt']],
+        workers=2, timeout=1
+    )
+
+    assert time.monotonic() - start < 10
+    assert 'timed out' in results[1]['error']
+    assert results[0]['text'] == results[2]['text'] == 'Skills: SQL'
+
+
+def test_memory_hog_fails_alone(tmp_path, monkeypatch):
+    original = DocumentParser.parse_txt
+
+    def parse_txt(self, file_path):
+        if file_path.endswith('hog.txt'):
+            bytearray(1024 * 2 ** 20)
+        return original(self, file_path)
+
+    monkeypatch.setattr(DocumentParser, 'parse_txt', parse_txt)
+    for name in ['hog.txt', 'ok.txt']:
+        (tmp_path / name).write_text("Skills: SQL")
+
+    results = DocumentParser().parse_many(
+        [str(tmp_path / 'hog.txt'), str(tmp_path / 'ok.txt')],
+        workers=1, max_memory=64 * 2 ** 20
+    )
+
+    assert 'Memory limit of 64MB exceeded' in results[0]['error']
+    assert results[1]['text'] == 'Skills: SQL'
+
+
+def test_cpu_limit_and_worker_recycling(tmp_path, monkeypatch):
+    def parse_txt(self, file_path):
+        if file_path.endswith('spin.txt'):
+            while True:
+                pass
+        return str(os.getpid())
+
+    monkeypatch.setattr(DocumentParser, 'parse_txt', parse_txt)
+    paths = [str(tmp_path / name) for name in ['a.txt', 'spin.txt', 'b.txt']]
+
+    results = DocumentParser().parse_many(paths, workers=1, timeout=30,
+                                          max_cpu_seconds=1, tasks_per_worker=1)
+
+    assert 'CPU time limit of 1s exceeded' in results[1]['error']
+    assert results[0]['text'] != results[2]['text']
+
+
+def test_killed_worker_fails_only_its_file(tmp_path, monkeypatch):
+    original = DocumentParser.parse_txt
+
+    def parse_txt(self, file_path):
+        if file_path.endswith('killed.txt'):
+            os.kill(os.getpid(), signal.SIGKILL)
+        return original(self, file_path)
+
+    monkeypatch.setattr(DocumentParser, 'parse_txt', parse_txt)
+    names = ['a.txt', 'killed.txt', 'b.txt', 'c.txt']
+    for name in names:
+        (tmp_path / name).write_text("Skills: SQL")
+
+    # The batch goes on with a replacement worker instead of waiting for the overall deadline
+    start = time.monotonic()
+    results = DocumentParser().parse_many([str(tmp_path / name) for name in names], workers=1, timeout=60)
+
+    assert time.monotonic() - start < 10
+    assert results[1]['error'] == 'Parse worker died'
+    assert [results[i]['text'] for i in (0, 2, 3)] == ['Skills: SQL'] * 3
+
+
+def test_pdf_page_limit(tmp_path):
+    path = str(tmp_path / 'long.pdf')
+    story = []
+    for i in range(5):
+        story += [Paragraph(f"Page {i} Skills: Python", getSampleStyleSheet()['Normal']), PageBreak()]
+    SimpleDocTemplate(path, pagesize=letter).build(story)
+
+    results = DocumentParser(max_pages=3).parse_many([path], workers=1)
+    assert '5 pages, the limit is 3' in results[0]['error']
+    assert 'Page 4' in DocumentParser(max_pages=5).parse_file(path)
+
+
+def test_parsing_from_memory_matches_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    create_sample_cv_docx()
+    create_sample_cv_txt()
+    create_sample_cv_pdf()
+    paths = ['sample_cv.docx', 'sample_cv.txt', 'sample_cv.pdf']
+    contents = [open(path, 'rb').read() for path in paths]
+    parser = DocumentParser()
+
+    for path, content in zip(paths, contents):
+        expected = parser.parse_file(path)
+        assert parser.parse_file(path, content) == expected
+        assert parser.parse_file(path, io.BytesIO(content)) == expected
+
+    # Only the extensions of the paths are used; nothing is read from disk
+    names = [os.path.join('missing', path) for path in paths]
+    results = parser.parse_many(names, contents=contents, workers=2)
+    assert [result['path'] for result in results] == names
+    assert [result['text'] for result in results] == [parser.parse_file(path) for path in paths]
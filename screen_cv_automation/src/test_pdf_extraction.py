@@ -0,0 +1,64 @@
+"""
+Tests for streaming page-by-page PDF extraction
+Run from the screen_cv_automation folder: python -m pytest src/test_pdf_extraction.py
+"""
+
+import pdfplumber
+
+from src.create_sample_docs import create_sample_cv_pdf
+from src.document_parser import DocumentParser
+
+
+def test_budgets_stop_extraction_early(tmp_path):
+    path = str(tmp_path / 'cv.pdf')
+    create_sample_cv_pdf(path, pages=6)
+    parser = DocumentParser()
+
+    pages = list(parser.iter_pdf_pages(path))
+    assert len(pages) == 6 and all(f'Page {i + 1}' in page for i, page in enumerate(pages))
+    full = parser.parse_pdf(path)
+    assert full == parser.clean_extracted_text(''.join(page + '\n' for page in pages))
+
+    first_two = DocumentParser(page_budget=2).parse_pdf(path)
+    assert 'Page 2' in first_two and 'Page 3' not in first_two
+    assert full.startswith(first_two)
+
+    cut = DocumentParser(char_budget=500).parse_pdf(path)
+    assert full.startswith(cut) and len(cut) <= 500
+
+
+def test_fallback_is_chosen_per_page(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cv.pdf')
+    create_sample_cv_pdf(path, pages=3)
+    original = pdfplumber.page.Page.extract_text
+
+    # Page 2 looks like a scan to pdfplumber; the other pages still come from it
+    def extract_text(self, **kwargs):
+        return None if self.page_number == 2 else original(self, **kwargs)
+
+    monkeypatch.setattr(pdfplumber.page.Page, 'extract_text', extract_text)
+    pages = list(DocumentParser().iter_pdf_pages(path))
+
+    assert [f'Page {i + 1}' in page for i, page in enumerate(pages)] == [True, True, True]
+    with pdfplumber.open(path) as pdf:
+        assert pages[0] == original(pdf.pages[0])
+
+
+def test_page_budget_extracts_no_extra_page(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cv.pdf')
+    create_sample_cv_pdf(path, pages=6)
+    original = pdfplumber.page.Page.extract_text
+    extracted = []
+
+    def extract_text(self, **kwargs):
+        extracted.append(self.page_number)
+        return original(self, **kwargs)
+
+    monkeypatch.setattr(pdfplumber.page.Page, 'extract_text', extract_text)
+
+    DocumentParser(page_budget=2).parse_pdf(path)
+    assert extracted == [1, 2]
+
+    extracted.clear()
+    DocumentParser(char_budget=1).parse_pdf(path)
+    assert extracted == [1]
@@ -0,0 +1,34 @@
+"""
+Tests for reverse matching (top jobs for a candidate)
+Run from the screen_cv_automation folder: python -m pytest src/test_recommend_jobs.py
+"""
+
+import os
+
+import pandas as pd
+
+from src.recommendation_pipeline import CandidateRecommendationPipeline
+from src.vector_store import VectorStore
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_recommend_jobs_matches_candidate_scores():
+    pipeline = CandidateRecommendationPipeline(vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'))
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'cvs_cleaned.csv'))
+    jobs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'jobs_cleaned.csv'))
+
+    cv_store = VectorStore()
+    cv_store.append(cvs['candidate_id'].tolist(), pipeline.vectorize_cvs(cvs))
+    job_store = VectorStore()
+    job_store.append(jobs['job_id'].tolist(), pipeline.vectorize_jobs(jobs))
+
+    # Same pairs, same scores as the job-centric ranking of every CV
+    all_pairs = pipeline.batch_recommend(jobs, cvs, top_n=len(cvs), cv_vectors=cv_store.matrix)
+    for candidate_id in cvs['candidate_id'].head(5):
+        expected = all_pairs[all_pairs['candidate_id'] == candidate_id]
+        expected = expected.sort_values('similarity_score', ascending=False, kind='stable')
+
+        recommendations = pipeline.recommend_jobs(candidate_id, 3, cv_store, job_store)
+        assert [rec['rank'] for rec in recommendations] == [1, 2, 3]
+        assert [rec['similarity_score'] for rec in recommendations] == expected['similarity_score'].head(3).tolist()
@@ -0,0 +1,33 @@
+"""
+Tests for the JSON-lines record store kept next to the vector stores
+Run from the screen_cv_automation folder: python -m pytest src/test_record_store.py
+"""
+
+from src.record_store import RecordStore
+
+
+def test_append_load_and_rewrite(tmp_path):
+    store = RecordStore(str(tmp_path / 'store' / 'cvs.jsonl'))
+    assert store.load() == []
+
+    store.append([{'candidate_id': 'C1', 'cv_text': 'line one\nline two'}])
+    store.append([{'candidate_id': 'C2', 'filename': None}, {'candidate_id': 'C3'}])
+    assert [record['candidate_id'] for record in RecordStore(store.path).load()] == ['C1', 'C2', 'C3']
+    assert store.load()[0]['cv_text'] == 'line one\nline two'
+
+    store.rewrite([{'candidate_id': 'C1', 'duplicate_of': 'C3'}])
+    assert store.load() == [{'candidate_id': 'C1', 'duplicate_of': 'C3'}]
+
+    store.clear()
+    assert store.load() == []
+
+
+def test_interrupted_append_is_dropped(tmp_path):
+    store = RecordStore(str(tmp_path / 'cvs.jsonl'))
+    store.append([{'candidate_id': 'C1'}])
+    with open(store.path, 'a', encoding='utf-8') as f:
+        f.write('{"candidate_id": "C2", "cv_te')
+
+    assert store.load() == [{'candidate_id': 'C1'}]
+    store.append([{'candidate_id': 'C3'}])
+    assert store.load() == [{'candidate_id': 'C1'}, {'candidate_id': 'C3'}]
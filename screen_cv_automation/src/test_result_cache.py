@@ -0,0 +1,86 @@
+"""
+Tests for the per-job similarity result cache
+Run from the screen_cv_automation folder: python -m pytest src/test_result_cache.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.lsa_index import LsaIndex
+from src.recommendation_pipeline import CandidateRecommendationPipeline
+from src.result_cache import ResultCache
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_lru_eviction_and_counters():
+    entry_bytes = 2 * 10 * 8
+    cache = ResultCache(max_bytes=2 * entry_bytes)
+    keys = [cache.key_for(f"job {i}", 1, 10) for i in range(3)]
+
+    cache.put(keys[0], np.arange(10), np.zeros(10))
+    cache.put(keys[1], np.arange(10), np.ones(10))
+    assert cache.get(keys[0]) is not None  # keys[1] is now least recently used
+    cache.put(keys[2], np.arange(10), np.ones(10))
+
+    assert cache.get(keys[1]) is None
+    indices, scores = cache.get(keys[0])
+    assert (indices == np.arange(10)).all() and (scores == 0).all()
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 1, 1)
+    assert stats['entries'] == 2 and stats['size_bytes'] == 2 * entry_bytes
+
+    # Same text under another corpus version or top_n is a different entry
+    assert cache.key_for("job 0", 2, 10) != keys[0]
+    assert cache.key_for("job 0", 1, 5) != keys[0]
+
+
+def test_batch_recommend_reuses_results_of_same_corpus_version():
+    cache = ResultCache()
+    pipeline = CandidateRecommendationPipeline(
+        vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'),
+        result_cache=cache
+    )
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'cvs_cleaned.csv'))
+    jobs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'jobs_cleaned.csv'))
+    expected = pipeline.batch_recommend(jobs, cvs, top_n=10)
+
+    first = pipeline.batch_recommend(jobs, cvs, top_n=10, corpus_version=1)
+    assert cache.stats()['misses'] == len(jobs) and cache.stats()['hits'] == 0
+
+    # All jobs are served from the cache, without vectorizing any CV
+    pipeline.vectorize_cvs = None
+    second = pipeline.batch_recommend(jobs, cvs, top_n=10, corpus_version=1)
+    assert cache.stats()['hits'] == len(jobs)
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(second, expected)
+
+    # A new corpus version misses again
+    del pipeline.vectorize_cvs
+    pipeline.batch_recommend(jobs.head(3), cvs, top_n=10, corpus_version=2)
+    assert cache.stats()['misses'] == len(jobs) + 3
+
+
+def test_approximate_results_are_not_cached():
+    cache = ResultCache()
+    pipeline = CandidateRecommendationPipeline(
+        vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'),
+        result_cache=cache
+    )
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'cvs_cleaned.csv'))
+    jobs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'jobs_cleaned.csv'))
+    cv_vectors = pipeline.vectorize_cvs(cvs)
+    lsa_index = LsaIndex(n_components=16, n_clusters=4, n_probe=1, rerank=1).fit(cv_vectors)
+
+    pipeline.batch_recommend(jobs, cvs, top_n=10, cv_index=lsa_index, corpus_version=1)
+    assert cache.stats()['entries'] == 0
+
+    # Exact results are cached, and then served even when the index is passed
+    expected = pipeline.batch_recommend(jobs, cvs, top_n=10, cv_vectors=cv_vectors, corpus_version=1)
+    assert cache.stats()['entries'] == len(jobs)
+    served = pipeline.batch_recommend(jobs, cvs, top_n=10, cv_index=lsa_index, corpus_version=1)
+    assert cache.stats()['hits'] == len(jobs)
+    pd.testing.assert_frame_equal(served, expected)
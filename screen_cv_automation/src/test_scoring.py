@@ -0,0 +1,119 @@
+"""
+Tests for the batched scoring engine
+Run from the screen_cv_automation folder: python -m pytest src/test_scoring.py
+"""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import random as sparse_random, vstack
+from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+from src import scoring
+from src.scoring import sharded_top_k_similarities, top_k_similarities
+from src.vector_store import VectorStore
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_blocked_top_k_matches_full_sort():
+    corpus = sparse_random(500, 40, density=0.1, format='csr', random_state=1)
+    corpus = vstack([corpus, corpus[:100]]).tocsr()  # duplicates give exact ties
+    queries = sparse_random(23, 40, density=0.2, format='csr', random_state=2)
+    scores = cosine_similarity(queries, corpus)
+
+    for k in [1, 5, 150, 1000]:
+        indices, top_scores = top_k_similarities(queries, corpus, k, query_block_size=7, corpus_block_size=64)
+        expected = np.array([np.lexsort((np.arange(len(row)), -row))[:k] for row in scores])
+
+        assert (indices == expected).all()
+        assert np.allclose(top_scores, np.take_along_axis(scores, expected, axis=1))
+
+
+def test_normalized_corpus_is_scored_as_stored():
+    corpus = normalize(sparse_random(300, 40, density=0.1, format='csr', random_state=7))
+    queries = sparse_random(11, 40, density=0.2, format='csr', random_state=8)
+
+    expected_indices, expected_scores = top_k_similarities(queries, corpus, 30)
+    indices, top_scores = top_k_similarities(queries, corpus, 30, normalized=True)
+
+    assert (indices == expected_indices).all()
+    assert np.allclose(top_scores, expected_scores)
+
+    # The flag skips the corpus normalization: unnormalized rows keep their length
+    _, doubled_scores = top_k_similarities(queries, corpus * 2, 30, normalized=True)
+    assert np.allclose(doubled_scores, 2 * expected_scores)
+
+
+def test_sharded_top_k_matches_single_process(monkeypatch):
+    monkeypatch.setattr(scoring, 'MIN_SHARD_ROWS', 100)
+    corpus = sparse_random(1000, 40, density=0.1, format='csr', random_state=3, dtype=np.float32)
+    corpus = vstack([corpus, corpus[:300]]).tocsr()  # ties across shard boundaries
+    queries = sparse_random(17, 40, density=0.2, format='csr', random_state=4, dtype=np.float32)
+
+    for k in [1, 5, 150, 2000]:
+        expected_indices, expected_scores = top_k_similarities(queries, corpus, k)
+        indices, top_scores = sharded_top_k_similarities(queries, corpus, k, workers=3)
+
+        assert (indices == expected_indices).all()
+        assert np.array_equal(top_scores, expected_scores)
+
+
+def test_scoring_pool_is_reused_across_corpora(monkeypatch, tmp_path):
+    monkeypatch.setattr(scoring, 'MIN_SHARD_ROWS', 100)
+    corpus = sparse_random(600, 40, density=0.1, format='csr', random_state=5, dtype=np.float32)
+    queries = sparse_random(9, 40, density=0.2, format='csr', random_state=6, dtype=np.float32)
+    expected_indices, expected_scores = top_k_similarities(queries, corpus, 20)
+
+    store = VectorStore(path=str(tmp_path / 'cvs'))
+    store.append([str(i) for i in range(corpus.shape[0])], corpus)
+    stored = VectorStore.load(str(tmp_path / 'cvs'), mmap_mode='r').matrix
+    stored_arrays = (stored.data, stored.indices, stored.indptr)
+    assert all(spec[0] == 'file' for spec in map(scoring.file_spec, stored_arrays))
+
+    try:
+        # Memory-mapped store files, then a kept shared copy, all on the same workers
+        pool = None
+        for vectors, corpus_key in [(stored, None), (corpus, 'v1'), (corpus, 'v1')]:
+            indices, top_scores = sharded_top_k_similarities(queries, vectors, 20, workers=3, corpus_key=corpus_key)
+            assert (indices == expected_indices).all()
+            assert np.array_equal(top_scores, expected_scores)
+            assert pool is None or scoring.get_scoring_pool(3) is pool
+            pool = scoring.get_scoring_pool(3)
+        assert scoring._shared_corpus[0][0] == 'v1'
+    finally:
+        scoring.shutdown_scoring_pool()
+    assert scoring._shared_corpus is None
+
+
+def test_float32_rankings_match_top_candidates():
+    with open(os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'), 'rb') as f:
+        vectorizer = pickle.load(f)
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'cvs_cleaned.csv'))
+    jobs = pd.read_csv(os.path.join(BASE_DIR, 'results', 'jobs_cleaned.csv'))
+    expected = pd.read_csv(os.path.join(BASE_DIR, 'results', 'top_candidates.csv'))
+
+    cv_vectors = vectorizer.transform(cvs['cleaned_text'].fillna(''))
+    job_vectors = vectorizer.transform(jobs['cleaned_text'].fillna(''))
+
+    indices64, scores64 = top_k_similarities(job_vectors, cv_vectors, len(cvs))
+    indices32, scores32 = top_k_similarities(job_vectors.astype(np.float32), cv_vectors.astype(np.float32), len(cvs))
+
+    assert scores32.dtype == np.float32
+    assert (indices32 == indices64).all()
+    assert np.allclose(scores32, scores64, atol=1e-6)
+
+    # Same top 5 scores per job as results/top_candidates.csv; tied candidates may
+    # come in a different order, but every listed candidate has the expected score
+    position_by_id = dict(zip(cvs['candidate_id'], range(len(cvs))))
+    for job_idx, job_id in enumerate(jobs['job_id']):
+        job_expected = expected[expected['job_id'] == job_id].sort_values('rank')
+        top_scores = [round(float(s), 4) for s in scores32[job_idx, :len(job_expected)]]
+        assert top_scores == job_expected['similarity_score'].tolist()
+
+        all_scores = cosine_similarity(job_vectors[job_idx].astype(np.float32), cv_vectors.astype(np.float32))[0]
+        for candidate_id, score in zip(job_expected['candidate_id'], job_expected['similarity_score']):
+            assert round(float(all_scores[position_by_id[candidate_id]]), 4) == score
@@ -0,0 +1,100 @@
+"""
+Tests for weighted per-section scoring
+Run from the screen_cv_automation folder: python -m pytest src/test_section_scores.py
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.recommendation_pipeline import CandidateRecommendationPipeline, CV_SECTION_FIELDS, JOB_SECTION_FIELDS
+from src.section_scores import SectionScores, block_scores
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def test_weighted_scores_combine_section_similarities():
+    pipeline = CandidateRecommendationPipeline(vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'))
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'data', 'cvs_100.csv')).fillna('').to_dict('records')
+    jobs = pd.read_csv(os.path.join(BASE_DIR, 'data', 'jobs_10.csv')).fillna('').to_dict('records')
+
+    cv_sections = pipeline.vectorize_sections(cvs, CV_SECTION_FIELDS)
+    job_sections = pipeline.vectorize_sections(jobs, JOB_SECTION_FIELDS)
+    assert cv_sections['skills'].shape[0] == len(cvs)
+
+    # Each section is cleaned and vectorized on its own
+    expected_skills = pipeline.vectorize_text(pipeline.clean_text(jobs[3]['required_skills']))
+    assert np.allclose(job_sections['skills'][3].toarray(), expected_skills.toarray())
+
+    scores = SectionScores([job['job_id'] for job in jobs], job_sections, cv_sections)
+    weights = {'skills': 3, 'experience': 1}
+    expected = (0.75 * cosine_similarity(job_sections['skills'], cv_sections['skills'])
+                + 0.25 * cosine_similarity(job_sections['experience'], cv_sections['experience']))
+    assert np.allclose(scores.combine(weights), expected, atol=1e-6)
+
+    # Top k of a subset of jobs, ordered by score then CV index
+    job_ids = [jobs[5]['job_id'], jobs[0]['job_id']]
+    indices, top_scores = scores.top_k(weights, 10, job_ids)
+    for row, job_idx in enumerate([5, 0]):
+        combined = scores.combine(weights)[job_idx]
+        assert (indices[row] == np.lexsort((np.arange(len(combined)), -combined))[:10]).all()
+        assert np.array_equal(top_scores[row], combined[indices[row]])
+
+    with pytest.raises(ValueError):
+        scores.combine({'hobbies': 1})
+    with pytest.raises(ValueError):
+        scores.combine({'skills': 0})
+
+
+def test_cleaned_sections_join_to_the_cleaned_document():
+    pipeline = CandidateRecommendationPipeline(vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'))
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'data', 'cvs_100.csv')).fillna('').to_dict('records')
+    cvs[0]['experience'] = ''
+
+    cleaned = pipeline.clean_sections(cvs, CV_SECTION_FIELDS)
+    for cv, cleaned_sections in zip(cvs, cleaned):
+        expected = pipeline.process_cv(cv['skills'], cv['experience'], cv['education'], cv['cv_text'])
+        assert pipeline.join_sections(cleaned_sections) == expected
+
+    # Cleaned sections are vectorized as they are, not cleaned again
+    records = [dict(cv, cleaned_sections=sections) for cv, sections in zip(cvs, cleaned)]
+    records[1]['cleaned_sections'] = dict(cleaned[1], skills='python')
+    vectors = pipeline.vectorize_sections(records, CV_SECTION_FIELDS)
+    expected = pipeline.vectorize_sections(cvs, CV_SECTION_FIELDS)
+    assert np.allclose(vectors['full_text'].toarray(), expected['full_text'].toarray())
+    assert np.allclose(vectors['skills'][1].toarray(), pipeline.vectorize_text('python').toarray())
+
+
+def test_added_cvs_and_jobs_match_a_rebuild():
+    pipeline = CandidateRecommendationPipeline(vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'))
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'data', 'cvs_100.csv')).fillna('').to_dict('records')
+    jobs = pd.read_csv(os.path.join(BASE_DIR, 'data', 'jobs_10.csv')).fillna('').to_dict('records')
+    cv_sections = pipeline.vectorize_sections(cvs, CV_SECTION_FIELDS)
+    job_sections = pipeline.vectorize_sections(jobs, JOB_SECTION_FIELDS)
+    job_ids = [job['job_id'] for job in jobs]
+
+    def rows(sections, start, end):
+        return {section: vectors[start:end] for section, vectors in sections.items()}
+
+    scores = SectionScores(job_ids[:3], rows(job_sections, 0, 3), rows(cv_sections, 0, 40))
+    for start, end, job_start, job_end in [(40, 41, 3, 4), (41, 70, 4, 4), (70, 100, 4, 10)]:
+        scores.add_cvs(rows(cv_sections, start, end))
+        scores.add_jobs(job_ids[job_start:job_end], rows(job_sections, job_start, job_end),
+                        rows(cv_sections, 0, end))
+
+    expected = SectionScores(job_ids, job_sections, cv_sections)
+    assert len(scores) == len(jobs) and scores.n_cvs == len(cvs)
+    for section, matrix in expected.matrices.items():
+        assert np.allclose(scores.matrices[section], matrix, atol=1e-6)
+        assert np.allclose(matrix, cosine_similarity(job_sections[section], cv_sections[section]), atol=1e-6)
+
+    # Small blocks give the same scores
+    out = np.zeros((len(jobs), len(cvs)), dtype=np.float32)
+    block_scores(job_sections['skills'], cv_sections['skills'], out, query_block_size=3, corpus_block_size=7)
+    assert np.allclose(out, expected.matrices['skills'], atol=1e-6)
+
+    with pytest.raises(ValueError):
+        scores.add_jobs(['extra'], rows(job_sections, 0, 1), rows(cv_sections, 0, 99))
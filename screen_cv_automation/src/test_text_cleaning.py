@@ -0,0 +1,139 @@
+"""
+Parity and cold-start tests for the fast text cleaning path
+Run from the screen_cv_automation folder: python -m pytest src/test_text_cleaning.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+import nltk
+import pandas as pd
+
+from src.text_cleaning import clean_text, tokenize, SPLIT_WORDS
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def reference_clean_text(text):
+    """Original clean_text: nltk.word_tokenize and an uncached lemmatizer"""
+    from nltk.corpus import stopwords
+    from nltk.stem import WordNetLemmatizer
+
+    if pd.isna(text) or text == "":
+        return ""
+    text = str(text).lower()
+    text = re.sub(r'[^a-z\s]', '', text)
+    words = nltk.word_tokenize(text)
+    words = [w for w in words if w not in set(stopwords.words('english'))]
+    words = [WordNetLemmatizer().lemmatize(w) for w in words]
+    return ' '.join(words)
+
+
+def combine(df, columns):
+    """Combine text fields the same way as preprocessing.py"""
+    combined = df[columns[0]].fillna('')
+    for column in columns[1:]:
+        combined = combined + ' ' + df[column].fillna('')
+    return combined
+
+
+def test_tokenize_matches_word_tokenize():
+    text = 'we cannot gonna wanna gotta lemme gimme cannoteer  canot\tpython\nsql wanna'
+    assert tokenize(text) == nltk.word_tokenize(text)
+    for word in SPLIT_WORDS:
+        assert tokenize(word) == nltk.word_tokenize(word)
+
+
+def test_cvs_match_training_output():
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'data', 'cvs_100.csv'))
+    expected = pd.read_csv(os.path.join(BASE_DIR, 'results', 'cvs_cleaned.csv'))
+    combined = combine(cvs, ['skills', 'experience', 'education', 'cv_text'])
+
+    cleaned = [clean_text(text) for text in combined]
+
+    assert cleaned == expected['cleaned_text'].fillna('').tolist()
+    assert cleaned == [reference_clean_text(text) for text in combined]
+
+
+def test_jobs_match_training_output():
+    jobs = pd.read_csv(os.path.join(BASE_DIR, 'data', 'jobs_10.csv'))
+    expected = pd.read_csv(os.path.join(BASE_DIR, 'results', 'jobs_cleaned.csv'))
+    combined = combine(jobs, ['required_skills', 'experience_required', 'education_required', 'job_description'])
+
+    cleaned = [clean_text(text) for text in combined]
+
+    assert cleaned == expected['cleaned_text'].fillna('').tolist()
+
+
+def test_sample_docs_match_reference(tmp_path, monkeypatch):
+    from src import create_sample_docs
+    from src.document_parser import DocumentParser
+
+    monkeypatch.chdir(tmp_path)
+    create_sample_docs.create_sample_cv_docx()
+    create_sample_docs.create_sample_job_docx()
+    create_sample_docs.create_sample_cv_txt()
+    create_sample_docs.create_sample_job_txt()
+
+    parser = DocumentParser()
+    for filename in ['sample_cv.docx', 'sample_job.docx', 'sample_cv.txt', 'sample_job.txt']:
+        text = parser.parse_file(filename)
+        sections = parser.extract_sections(text)
+        combined = f"{sections['skills']} {sections['experience']} {sections['education']} {sections['full_text']}"
+        assert clean_text(combined) == reference_clean_text(combined), filename
+
+
+def test_empty_and_missing_text():
+    assert clean_text('') == ''
+    assert clean_text(None) == ''
+    assert clean_text(float('nan')) == ''
+    assert clean_text('123 !!!') == ''
+
+
+def test_cold_start_is_offline_and_fast(tmp_path):
+    # Fresh interpreter with no NLTK data available: cleaning must not need NLTK at all
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "from src.text_cleaning import clean_text\n"
+        "cleaned = clean_text('Senior engineers with Python skills')\n"
+        "print(time.perf_counter() - start, 'nltk' in sys.modules, cleaned)\n"
+    )
+    env = dict(os.environ, NLTK_DATA=str(tmp_path))
+    result = subprocess.run([sys.executable, '-c', code], cwd=BASE_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+
+    elapsed, nltk_loaded, cleaned = result.stdout.split(maxsplit=2)
+    print(f"Cold start (import + first clean_text): {float(elapsed) * 1000:.1f} ms")
+    assert nltk_loaded == 'False'
+    assert cleaned.strip() == 'senior engineer python skill'
+    assert float(elapsed) < 1.0
+
+
+def test_pooled_cleaning_matches_inline(monkeypatch):
+    from src import recommendation_pipeline
+    from src.recommendation_pipeline import CandidateRecommendationPipeline
+
+    cvs = pd.read_csv(os.path.join(BASE_DIR, 'data', 'cvs_100.csv'))
+    combined = combine(cvs, ['skills', 'experience', 'education', 'cv_text']).tolist()
+    texts = combined + ['', None, '123 !!!']
+    pipeline = CandidateRecommendationPipeline(vectorizer_path=os.path.join(BASE_DIR, 'models', 'vectorizer.pkl'))
+
+    inline = pipeline.clean_texts(texts, workers=1)
+
+    # Force the process pool even for this small batch
+    monkeypatch.setattr(recommendation_pipeline, 'MIN_CHARS_PER_WORKER', 1)
+    try:
+        pooled = pipeline.clean_texts(texts, workers=2, chunksize=7)
+        pool = recommendation_pipeline._cleaning_pool
+        assert pool is not None
+        # The pool is kept for the next batch instead of being restarted
+        assert pipeline.clean_texts(texts, workers=2) == pooled
+        assert recommendation_pipeline._cleaning_pool is pool
+    finally:
+        recommendation_pipeline.shutdown_cleaning_pool()
+
+    assert pooled == inline
+    assert inline == [clean_text(text) for text in texts]
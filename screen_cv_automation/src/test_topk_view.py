@@ -0,0 +1,50 @@
+"""
+Tests for the materialized per-job top-k view
+Run from the screen_cv_automation folder: python -m pytest src/test_topk_view.py
+"""
+
+import numpy as np
+from scipy.sparse import random as sparse_random, vstack
+
+from src.scoring import top_k_similarities
+from src.topk_view import TopKView
+
+
+def test_incremental_updates_match_full_scoring():
+    cvs = sparse_random(600, 40, density=0.1, format='csr', random_state=1, dtype=np.float32)
+    cvs = vstack([cvs, cvs[:200]]).tocsr()  # ties between old and new CVs
+    jobs = sparse_random(12, 40, density=0.2, format='csr', random_state=2, dtype=np.float32)
+    view = TopKView(k=25)
+
+    # Jobs before any CV, CVs in batches, then more jobs and more CVs
+    view.add_jobs([f"J{i}" for i in range(5)], jobs[:5], cvs[:0])
+    for start, end in [(0, 100), (100, 101), (101, 500)]:
+        view.add_cvs(cvs[start:end])
+    view.add_jobs([f"J{i}" for i in range(5, 12)], jobs[5:], cvs[:500])
+    view.add_cvs(cvs[500:])
+
+    expected_indices, expected_scores = top_k_similarities(jobs, cvs, 25)
+    indices, scores = view.top([f"J{i}" for i in range(12)], 25)
+    assert (indices == expected_indices).all()
+    assert np.array_equal(scores, expected_scores)
+
+    # Reads of a subset of jobs / a shorter list
+    indices, _ = view.top(['J7', 'J2'], 3)
+    assert (indices == expected_indices[[7, 2], :3]).all()
+
+    # Beyond the kept k, or for an unknown job, the caller has to compute
+    assert view.top(['J1'], 26) is None
+    assert view.top(['J99'], 5) is None
+
+
+def test_rebuild_and_clear():
+    cvs = sparse_random(50, 40, density=0.1, format='csr', random_state=3)
+    jobs = sparse_random(3, 40, density=0.2, format='csr', random_state=4)
+    view = TopKView(k=100)
+
+    view.rebuild(['A', 'B', 'C'], jobs, cvs)
+    indices, _ = view.top(['B'], 100)
+    assert indices.shape == (1, 50)  # the whole (small) corpus is ranked
+
+    view.clear()
+    assert len(view) == 0 and view.n_cvs == 0
@@ -0,0 +1,82 @@
+"""
+Tests for the memory-mapped vector store format
+Run from the screen_cv_automation folder: python -m pytest src/test_vector_store.py
+"""
+
+import numpy as np
+import pytest
+from scipy.sparse import random as sparse_random, vstack
+from sklearn.preprocessing import normalize
+
+from src.vector_store import VectorStore
+
+
+def make_vectors(n_rows, seed):
+    return sparse_random(n_rows, 42, density=0.2, format='csr', random_state=seed)
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+    vectors = make_vectors(50, seed=0)
+    store = VectorStore()
+    store.append([f"C{i}" for i in range(50)], vectors)
+    store.save(str(tmp_path / 'cv_vectors'))
+
+    loaded = VectorStore.load(str(tmp_path / 'cv_vectors'), mmap_mode='r')
+
+    assert loaded.ids == store.ids
+    assert (loaded.matrix != vectors).nnz == 0
+    assert not loaded.matrix.data.flags.owndata
+    assert (loaded.rows(['C7', 'C3']) != vectors[[7, 3]]).nnz == 0
+    # The .npy files stay readable with plain numpy
+    assert np.load(str(tmp_path / 'cv_vectors' / 'indptr.npy')).shape == (51,)
+
+
+def test_append_without_rewrite(tmp_path):
+    path = str(tmp_path / 'cv_vectors')
+    first, second = make_vectors(30, seed=1), make_vectors(20, seed=2)
+
+    store = VectorStore(path=path)
+    store.append([f"A{i}" for i in range(30)], first)
+    data_inode = (tmp_path / 'cv_vectors' / 'data.npy').stat().st_ino
+
+    VectorStore.load(path).append([f"B{i}" for i in range(20)], second)
+    loaded = VectorStore.load(path)
+
+    assert (tmp_path / 'cv_vectors' / 'data.npy').stat().st_ino == data_inode
+    assert len(loaded) == 50
+    assert loaded.ids[29:31] == ['A29', 'B0']
+    assert (loaded.matrix != vstack([first, second])).nnz == 0
+
+
+def test_mapped_rows_survive_a_rewrite(tmp_path):
+    path = str(tmp_path / 'cv_vectors')
+    vectors = make_vectors(30, seed=3)
+    store = VectorStore(path=path)
+    store.append([f"A{i}" for i in range(30)], vectors)
+    mapped = store.matrix
+    before = mapped.toarray()
+
+    # Re-weighting and clearing replace the files; arrays mapped from the old ones stay valid
+    store.rescale_columns(np.full(42, 2.0))
+    # The rescaled rows are mapped from the new files, not kept in memory
+    assert not store.matrix.data.flags.owndata
+    assert np.allclose(store.matrix.toarray(), normalize(vectors).toarray())
+    store.clear()
+
+    assert np.array_equal(mapped.toarray(), before)
+    assert len(VectorStore.load(path)) == 0
+
+    # The emptied store takes the dtype of the next rows
+    store.append(['B0'], vectors[:1].astype(np.float32))
+    assert VectorStore.load(path).matrix.dtype == np.float32
+
+
+def test_rejects_unknown_format_version(tmp_path):
+    path = str(tmp_path / 'cv_vectors')
+    VectorStore(path=path).append(['C1'], make_vectors(1, seed=3))
+    manifest = VectorStore.read_manifest(path)
+    manifest['version'] = 99
+    VectorStore.write_manifest(path, manifest)
+
+    with pytest.raises(ValueError):
+        VectorStore.load(path)
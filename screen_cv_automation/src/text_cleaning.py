@@ -0,0 +1,139 @@
+"""
+text_cleaning.py
+Shared text cleaning used for training (preprocessing.py) and at runtime
+(recommendation_pipeline.py)
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+# Bump whenever a change alters the cleaned output (part of the document cache key)
+CLEANER_VERSION = 1
+
+# NLTK English stopword list, bundled so cleaning never needs NLTK data or network access
+STOP_WORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours
+yourself yourselves he him his himself she she's her hers herself it it's its
+itself they them their theirs themselves what which who whom this that that'll
+these those am is are was were be been being have has had having do does did
+doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down in
+out on off over under again further then once here there when where why how all
+any both each few more most other some such no nor not only own same so than too
+very s t can will just don don't should should've now d ll m o re ve y ain aren
+aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn hasn't haven
+haven't isn isn't ma mightn mightn't mustn mustn't needn needn't shan shan't
+shouldn shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+""".split())
+
+# Precompiled WordNet noun lemmas (built by build_lemma_table.py)
+LEMMA_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models', 'lemma_table.json')
+
+# Maximum number of distinct words kept in the lemma cache
+LEMMA_CACHE_SIZE = 100000
+
+NON_LETTERS = re.compile(r'[^a-z\s]')
+
+# Words nltk.word_tokenize splits even when the text has no punctuation
+# (Treebank contraction rules that do not need an apostrophe)
+SPLIT_WORDS = {
+    'cannot': ['can', 'not'],
+    'gimme': ['gim', 'me'],
+    'gonna': ['gon', 'na'],
+    'gotta': ['got', 'ta'],
+    'lemme': ['lem', 'me'],
+    'wanna': ['wan', 'na'],
+}
+
+
+def tokenize(text):
+    """
+    Fast tokenizer for text already reduced to lowercase letters and whitespace
+
+    Gives the same tokens as nltk.word_tokenize on such text: a whitespace
+    split, plus the contraction splits listed in SPLIT_WORDS.
+
+    Args:
+        text: Text containing only [a-z] and whitespace
+
+    Returns:
+        List of tokens
+    """
+    words = []
+    for word in text.split():
+        split = SPLIT_WORDS.get(word)
+        if split:
+            words.extend(split)
+        else:
+            words.append(word)
+    return words
+
+
+@lru_cache(maxsize=1)
+def load_lemma_table():
+    """
+    Load the precompiled lemma table on first use
+
+    Falls back to NLTK's WordNetLemmatizer (imported lazily, never downloaded)
+    when the table has not been built.
+
+    Returns:
+        dict mapping words to their lemma (only words whose lemma differs), or None
+    """
+    try:
+        with open(LEMMA_TABLE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)['lemmas']
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def load_wordnet_lemmatizer():
+    """Load NLTK's WordNet lemmatizer (only used when the lemma table is missing)"""
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def lemmatize(word):
+    """Lemmatize a single word (memoized, the vocabulary is small and repetitive)"""
+    lemmas = load_lemma_table()
+    if lemmas is None:
+        return load_wordnet_lemmatizer().lemmatize(word)
+    return lemmas.get(word, word)
+
+
+def init_worker():
+    """Load cleaning resources once in a worker process (used as a process pool initializer)"""
+    lemmatize('initialization')
+
+
+def clean_text(text):
+    """
+    Clean and preprocess text
+
+    Steps:
+    1. Convert to lowercase
+    2. Remove punctuation and numbers
+    3. Tokenize
+    4. Remove stopwords
+    5. Lemmatize
+    """
+    if pd.isna(text) or text == "":
+        return ""
+
+    # Lowercase
+    text = str(text).lower()
+
+    # Remove punctuation and numbers
+    text = NON_LETTERS.sub('', text)
+
+    # Tokenize, remove stopwords and lemmatize
+    words = [lemmatize(w) for w in tokenize(text) if w not in STOP_WORDS]
+
+    # Join back into string
+    return ' '.join(words)
@@ -0,0 +1,131 @@
+"""
+topk_view.py
+Materialized top-k candidates per job, maintained as CVs and jobs arrive
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+
+from src.scoring import sharded_top_k_similarities
+
+
+class TopKView:
+    """
+    The k best CVs of every job, kept up to date incrementally
+
+    New CVs are scored against all jobs and merged into each job's list; a new
+    job is scored once against all CVs. Reads are then a lookup instead of
+    scoring the whole corpus. Ordering matches scoring.top_k_similarities
+    (descending score, ties by lower CV index), so a merged list is identical
+    to one computed from scratch.
+    """
+
+    def __init__(self, k=100, workers=None, normalized=False):
+        """
+        Initialize an empty view
+
+        Args:
+            k: Number of candidates kept per job
+            workers: Processes used when scoring large CV sets
+            normalized: CV vectors are passed L2-normalized (e.g. from a VectorStore)
+                        and scored as they are
+        """
+        self.k = k
+        self.workers = workers
+        self.normalized = normalized
+        self.clear()
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def clear(self):
+        """Forget all jobs and CVs"""
+        self.job_ids = []
+        self.positions = {}
+        self.job_vectors = None
+        self.n_cvs = 0
+        self.indices = np.zeros((0, 0), dtype=np.int64)
+        self.scores = np.zeros((0, 0), dtype=np.float32)
+
+    def rebuild(self, job_ids, job_vectors, cv_vectors):
+        """
+        Recompute every list from scratch, e.g. after the IDF weights changed
+
+        Args:
+            job_ids: List of job IDs (one per row of job_vectors)
+            job_vectors: Job vectors (sparse matrix, None when there are no jobs)
+            cv_vectors: All CV vectors (sparse matrix)
+        """
+        self.clear()
+        self.n_cvs = cv_vectors.shape[0]
+        self.add_jobs(job_ids, job_vectors, cv_vectors)
+
+    def add_jobs(self, job_ids, job_vectors, cv_vectors):
+        """
+        Score new jobs against all CVs and add their lists
+
+        Args:
+            job_ids: List of job IDs (one per row of job_vectors)
+            job_vectors: Vectors of the new jobs (sparse matrix)
+            cv_vectors: All CV vectors, as counted by the view (sparse matrix)
+        """
+        if cv_vectors.shape[0] != self.n_cvs:
+            raise ValueError(f"View covers {self.n_cvs} CVs, got {cv_vectors.shape[0]}")
+        if len(job_ids) == 0:
+            return
+
+        indices, scores = sharded_top_k_similarities(job_vectors, cv_vectors, self.k, workers=self.workers,
+                                                     normalized=self.normalized)
+
+        if self.job_ids:
+            self.indices = np.vstack([self.indices, indices])
+            self.scores = np.vstack([self.scores, scores])
+            self.job_vectors = vstack([self.job_vectors, csr_matrix(job_vectors)], format='csr')
+        else:
+            self.indices, self.scores = indices, scores
+            self.job_vectors = csr_matrix(job_vectors)
+
+        for job_id in job_ids:
+            self.positions[job_id] = len(self.job_ids)
+            self.job_ids.append(job_id)
+
+    def add_cvs(self, cv_vectors):
+        """
+        Score new CVs against all jobs and merge them into every list
+
+        Args:
+            cv_vectors: Vectors of the new CVs, appended after the ones already counted
+        """
+        n_new = cv_vectors.shape[0]
+        if self.job_ids and n_new:
+            indices, scores = sharded_top_k_similarities(self.job_vectors, cv_vectors, self.k,
+                                                         workers=self.workers, normalized=self.normalized)
+            indices = np.hstack([self.indices, indices + self.n_cvs])
+            scores = np.hstack([self.scores, scores])
+
+            order = np.lexsort((indices, -scores), axis=1)[:, :self.k]
+            self.indices = np.take_along_axis(indices, order, axis=1)
+            self.scores = np.take_along_axis(scores, order, axis=1)
+
+        self.n_cvs += n_new
+
+    def top(self, job_ids, top_n):
+        """
+        Read the precomputed lists
+
+        Args:
+            job_ids: List of job IDs
+            top_n: Number of candidates per job
+
+        Returns:
+            Tuple (indices, scores) as returned by scoring.top_k_similarities, or None
+            if the view cannot answer (unknown job, or top_n beyond the kept k)
+        """
+        if top_n > self.k and self.n_cvs > self.k:
+            return None
+        if any(job_id not in self.positions for job_id in job_ids):
+            return None
+
+        rows = [self.positions[job_id] for job_id in job_ids]
+        top_n = min(top_n, self.indices.shape[1])
+        return self.indices[rows, :top_n], self.scores[rows, :top_n]
@@ -0,0 +1,338 @@
+"""
+vector_store.py
+Append-only storage for document vectors computed at ingest time
+
+On-disk format (version 1) is a folder holding the CSR arrays as raw .npy files:
+    manifest.json   format name/version, row/feature/nnz counts and dtypes
+    data.npy        non-zero values
+    indices.npy     column index of each value
+    indptr.npy      row start offsets (n_rows + 1 entries)
+    ids.txt         one document ID per row
+The arrays can be opened with mmap_mode='r', so several processes share one
+page-cached copy. New rows are appended to the end of each file; the manifest
+is replaced last and is the source of truth for how many rows are committed.
+Rewritten files (save) replace the old ones instead of truncating them, so
+arrays still mapped from the old files stay readable.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.preprocessing import normalize
+
+FORMAT_NAME = 'csr-npy'
+FORMAT_VERSION = 1
+
+# Fixed .npy header size, so headers can be rewritten in place when rows are appended
+NPY_HEADER_BYTES = 128
+
+INDEX_DTYPE = np.int32
+
+
+def write_npy_header(f, dtype, length):
+    """
+    Write a fixed-size .npy (version 1.0) header for a 1D array
+
+    Args:
+        f: File opened in binary mode
+        dtype: Array dtype
+        length: Number of elements
+    """
+    header = repr({
+        'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+        'fortran_order': False,
+        'shape': (int(length),),
+    })
+    prefix = np.lib.format.MAGIC_PREFIX + bytes([1, 0])
+    header_len = NPY_HEADER_BYTES - len(prefix) - 2
+    if len(header) + 1 > header_len:
+        raise ValueError("Array header does not fit in the reserved space")
+
+    f.seek(0)
+    f.write(prefix + struct.pack('<H', header_len) + (header.ljust(header_len - 1) + '\n').encode('latin1'))
+
+
+def write_npy(path, array):
+    """Write a 1D array as a .npy file with a fixed-size (appendable) header, replacing any previous file"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        write_npy_header(f, array.dtype, len(array))
+        f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp_path, path)
+
+
+def append_npy(path, array, length):
+    """
+    Append values to a .npy file written by write_npy and update its header
+
+    Args:
+        path: Path to the .npy file
+        array: 1D array to append (same dtype as the file)
+        length: Number of committed elements already in the file
+    """
+    itemsize = array.dtype.itemsize
+    with open(path, 'r+b') as f:
+        # Drop anything written after the last committed length (e.g. an interrupted append)
+        f.truncate(NPY_HEADER_BYTES + length * itemsize)
+        f.seek(0, os.SEEK_END)
+        f.write(np.ascontiguousarray(array).tobytes())
+        write_npy_header(f, array.dtype, length + len(array))
+
+
+class VectorStore:
+    """
+    Append-only sparse matrix of document vectors keyed by document ID
+    Rows are kept in insertion order so they line up with the in-memory data list
+    """
+
+    def __init__(self, n_features=None, path=None):
+        """
+        Initialize an empty store
+
+        Args:
+            n_features: Number of columns (taken from the first append if None)
+            path: Optional folder; when set, appends are also written to disk
+        """
+        self.n_features = n_features
+        self.path = path
+        self.ids = []
+        self._positions = {}
+        self._chunks = []
+        self._matrix = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def append(self, ids, vectors):
+        """
+        Append a batch of vectors to the store
+
+        Args:
+            ids: List of document IDs (one per row)
+            vectors: Sparse matrix with one row per ID
+        """
+        if vectors.shape[0] != len(ids):
+            raise ValueError(f"Got {len(ids)} IDs for {vectors.shape[0]} vectors")
+
+        if len(ids) == 0:
+            return
+
+        if self.n_features is None:
+            self.n_features = vectors.shape[1]
+        elif vectors.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {vectors.shape[1]}")
+
+        vectors = csr_matrix(vectors)
+
+        if self.path is not None:
+            self.append_to_disk(ids, vectors)
+
+        positions = self.positions
+        for doc_id in ids:
+            positions[doc_id] = len(self.ids)
+            self.ids.append(doc_id)
+
+        if self.path is not None:
+            # Re-map the files instead of stacking the new rows in memory
+            self._chunks = [self.read_matrix(self.path, self.read_manifest(self.path), mmap_mode='r')]
+        else:
+            self._chunks.append(vectors)
+        self._matrix = None
+
+    @property
+    def positions(self):
+        """Row number of each document ID (built on first use after a load)"""
+        if self._positions is None:
+            self._positions = {doc_id: i for i, doc_id in enumerate(self.ids)}
+        return self._positions
+
+    @property
+    def matrix(self):
+        """All stored vectors as a single CSR matrix (stacked lazily and cached)"""
+        if self._matrix is None:
+            if not self._chunks:
+                self._matrix = csr_matrix((0, self.n_features or 0))
+            else:
+                if len(self._chunks) > 1:
+                    self._chunks = [vstack(self._chunks, format='csr')]
+                self._matrix = self._chunks[0]
+        return self._matrix
+
+    def rows(self, ids):
+        """
+        Get the stored vectors for the given IDs
+
+        Args:
+            ids: List of document IDs
+
+        Returns:
+            Sparse matrix with one row per ID
+        """
+        return self.matrix[[self.positions[doc_id] for doc_id in ids]]
+
+    def rescale_columns(self, factors):
+        """
+        Multiply every column by a factor, then re-normalize each row to unit length
+        Moves stored TF-IDF vectors to a new IDF in one pass over the non-zeros,
+        without re-vectorizing the documents
+
+        Args:
+            factors: 1D array with one factor per column (e.g. new_idf / old_idf)
+        """
+        if len(self.ids) == 0:
+            return
+
+        matrix = self.matrix
+        data = np.asarray(matrix.data)
+        data = (data * factors[matrix.indices]).astype(data.dtype, copy=False)
+        rescaled = normalize(csr_matrix(
+            (data, np.array(matrix.indices), np.array(matrix.indptr)), shape=matrix.shape
+        ), copy=False)
+
+        self._chunks = [rescaled]
+        self._matrix = None
+        if self.path is not None:
+            self.save(self.path)
+            # Map the rewritten files instead of keeping the rescaled copy in memory
+            self._chunks = [self.read_matrix(self.path, self.read_manifest(self.path), mmap_mode='r')]
+
+    def clear(self):
+        """Remove all stored vectors (and the on-disk copy, if any)"""
+        if self.path is not None:
+            self.save(self.path, empty=True)
+        self.ids = []
+        self._positions = {}
+        self._chunks = []
+        self._matrix = None
+
+    def save(self, path, empty=False):
+        """
+        Write the whole store to a folder, replacing any previous content
+        Further appends are written to the same folder
+
+        Args:
+            path: Destination folder
+            empty: Write an empty store instead of the current rows
+        """
+        os.makedirs(path, exist_ok=True)
+
+        matrix = csr_matrix((0, self.n_features or 0)) if empty else self.matrix
+        ids = [] if empty else self.ids
+        data = np.asarray(matrix.data)
+
+        write_npy(os.path.join(path, 'data.npy'), data)
+        write_npy(os.path.join(path, 'indices.npy'), matrix.indices.astype(INDEX_DTYPE))
+        write_npy(os.path.join(path, 'indptr.npy'), matrix.indptr.astype(INDEX_DTYPE))
+        ids_text = ''.join(f"{doc_id}\n" for doc_id in ids).encode('utf-8')
+        with open(os.path.join(path, 'ids.txt.tmp'), 'wb') as f:
+            f.write(ids_text)
+        os.replace(os.path.join(path, 'ids.txt.tmp'), os.path.join(path, 'ids.txt'))
+
+        self.write_manifest(path, {
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'n_rows': len(ids),
+            'n_features': self.n_features or 0,
+            'nnz': int(matrix.nnz),
+            'ids_bytes': len(ids_text),
+            'dtype': np.lib.format.dtype_to_descr(data.dtype),
+            'index_dtype': np.lib.format.dtype_to_descr(np.dtype(INDEX_DTYPE))
+        })
+        self.path = path
+
+    def append_to_disk(self, ids, vectors):
+        """Append rows to the files in self.path without rewriting them"""
+        if not os.path.exists(os.path.join(self.path, 'manifest.json')):
+            VectorStore(n_features=self.n_features).save(self.path)
+
+        manifest = self.read_manifest(self.path)
+        if manifest['n_features'] == 0:
+            manifest['n_features'] = self.n_features
+        elif manifest['n_features'] != vectors.shape[1]:
+            raise ValueError(f"Store has {manifest['n_features']} features, got {vectors.shape[1]}")
+        if manifest['n_rows'] == 0:
+            # An empty store takes the dtype of its first rows
+            manifest['dtype'] = np.lib.format.dtype_to_descr(vectors.dtype)
+
+        nnz = manifest['nnz']
+        if nnz + vectors.nnz > np.iinfo(INDEX_DTYPE).max:
+            raise ValueError("Vector store is full for its index dtype, rebuild it with a larger one")
+
+        data = np.asarray(vectors.data, dtype=np.dtype(manifest['dtype']))
+        indptr = (vectors.indptr[1:] + nnz).astype(INDEX_DTYPE)
+
+        append_npy(os.path.join(self.path, 'data.npy'), data, nnz)
+        append_npy(os.path.join(self.path, 'indices.npy'), vectors.indices.astype(INDEX_DTYPE), nnz)
+        append_npy(os.path.join(self.path, 'indptr.npy'), indptr, manifest['n_rows'] + 1)
+        ids_text = ''.join(f"{doc_id}\n" for doc_id in ids).encode('utf-8')
+        with open(os.path.join(self.path, 'ids.txt'), 'r+b') as f:
+            f.truncate(manifest['ids_bytes'])
+            f.seek(0, os.SEEK_END)
+            f.write(ids_text)
+
+        # Commit the new rows
+        manifest['n_rows'] += len(ids)
+        manifest['nnz'] = nnz + int(vectors.nnz)
+        manifest['ids_bytes'] += len(ids_text)
+        self.write_manifest(self.path, manifest)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """
+        Load a store written by save()/append()
+
+        Args:
+            path: Store folder
+            mmap_mode: numpy mmap mode for the arrays ('r' shares pages between
+                       processes, None reads them into memory)
+
+        Returns:
+            VectorStore backed by the folder
+        """
+        manifest = cls.read_manifest(path)
+
+        with open(os.path.join(path, 'ids.txt'), 'rb') as f:
+            ids = f.read(manifest['ids_bytes']).decode('utf-8').splitlines()
+
+        store = cls(n_features=manifest['n_features'], path=path)
+        store.ids = ids
+        store._positions = None
+        store._chunks = [cls.read_matrix(path, manifest, mmap_mode=mmap_mode)]
+        return store
+
+    @staticmethod
+    def read_manifest(path):
+        """Read and validate a store manifest"""
+        try:
+            with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Vector store not found at {path}")
+
+        if manifest.get('format') != FORMAT_NAME or manifest.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector store format: {manifest.get('format')} "
+                             f"version {manifest.get('version')}")
+        return manifest
+
+    @staticmethod
+    def write_manifest(path, manifest):
+        """Atomically replace a store manifest"""
+        tmp_path = os.path.join(path, 'manifest.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, os.path.join(path, 'manifest.json'))
+
+    @staticmethod
+    def read_matrix(path, manifest, mmap_mode='r'):
+        """Open the CSR arrays of a store, limited to the committed rows"""
+        n_rows = manifest['n_rows']
+        nnz = manifest['nnz']
+
+        data = np.load(os.path.join(path, 'data.npy'), mmap_mode=mmap_mode)[:nnz]
+        indices = np.load(os.path.join(path, 'indices.npy'), mmap_mode=mmap_mode)[:nnz]
+        indptr = np.load(os.path.join(path, 'indptr.npy'), mmap_mode=mmap_mode)[:n_rows + 1]
+
+        return csr_matrix((data, indices, indptr), shape=(n_rows, manifest['n_features']), copy=False)
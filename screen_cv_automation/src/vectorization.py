@@ -1,7 +1,10 @@
 # vectorization.py
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 import pickle  # to save vectorizer for future use
+from vector_store import VectorStore
+from hashing_vectorizer import HashingTfidfVectorizer
 
 # ----------------------------
 # Load cleaned datasets
@@ -12,7 +15,7 @@ jobs = pd.read_csv("../results/jobs_cleaned.csv")
 # ----------------------------
 # TF-IDF Vectorization
 # ----------------------------
-vectorizer = TfidfVectorizer(max_features=5000)  # limit features to 5000 for efficiency
+vectorizer = TfidfVectorizer(max_features=5000, dtype=np.float32)  # limit features to 5000 for efficiency, float32 halves vector memory
 
 # Fit on CVs and transform CV text
 cv_vectors = vectorizer.fit_transform(cvs['cleaned_text'])
@@ -26,13 +29,22 @@ job_vectors = vectorizer.transform(jobs['cleaned_text'])
 with open("../models/vectorizer.pkl", "wb") as f:
     pickle.dump(vectorizer, f)
 
-# Save CV vectors
-with open("../models/cv_vectors.pkl", "wb") as f:
-    pickle.dump(cv_vectors, f)
+# Save CV vectors (memory-mappable vector store, see vector_store.py)
+cv_store = VectorStore()
+cv_store.append(cvs['candidate_id'].tolist(), cv_vectors)
+cv_store.save("../models/cv_vectors")
 
 # Save Job vectors
-with open("../models/job_vectors.pkl", "wb") as f:
-    pickle.dump(job_vectors, f)
+job_store = VectorStore()
+job_store.append(jobs['job_id'].tolist(), job_vectors)
+job_store.save("../models/job_vectors")
+
+# ----------------------------
+# Hashing mode: only the document-frequency table needs saving
+# ----------------------------
+hashing_vectorizer = HashingTfidfVectorizer()
+hashing_vectorizer.partial_fit(cvs['cleaned_text'].fillna(''))
+hashing_vectorizer.save("../models/hashing_idf.npz")
 
 print("Vectorization completed. Vectors saved in /models/")
 